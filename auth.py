@@ -2,48 +2,105 @@
 # Local auth with salted hashing + session tokens, and safe migration of legacy users_db.json
 
 from __future__ import annotations
-import os, json, time, secrets, hashlib
+import os, json, time, secrets, hashlib, hmac, threading, copy
 from typing import Dict, Optional
 
+try:  # optional: faster parse/serialise, works on bytes directly
+    import orjson as _orjson
+except Exception:
+    _orjson = None
+
 # ---- Storage location (Windows-friendly; works on Linux/Mac too) ----
 APP_DIR = (os.getenv("APPDATA") or os.path.expanduser("~"))
 APP_DIR = os.path.join(APP_DIR, "ForexBot")
 os.makedirs(APP_DIR, exist_ok=True)
 
 USERS_DB_PATH = os.path.join(APP_DIR, "users_db.json")
+SESSIONS_DB_PATH = os.path.join(APP_DIR, "sessions.json")
 
 # ---- Constants ----
 HASH_ALGO = "sha256"
-ITERATIONS = 120_000
+ITERATIONS = 120_000          # used for new/upgraded records
+LEGACY_ITERATIONS = 120_000   # records written before "iters" was stored
 SESSION_TTL_SECONDS = 7 * 24 * 3600  # 7 days
 
 # ---- Helpers ----
-def _pbkdf2_hash(password: str, salt: bytes) -> str:
+def _pbkdf2_hash(password: str, salt: bytes, iters: int = ITERATIONS) -> bytes:
+    # hashlib delegates to OpenSSL, which derives the HMAC ipad/opad once per call
     pwd = password.encode("utf-8")
-    dk = hashlib.pbkdf2_hmac(HASH_ALGO, pwd, salt, ITERATIONS, dklen=32)
-    return dk.hex()
+    return hashlib.pbkdf2_hmac(HASH_ALGO, pwd, salt, iters, dklen=32)
 
 def _new_salt() -> bytes:
     return secrets.token_bytes(16)
 
+# Parsed JSON files, re-read only when a file's mtime changes (writes refresh them).
+# Callers edit what they get back in place, so they always get a deep copy and the
+# cached object is never handed out.
+_CACHE: Dict[str, tuple] = {}  # path -> (mtime_ns, data)
+_CACHE_LOCK = threading.Lock()
+
+def _read_json(path: str, default: Dict) -> Dict:
+    with _CACHE_LOCK:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return default
+        hit = _CACHE.get(path)
+        if hit is not None and hit[0] == mtime:
+            return copy.deepcopy(hit[1])
+        try:
+            if _orjson is not None:
+                with open(path, "rb") as f:
+                    data = _orjson.loads(f.read())
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except Exception:
+            return default
+        _CACHE[path] = (mtime, data)
+        return copy.deepcopy(data)
+
+def _write_json(path: str, data: Dict) -> None:
+    with _CACHE_LOCK:
+        # drop the cache first so a failed write never leaves unsaved edits cached
+        _CACHE.pop(path, None)
+        tmp = path + ".tmp"
+        if _orjson is not None:
+            with open(tmp, "wb") as f:
+                f.write(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+        else:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+        _CACHE[path] = (os.stat(path).st_mtime_ns, copy.deepcopy(data))
+
 def _load_db() -> Dict:
-    if not os.path.exists(USERS_DB_PATH):
-        return {"users": {}, "sessions": {}}
-    try:
-        with open(USERS_DB_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {"users": {}, "sessions": {}}
+    return _read_json(USERS_DB_PATH, {"users": {}, "sessions": {}})
 
 def _save_db(db: Dict) -> None:
-    tmp = USERS_DB_PATH + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(db, f, indent=2)
-    os.replace(tmp, USERS_DB_PATH)
+    _write_json(USERS_DB_PATH, db)
+
+def _load_sessions() -> Dict:
+    """
+    Session tokens live in their own file so login/logout never rewrites user records.
+    First run after the split seeds it from the legacy users_db.json "sessions" key.
+    """
+    if not os.path.exists(SESSIONS_DB_PATH):
+        return dict(_load_db().get("sessions") or {})
+    return _read_json(SESSIONS_DB_PATH, {})
+
+def _save_sessions(sessions: Dict) -> None:
+    now = int(time.time())
+    live = {t: s for t, s in sessions.items() if s.get("exp", 0) >= now}
+    _write_json(SESSIONS_DB_PATH, live)
 
 def _sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
+def _same(a: str, b: str) -> bool:
+    """Constant-time string compare (works for non-ASCII input too)."""
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
 # ---- Public API ----
 def has_any_user() -> bool:
     return bool(_load_db().get("users"))
@@ -56,12 +113,13 @@ def create_user(username: str, password: str) -> None:
     if username in db["users"]:
         raise ValueError("User already exists.")
     salt = _new_salt().hex()
-    pwd_hash = _pbkdf2_hash(password, bytes.fromhex(salt))
+    pwd_hash = _pbkdf2_hash(password, bytes.fromhex(salt)).hex()
     db["users"][username] = {
         "salt": salt,
         "pwd": pwd_hash,
         "created": int(time.time()),
         "version": 2,  # schema version tag (optional)
+        "iters": ITERATIONS,
     }
     _save_db(db)
 
@@ -79,13 +137,13 @@ def _migrate_legacy_user(db: Dict, username: str, provided_password: str) -> boo
     # Case 1: explicit plain 'password'
     legacy_plain = u.get("password")
     if isinstance(legacy_plain, str):
-        if legacy_plain == provided_password or _sha256_hex(provided_password) == legacy_plain:
+        if _same(legacy_plain, provided_password) or _same(_sha256_hex(provided_password), legacy_plain):
             ok = True
 
     # Case 2: unsalted 'pwd' only (could be plain or sha256)
     if not ok and "pwd" in u and "salt" not in u:
         stored = u.get("pwd", "")
-        if stored == provided_password or stored == _sha256_hex(provided_password):
+        if _same(stored, provided_password) or _same(stored, _sha256_hex(provided_password)):
             ok = True
 
     if not ok:
@@ -93,12 +151,13 @@ def _migrate_legacy_user(db: Dict, username: str, provided_password: str) -> boo
 
     # Perform upgrade to salted PBKDF2
     salt = _new_salt().hex()
-    pwd_hash = _pbkdf2_hash(provided_password, bytes.fromhex(salt))
+    pwd_hash = _pbkdf2_hash(provided_password, bytes.fromhex(salt)).hex()
     db["users"][username] = {
         "salt": salt,
         "pwd": pwd_hash,
         "created": u.get("created", int(time.time())),
         "version": 2,
+        "iters": ITERATIONS,
     }
     _save_db(db)
     return True
@@ -115,10 +174,19 @@ def verify_credentials(username: str, password: str) -> bool:
     if "salt" in u and "pwd" in u:
         try:
             salt = bytes.fromhex(u["salt"])
+            stored = bytes.fromhex(u["pwd"])
         except Exception:
-            # Corrupt salt → try legacy migration path as last resort
+            # Corrupt salt/hash → try legacy migration path as last resort
             return _migrate_legacy_user(db, username, password)
-        return _pbkdf2_hash(password, salt) == u["pwd"]
+        iters = int(u.get("iters", LEGACY_ITERATIONS))
+        if not hmac.compare_digest(_pbkdf2_hash(password, salt, iters), stored):
+            return False
+        if iters < ITERATIONS:
+            # rehash-on-login: lift weaker records to the current work factor
+            u["pwd"] = _pbkdf2_hash(password, salt, ITERATIONS).hex()
+            u["iters"] = ITERATIONS
+            _save_db(db)
+        return True
 
     # Legacy schemas → attempt migration
     return _migrate_legacy_user(db, username, password)
@@ -127,32 +195,31 @@ def issue_session(username: str) -> str:
     """Create a time-limited session token (so we don't store plain passwords)."""
     username = username.strip().lower()
     token = secrets.token_hex(16)
-    db = _load_db()
-    db.setdefault("sessions", {})
-    db["sessions"][token] = {"user": username, "exp": int(time.time()) + SESSION_TTL_SECONDS}
-    _save_db(db)
+    sessions = _load_sessions()
+    sessions[token] = {"user": username, "exp": int(time.time()) + SESSION_TTL_SECONDS}
+    _save_sessions(sessions)
     return token
 
 def validate_session(token: str) -> Optional[str]:
     if not token:
         return None
-    db = _load_db()
-    s = db.get("sessions", {}).get(token)
+    sessions = _load_sessions()
+    s = sessions.get(token)
     now = int(time.time())
     if not s:
         return None
     if s["exp"] < now:
         # expire
-        db["sessions"].pop(token, None)
-        _save_db(db)
+        sessions.pop(token, None)
+        _save_sessions(sessions)
         return None
     return s["user"]
 
 def revoke_session(token: str) -> None:
-    db = _load_db()
-    if token and token in db.get("sessions", {}):
-        db["sessions"].pop(token, None)
-        _save_db(db)
+    sessions = _load_sessions()
+    if token and token in sessions:
+        sessions.pop(token, None)
+        _save_sessions(sessions)
 
 def ensure_admin_seed() -> None:
     """UI handles first-user creation; kept for compatibility."""
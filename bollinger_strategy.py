@@ -1,4 +1,5 @@
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
 from day_trading_bot.utils.logger import print_debug
 from day_trading_bot.utils.fetch_candles import fetch_candles
@@ -10,40 +11,42 @@ def bollinger_signal(df: pd.DataFrame) -> str | None:
         print_debug("Skipping Bollinger: insufficient data.")
         return None
 
-    df = df.copy()
-    df['ma20'] = df['close'].rolling(window=20).mean()
-    df['stddev'] = df['close'].rolling(window=20).std()
+    # only the last 20-bar window matters; ddof=1 matches rolling().std()
+    closes = np.asarray(df['close'].to_numpy()[-20:], dtype=float)
+    ma20 = closes.mean()
+    stddev = closes.std(ddof=1)
 
-    df['upper_band'] = df['ma20'] + (2 * df['stddev'])
-    df['lower_band'] = df['ma20'] - (2 * df['stddev'])
-
-    last_close = df['close'].iloc[-1]
-    if last_close > df['upper_band'].iloc[-1]:
+    last_close = closes[-1]
+    if last_close > ma20 + (2 * stddev):
         return 'SELL'
-    elif last_close < df['lower_band'].iloc[-1]:
+    elif last_close < ma20 - (2 * stddev):
         return 'BUY'
     else:
         return None
 
 
-def bollinger_signal_multi(symbol: str, timeframes: list[int]) -> str | None:
+def bollinger_signal_multi(symbol: str, timeframes: list[int], candles=None) -> str | None:
     """
     Consensus Bollinger direction across multiple TFs.
     Returns 'BUY'/'SELL' if all non-null signals align, else None.
+    `candles` is an optional per-tick CandleCache shared with other strategies.
     """
-    directions: list[str] = []
+    fetch = candles.get if candles is not None else fetch_candles
+    first: str | None = None
 
+    # serial: MT5 downloads go through MT5_LOCK one at a time anyway
     for tf in timeframes:
-        df = fetch_candles(symbol, tf, 100)
+        df = fetch(symbol, tf, 100)
         if df is None or df.empty:
             print_debug(f"{symbol} Bollinger: Insufficient data for TF {tf}")
             continue
         sig = bollinger_signal(df)
-        if sig:
-            directions.append(sig)
-
-    if not directions:
-        return None
+        if not sig:
+            continue
+        if first is None:
+            first = sig
+        elif sig != first:
+            # require unanimity: one disagreement decides it, skip the remaining downloads
+            return None
 
-    # require unanimity across the signals we managed to compute
-    return directions[0] if all(d == directions[0] for d in directions) else None
+    return first
@@ -1,136 +1,185 @@
 import pandas as pd
 
+_OHLC = ("open", "high", "low", "close")
+
+
+def _bars(df: pd.DataFrame, n: int) -> list:
+    """
+    Last `n` bars as plain (open, high, low, close) float tuples, oldest first.
+    Reads NumPy views of the four columns instead of building a Series per row.
+    """
+    return list(zip(*(df[k].to_numpy()[-n:].tolist() for k in _OHLC)))
+
 # --- Single-candle patterns ---
 
+def _bullish_engulfing(bars) -> bool:
+    (po, _, _, pc), (co, _, _, cc) = bars[-2:]
+    return (
+        pc < po and
+        cc > co and
+        co < pc and
+        cc > po
+    )
+
 def is_bullish_engulfing(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
-    prev, curr = df.iloc[-2], df.iloc[-1]
+    return _bullish_engulfing(_bars(df, 2))
+
+def _bearish_engulfing(bars) -> bool:
+    (po, _, _, pc), (co, _, _, cc) = bars[-2:]
     return (
-        prev['close'] < prev['open'] and
-        curr['close'] > curr['open'] and
-        curr['open'] < prev['close'] and
-        curr['close'] > prev['open']
+        pc > po and
+        cc < co and
+        co > pc and
+        cc < po
     )
 
 def is_bearish_engulfing(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
-    prev, curr = df.iloc[-2], df.iloc[-1]
-    return (
-        prev['close'] > prev['open'] and
-        curr['close'] < curr['open'] and
-        curr['open'] > prev['close'] and
-        curr['close'] < prev['open']
-    )
+    return _bearish_engulfing(_bars(df, 2))
+
+def _hammer(bars) -> bool:
+    (o, h, l, c), = bars[-1:]
+    body = abs(c - o)
+    lower_wick = min(c, o) - l
+    return lower_wick > 2 * body
 
 def is_hammer(df: pd.DataFrame) -> bool:
     if len(df) < 1:
         return False
-    c = df.iloc[-1]
-    body = abs(c['close'] - c['open'])
-    lower_wick = min(c['close'], c['open']) - c['low']
-    return lower_wick > 2 * body
+    return _hammer(_bars(df, 1))
+
+def _shooting_star(bars) -> bool:
+    (o, h, l, c), = bars[-1:]
+    body = abs(c - o)
+    upper_wick = h - max(c, o)
+    return upper_wick > 2 * body
 
 def is_shooting_star(df: pd.DataFrame) -> bool:
     if len(df) < 1:
         return False
-    c = df.iloc[-1]
-    body = abs(c['close'] - c['open'])
-    upper_wick = c['high'] - max(c['close'], c['open'])
-    return upper_wick > 2 * body
+    return _shooting_star(_bars(df, 1))
+
+def _doji(bars) -> bool:
+    (o, h, l, c), = bars[-1:]
+    return abs(c - o) < 0.1 * (h - l)
 
 def is_doji(df: pd.DataFrame) -> bool:
     if len(df) < 1:
         return False
-    c = df.iloc[-1]
-    return abs(c['close'] - c['open']) < 0.1 * (c['high'] - c['low'])
+    return _doji(_bars(df, 1))
 
 # --- Multi-candle patterns ---
 
+def _morning_star(bars) -> bool:
+    (ao, _, _, ac), (bo, bh, bl, bc), (co, _, _, cc) = bars[-3:]
+    return (
+        ac < ao and
+        abs(bc - bo) < 0.2 * (bh - bl) and
+        cc > co and
+        cc > (ao + ac) / 2
+    )
+
 def is_morning_star(df: pd.DataFrame) -> bool:
     if len(df) < 3:
         return False
-    a, b, c = df.iloc[-3], df.iloc[-2], df.iloc[-1]
+    return _morning_star(_bars(df, 3))
+
+def _evening_star(bars) -> bool:
+    (ao, _, _, ac), (bo, bh, bl, bc), (co, _, _, cc) = bars[-3:]
     return (
-        a['close'] < a['open'] and
-        abs(b['close'] - b['open']) < 0.2 * (b['high'] - b['low']) and
-        c['close'] > c['open'] and
-        c['close'] > (a['open'] + a['close']) / 2
+        ac > ao and
+        abs(bc - bo) < 0.2 * (bh - bl) and
+        cc < co and
+        cc < (ao + ac) / 2
     )
 
 def is_evening_star(df: pd.DataFrame) -> bool:
     if len(df) < 3:
         return False
-    a, b, c = df.iloc[-3], df.iloc[-2], df.iloc[-1]
+    return _evening_star(_bars(df, 3))
+
+def _gravestone_doji(bars) -> bool:
+    (o, h, l, c), = bars[-1:]
+    body = abs(o - c)
     return (
-        a['close'] > a['open'] and
-        abs(b['close'] - b['open']) < 0.2 * (b['high'] - b['low']) and
-        c['close'] < c['open'] and
-        c['close'] < (a['open'] + a['close']) / 2
+        body < 0.1 * (h - l) and
+        (h - max(o, c)) > 2 * body
     )
 
 def is_gravestone_doji(df: pd.DataFrame) -> bool:
     if len(df) < 1:
         return False
-    c = df.iloc[-1]
-    body = abs(c['open'] - c['close'])
+    return _gravestone_doji(_bars(df, 1))
+
+def _dragonfly_doji(bars) -> bool:
+    (o, h, l, c), = bars[-1:]
+    body = abs(o - c)
     return (
-        body < 0.1 * (c['high'] - c['low']) and
-        (c['high'] - max(c['open'], c['close'])) > 2 * body
+        body < 0.1 * (h - l) and
+        (min(o, c) - l) > 2 * body
     )
 
 def is_dragonfly_doji(df: pd.DataFrame) -> bool:
     if len(df) < 1:
         return False
-    c = df.iloc[-1]
-    body = abs(c['open'] - c['close'])
+    return _dragonfly_doji(_bars(df, 1))
+
+def _tweezer_top(bars) -> bool:
+    (ao, ah, _, ac), (bo, bh, _, bc) = bars[-2:]
     return (
-        body < 0.1 * (c['high'] - c['low']) and
-        (min(c['open'], c['close']) - c['low']) > 2 * body
+        abs(ah - bh) < 1e-5 and
+        ac > ao and
+        bc < bo
     )
 
 def is_tweezer_top(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
-    a, b = df.iloc[-2], df.iloc[-1]
+    return _tweezer_top(_bars(df, 2))
+
+def _tweezer_bottom(bars) -> bool:
+    (ao, _, al, ac), (bo, _, bl, bc) = bars[-2:]
     return (
-        abs(a['high'] - b['high']) < 1e-5 and
-        a['close'] > a['open'] and
-        b['close'] < b['open']
+        abs(al - bl) < 1e-5 and
+        ac < ao and
+        bc > bo
     )
 
 def is_tweezer_bottom(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
-    a, b = df.iloc[-2], df.iloc[-1]
+    return _tweezer_bottom(_bars(df, 2))
+
+def _bullish_harami(bars) -> bool:
+    (ao, _, _, ac), (bo, _, _, bc) = bars[-2:]
     return (
-        abs(a['low'] - b['low']) < 1e-5 and
-        a['close'] < a['open'] and
-        b['close'] > b['open']
+        ac < ao and
+        bc > bo and
+        bo > ac and
+        bc < ao
     )
 
 def is_bullish_harami(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
-    a, b = df.iloc[-2], df.iloc[-1]
+    return _bullish_harami(_bars(df, 2))
+
+def _bearish_harami(bars) -> bool:
+    (ao, _, _, ac), (bo, _, _, bc) = bars[-2:]
     return (
-        a['close'] < a['open'] and
-        b['close'] > b['open'] and
-        b['open'] > a['close'] and
-        b['close'] < a['open']
+        ac > ao and
+        bc < bo and
+        bo < ac and
+        bc > ao
     )
 
 def is_bearish_harami(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
-    a, b = df.iloc[-2], df.iloc[-1]
-    return (
-        a['close'] > a['open'] and
-        b['close'] < b['open'] and
-        b['open'] < a['close'] and
-        b['close'] > a['open']
-    )
+    return _bearish_harami(_bars(df, 2))
 
 # ------------------------------------------------------------------
 # Centralized pattern lists
@@ -163,3 +212,52 @@ NEUTRAL_PATTERNS = [
 
 # All patterns (for reversal_signal or other bulk checks)
 ALL_PATTERNS = BUY_PATTERNS + SELL_PATTERNS + NEUTRAL_PATTERNS
+
+# ------------------------------------------------------------------
+# Bitmask evaluation (one bar extraction for the whole battery)
+# ------------------------------------------------------------------
+
+# minimum bars and scalar kernel behind each public is_* check
+_KERNELS = {
+    is_bullish_engulfing: (2, _bullish_engulfing),
+    is_bearish_engulfing: (2, _bearish_engulfing),
+    is_hammer:            (1, _hammer),
+    is_shooting_star:     (1, _shooting_star),
+    is_doji:              (1, _doji),
+    is_morning_star:      (3, _morning_star),
+    is_evening_star:      (3, _evening_star),
+    is_gravestone_doji:   (1, _gravestone_doji),
+    is_dragonfly_doji:    (1, _dragonfly_doji),
+    is_tweezer_top:       (2, _tweezer_top),
+    is_tweezer_bottom:    (2, _tweezer_bottom),
+    is_bullish_harami:    (2, _bullish_harami),
+    is_bearish_harami:    (2, _bearish_harami),
+}
+
+# bit i of a pattern mask <=> ALL_PATTERNS[i] matched
+_MASK_KERNELS = tuple(_KERNELS[p] for p in ALL_PATTERNS)
+
+
+def _mask_of(pattern_fns) -> int:
+    return sum(1 << ALL_PATTERNS.index(p) for p in pattern_fns)
+
+
+BUY_MASK = _mask_of(BUY_PATTERNS)
+SELL_MASK = _mask_of(SELL_PATTERNS)
+NEUTRAL_MASK = _mask_of(NEUTRAL_PATTERNS)
+
+
+def pattern_mask(df: pd.DataFrame) -> int:
+    """
+    Evaluate every pattern in ALL_PATTERNS from a single read of the last 3 bars.
+    Returns an int with bit i set when ALL_PATTERNS[i] matches; test with
+    `pattern_mask(df) & BUY_MASK` etc.
+    """
+    n = len(df)
+    if n < 1:
+        return 0
+    bars = _bars(df, 3)
+    mask = 0
+    for i, (need, kernel) in enumerate(_MASK_KERNELS):
+        mask |= (n >= need and kernel(bars)) << i
+    return mask
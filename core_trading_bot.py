@@ -17,10 +17,14 @@ SLEEP_INTERVAL = 60  # Run every 60 seconds
 def strategy_fusion(df):
     signals = []
 
+    # NumPy views: avoids a temporary Series per slice/scalar read
+    high = df['high'].to_numpy()
+    low = df['low'].to_numpy()
+
     # Strategy 1: Trend - EMA crossover + ADX
-    ema_short = df['ema_20'].iloc[-1]
-    ema_long = df['ema_50'].iloc[-1]
-    adx = df['adx'].iloc[-1]
+    ema_short = df['ema_20'].to_numpy()[-1]
+    ema_long = df['ema_50'].to_numpy()[-1]
+    adx = df['adx'].to_numpy()[-1]
 
     if adx > 25:
         if ema_short > ema_long:
@@ -29,12 +33,12 @@ def strategy_fusion(df):
             signals.append("SELL")
 
     # Strategy 2: Breakout - Recent high/low
-    high = df['high'].iloc[-20:].max()
-    low = df['low'].iloc[-20:].min()
-    close = df['close'].iloc[-1]
-    if close > high:
+    recent_high = high[-20:].max()
+    recent_low = low[-20:].min()
+    close = df['close'].to_numpy()[-1]
+    if close > recent_high:
         signals.append("BUY")
-    elif close < low:
+    elif close < recent_low:
         signals.append("SELL")
 
     # Strategy 3: Support/Resistance
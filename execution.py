@@ -1,25 +1,76 @@
 import re
+import time
+import numpy as np
 import pandas as pd
 import MetaTrader5 as mt5
 from day_trading_bot.risk import calculate_risk_lot_size
 from day_trading_bot.utils.account import get_balance as _acct_balance
 
 
+_RE_SUFFIX = re.compile(r'[\.\-_].*$')
+_RE_TRAILING_DIGITS = re.compile(r'\d+$')
+
+# Broker min-distance guard, keyed by _base_symbol()
+_MIN_STOP_DISTANCES = {
+    "XAUUSD": 0.10, "GBPUSD": 0.0012, "EURUSD": 0.0010, "AUDUSD": 0.0008,
+    "USDJPY": 0.01, "GBPJPY": 0.01, "EURJPY": 0.01, "CADJPY": 0.01,
+    "AUDJPY": 0.01, "CHFJPY": 0.01, "NZDJPY": 0.01, "EURAUD": 0.0010,
+    "GBPAUD": 0.0010, "EURCAD": 0.0010, "GBPCHF": 0.0010, "EURNZD": 0.0010,
+    "AUDCAD": 0.0010, "AUDNZD": 0.0010,
+}
+
+
 def _base_symbol(sym: str) -> str:
     s = sym.upper()
-    s = re.sub(r'[\.\-_].*$', '', s)   # cut at first ., -, _
-    s = re.sub(r'\d+$', '', s)         # remove trailing digits
+    s = _RE_SUFFIX.sub('', s)           # cut at first ., -, _
+    s = _RE_TRAILING_DIGITS.sub('', s)  # remove trailing digits
     if s.endswith('M'): s = s[:-1]     # common suffix
     return ''.join(ch for ch in s if ch.isalpha())
 
 
-def _digits(symbol: str) -> int:
+# symbol_info is an IPC round-trip into the terminal and rarely changes intraday
+_INFO_TTL_SECONDS = 60.0
+_INFO_CACHE: dict = {}  # symbol -> (monotonic ts, SymbolInfo)
+
+
+def _info(symbol: str):
+    """mt5.symbol_info(symbol), cached per symbol for _INFO_TTL_SECONDS (misses are not cached)."""
+    now = time.monotonic()
+    ent = _INFO_CACHE.get(symbol)
+    if ent and now - ent[0] < _INFO_TTL_SECONDS:
+        return ent[1]
     info = mt5.symbol_info(symbol)
+    if info:
+        _INFO_CACHE[symbol] = (now, info)
+    return info
+
+
+# Static per-symbol metadata (digits, pip size), filled by warm_symbol_meta()
+_SYMBOL_META: dict = {}  # symbol -> (digits, pip)
+
+
+def warm_symbol_meta(symbol: str) -> None:
+    """Record digits/pip size for `symbol` once, so order paths skip symbol_info."""
+    if symbol in _SYMBOL_META:
+        return
+    info = _info(symbol)
+    if info and getattr(info, "point", 0) > 0:
+        _SYMBOL_META[symbol] = (int(getattr(info, "digits", 5) or 5), float(info.point) * 10.0)
+
+
+def _digits(symbol: str) -> int:
+    meta = _SYMBOL_META.get(symbol)
+    if meta:
+        return meta[0]
+    info = _info(symbol)
     return int(getattr(info, "digits", 5) or 5)
 
 
 def _pip_size(symbol: str) -> float:
-    info = mt5.symbol_info(symbol)
+    meta = _SYMBOL_META.get(symbol)
+    if meta:
+        return meta[1]
+    info = _info(symbol)
     if info and getattr(info, "point", 0) > 0:
         return float(info.point) * 10.0
     s = symbol.upper()
@@ -29,13 +80,20 @@ def _pip_size(symbol: str) -> float:
 
 
 def _atr(df: pd.DataFrame, n: int = 14) -> float:
-    h, l, c = df["high"], df["low"], df["close"]
-    tr = pd.concat([(h-l), (h-c.shift(1)).abs(), (l-c.shift(1)).abs()], axis=1).max(axis=1)
-    return float(tr.rolling(n).mean().iloc[-1])
+    h = df["high"].to_numpy(dtype=float)
+    l = df["low"].to_numpy(dtype=float)
+    c = df["close"].to_numpy(dtype=float)
+    if len(h) < n:
+        return float("nan")
+    # true range; the first bar has no previous close so it is just high-low
+    tr = h - l
+    pc = c[:-1]
+    tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - pc), np.abs(l[1:] - pc)))
+    return float(tr[-n:].mean())
 
 
 def _round_volume_to_broker(symbol: str, vol: float) -> float:
-    info = mt5.symbol_info(symbol)
+    info = _info(symbol)
     if not info:
         return round(max(vol, 0.01), 2)
     step = float(getattr(info, "volume_step", 0.01) or 0.01)
@@ -50,7 +108,7 @@ def _monetary_risk_for_lot(symbol: str, entry: float, sl: float, lot: float) ->
     Compute $ risk for a given lot using MT5 tick value/size:
       money = lot * (|entry - sl| / tick_size) * tick_value
     """
-    info = mt5.symbol_info(symbol)
+    info = _info(symbol)
     if not info or not getattr(info, "tick_value", 0) or not getattr(info, "tick_size", 0):
         # Fallback approximate using "pip" concept (per-lot pip value not exact without info)
         pip = _pip_size(symbol)
@@ -72,20 +130,29 @@ def place_trade(
     *,
     balance: float | None = None,
     risk_percent: float = 1.0,
+    candles=None,
 ) -> bool:
     """
     Enforce MAX 1% risk:
       - If lot_size is provided, scale it down if its monetary risk > 1% of balance.
       - If not provided, compute lot for 1% risk via calculate_risk_lot_size.
       - Fallback to 0.01 (or broker min) when we can't compute.
+    Pass the tick's CandleCache as `candles` to reuse bars already fetched this loop.
     """
-    rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, 100)
-    if rates is None or len(rates) == 0:
+    if candles is not None:
+        df = candles.get(symbol, mt5.TIMEFRAME_M15, 100)
+    else:
+        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, 100)
+        df = pd.DataFrame(rates) if rates is not None and len(rates) else None
+    if df is None or df.empty:
         print(f"[ERROR] No data for {symbol}")
         return False
 
-    df = pd.DataFrame(rates)
-    entry = float(df["close"].iloc[-1])
+    # the bars (possibly cached at the start of the tick) only shape SL/TP; the entry is
+    # quoted now, since a manual confirmation can hold the order back for minutes
+    tick = mt5.symbol_info_tick(symbol)
+    quote = (tick.ask if direction == "BUY" else tick.bid) if tick else 0.0
+    entry = float(quote) if quote else float(df["close"].iloc[-1])
     digits = _digits(symbol)
 
     # --- SL/TP (keep ATR-buffered defaults if not provided) ---
@@ -99,7 +166,8 @@ def place_trade(
             sl = float(df["high"].tail(30).max() + buf)
             tp = entry - (sl - entry) * 2.5
 
-    if sl <= 0 or tp <= 0 or sl == entry or tp == entry:
+    # structure levels from older bars can end up on the wrong side of a fresh quote
+    if sl <= 0 or tp <= 0 or not ((sl < entry < tp) if direction == "BUY" else (tp < entry < sl)):
         print(f"[SKIP] {symbol} invalid SL/TP | entry={entry} sl={sl} tp={tp}")
         return False
 
@@ -129,14 +197,7 @@ def place_trade(
 
     # --- Broker min-distance guard (keep your table, optional) ---
     base = _base_symbol(symbol)
-    min_stop_distances = {
-        "XAUUSD": 0.10, "GBPUSD": 0.0012, "EURUSD": 0.0010, "AUDUSD": 0.0008,
-        "USDJPY": 0.01, "GBPJPY": 0.01, "EURJPY": 0.01, "CADJPY": 0.01,
-        "AUDJPY": 0.01, "CHFJPY": 0.01, "NZDJPY": 0.01, "EURAUD": 0.0010,
-        "GBPAUD": 0.0010, "EURCAD": 0.0010, "GBPCHF": 0.0010, "EURNZD": 0.0010,
-        "AUDCAD": 0.0010, "AUDNZD": 0.0010,
-    }
-    min_gap = float(min_stop_distances.get(base, 0.0010))
+    min_gap = float(_MIN_STOP_DISTANCES.get(base, 0.0010))
     if abs(entry - sl) < min_gap or abs(entry - tp) < min_gap:
         print(f"[SKIP] {symbol} SL/TP too close (min {min_gap})")
         return False
@@ -156,6 +217,7 @@ def place_trade(
         "type_filling": mt5.ORDER_FILLING_IOC,
     }
     res = mt5.order_send(req)
+    _acct_balance.invalidate()  # fills and commissions can move the balance
     if res is None or getattr(res, "retcode", None) != mt5.TRADE_RETCODE_DONE:
         print(f"[FAILED] Trade failed: {getattr(res, 'retcode', 'None')} | {getattr(res, 'comment', '')}")
         return False
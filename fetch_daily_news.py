@@ -1,5 +1,9 @@
+import heapq
+import itertools
+import queue
 import requests
 import threading
+import time
 from datetime import datetime, timedelta
 import pytz
 import tkinter as tk
@@ -10,6 +14,36 @@ TARGET_CURRENCIES = ["USD", "GBP", "EUR"]
 REMINDER_INTERVAL_HOURS = 3
 TIMEZONE = pytz.timezone("Africa/Lagos")  # GMT+1
 
+# --- Scheduler ---
+# One worker thread drains a heap of (fire_ts, seq, callback) instead of a
+# threading.Timer thread per alert.
+_SCHEDULE = []
+_SCHEDULE_COND = threading.Condition()
+_SCHEDULE_SEQ = itertools.count()  # tie-breaker so callbacks are never compared
+_scheduler_thread = None
+
+def _run_scheduler():
+    while True:
+        with _SCHEDULE_COND:
+            while not _SCHEDULE or _SCHEDULE[0][0] > time.time():
+                timeout = (_SCHEDULE[0][0] - time.time()) if _SCHEDULE else None
+                _SCHEDULE_COND.wait(timeout)
+            _, _, callback = heapq.heappop(_SCHEDULE)
+        try:
+            callback()
+        except Exception as e:
+            print(f"[NEWS] scheduled alert failed: {e}")
+
+def schedule_in(delay_seconds, callback):
+    """Run `callback` after `delay_seconds` on the shared scheduler thread."""
+    global _scheduler_thread
+    with _SCHEDULE_COND:
+        heapq.heappush(_SCHEDULE, (time.time() + max(0.0, delay_seconds), next(_SCHEDULE_SEQ), callback))
+        if _scheduler_thread is None:
+            _scheduler_thread = threading.Thread(target=_run_scheduler, name="news-scheduler")
+            _scheduler_thread.start()
+        _SCHEDULE_COND.notify()
+
 # Placeholder for real API
 def fetch_daily_news():
     # Simulate with dummy data
@@ -21,13 +55,34 @@ def fetch_daily_news():
     ]
 
 # --- Popup Alert ---
+# One hidden Tk root lives on its own thread; other threads only enqueue.
+_POPUPS = queue.Queue()
+_popup_thread = None
+_popup_lock = threading.Lock()
+
+def _popup_loop():
+    root = tk.Tk()
+    root.withdraw()
+
+    def drain():
+        try:
+            while True:
+                title, message = _POPUPS.get_nowait()
+                messagebox.showinfo(title, message, parent=root)
+        except queue.Empty:
+            pass
+        root.after(200, drain)
+
+    drain()
+    root.mainloop()
+
 def show_popup(title, message):
-    def popup():
-        root = tk.Tk()
-        root.withdraw()
-        messagebox.showinfo(title, message)
-        root.destroy()
-    threading.Thread(target=popup).start()
+    global _popup_thread
+    _POPUPS.put((title, message))
+    with _popup_lock:
+        if _popup_thread is None:
+            _popup_thread = threading.Thread(target=_popup_loop, name="news-popups", daemon=True)
+            _popup_thread.start()
 
 # --- Estimate Direction ---
 def infer_direction(event):
@@ -44,13 +99,14 @@ def infer_direction(event):
     return None
 
 # --- Pairs Affected ---
+_PAIRS_MAP = {
+    "USD": ("EURUSD", "GBPUSD", "USDJPY", "XAUUSD"),
+    "GBP": ("GBPUSD", "EURGBP", "GBPJPY"),
+    "EUR": ("EURUSD", "EURGBP", "EURJPY"),
+}
+
 def get_affected_pairs(currency):
-    pairs_map = {
-        "USD": ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD"],
-        "GBP": ["GBPUSD", "EURGBP", "GBPJPY"],
-        "EUR": ["EURUSD", "EURGBP", "EURJPY"]
-    }
-    return pairs_map.get(currency.upper(), [])
+    return _PAIRS_MAP.get(currency.upper(), ())
 
 # --- Schedule Alerts ---
 def schedule_alerts(news_events):
@@ -72,7 +128,7 @@ def schedule_alerts(news_events):
                 show_popup("Upcoming News Alert",
                            f"{minutes_before} min to {currency} news:\n\n{event['title']}\nImpact: {impact}\nAffected: {pairs}\nExpected: {direction}")
             delay = (event_time - timedelta(minutes=minutes_before) - now).total_seconds()
-            threading.Timer(delay, alert).start()
+            schedule_in(delay, alert)
 
         alert_template(30)
         alert_template(2)
@@ -81,7 +137,7 @@ def schedule_alerts(news_events):
             show_popup("News Released",
                        f"{currency} News Released:\n\n{event['title']}\nActual: {event['actual']} | Forecast: {event['forecast']}\nLikely Direction: {direction}\nAffected: {pairs}")
 
-        threading.Timer((event_time - now).total_seconds() + 60, post_news_direction).start()
+        schedule_in((event_time - now).total_seconds() + 60, post_news_direction)
 
 # --- 3-hour Summary ---
 def periodic_summary():
@@ -92,7 +148,7 @@ def periodic_summary():
         p = ", ".join(get_affected_pairs(e["currency"]))
         lines.append(f"{e['time']} | {e['currency']} | {e['title']} | {e['impact']}\nAffected: {p}\nExpected: {d}\n")
     show_popup("3-Hour News Summary", "\n".join(lines))
-    threading.Timer(REMINDER_INTERVAL_HOURS * 3600, periodic_summary).start()
+    schedule_in(REMINDER_INTERVAL_HOURS * 3600, periodic_summary)
 
 # --- Entry Point ---
 def start_news_monitor():
@@ -1,7 +1,90 @@
 # day_trading_bot/indicators.py
 
+import numpy as np
 import pandas as pd
 
+try:  # optional: C kernels for the rolling means
+    import talib
+except Exception:
+    talib = None
+
+try:  # optional: C moving-window means when TA-Lib is absent
+    import bottleneck as bn
+except Exception:
+    bn = None
+
+
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Simple moving average over a float64 array; NaN until `period` valid bars.
+    Uses TA-Lib's SMA or bottleneck's move_mean when installed, pandas rolling
+    otherwise (same values).
+    """
+    if talib is not None:
+        return talib.SMA(values, timeperiod=period)
+    if bn is not None:
+        return bn.move_mean(values, window=period, min_count=period)
+    return pd.Series(values).rolling(window=period).mean().to_numpy()
+
+
+# --- Numba optional: one fused pass for SMA20/SMA50/RSI14/ATR14 ---
+try:
+    from numba import njit
+
+    @njit(cache=True, error_model="numpy")
+    def _fused(high, low, close, out_sma20, out_sma50, out_rsi, out_atr):
+        # running window sums, same simple means as the pandas path
+        n = close.shape[0]
+        s20 = 0.0
+        s50 = 0.0
+        sg = 0.0
+        sl = 0.0
+        str_ = 0.0
+        tr = np.empty(n)
+        gain = np.zeros(n)
+        loss = np.zeros(n)
+        for i in range(n):
+            c = close[i]
+            s20 += c
+            s50 += c
+            if i >= 20:
+                s20 -= close[i - 20]
+            if i >= 50:
+                s50 -= close[i - 50]
+            out_sma20[i] = s20 / 20 if i >= 19 else np.nan
+            out_sma50[i] = s50 / 50 if i >= 49 else np.nan
+
+            hl = high[i] - low[i]
+            if i == 0:
+                tr[i] = hl
+            else:
+                pc = close[i - 1]
+                tr[i] = max(hl, abs(high[i] - pc), abs(low[i] - pc))
+                d = c - pc
+                if d > 0:
+                    gain[i] = d
+                else:
+                    loss[i] = -d
+            str_ += tr[i]
+            if i >= 14:
+                str_ -= tr[i - 14]
+            out_atr[i] = str_ / 14 if i >= 13 else np.nan
+
+            # delta is undefined on bar 0, so the first full gain/loss window ends at bar 14
+            sg += gain[i]
+            sl += loss[i]
+            if i >= 15:
+                sg -= gain[i - 14]
+                sl -= loss[i - 14]
+            if i >= 14:
+                rs = (sg / 14) / (sl / 14)
+                out_rsi[i] = 100 - (100 / (1 + rs))
+            else:
+                out_rsi[i] = np.nan
+except Exception:
+    _fused = None
+
+
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """
     Compute and append all common indicators:
@@ -9,42 +92,60 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
       - RSI (14)
       - ATR (14)
     """
-    df = df.copy()
-    # Simple Moving Averages
-    df["SMA20"] = df["close"].rolling(window=20).mean()
-    df["SMA50"] = df["close"].rolling(window=50).mean()
-
-    # RSI (14)
-    df["RSI"] = _rsi(df["close"], period=14)
-
-    # ATR (14)
-    df["ATR_14"] = _atr(df, period=14)
+    # shallow: only new columns are added, the OHLC buffers are shared, not copied
+    df = df.copy(deep=False)
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
 
+    if _fused is not None:
+        out = np.full((4, len(close)), np.nan)
+        _fused(high, low, close, out[0], out[1], out[2], out[3])
+    else:
+        out = (
+            _sma(close, 20),              # SMA20
+            _sma(close, 50),              # SMA50
+            _rsi(close, period=14),       # RSI (14)
+            _atr(high, low, close, 14),   # ATR (14)
+        )
+    df["SMA20"], df["SMA50"], df["RSI"], df["ATR_14"] = out
     return df
 
 
-def _rsi(series: pd.Series, period: int) -> pd.Series:
-    delta = series.diff()
-    gain = delta.clip(lower=0).rolling(window=period).mean()
-    loss = -delta.clip(upper=0).rolling(window=period).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+def _rsi(close: np.ndarray, period: int) -> np.ndarray:
+    delta = np.empty_like(close)
+    delta[:1] = np.nan  # no change on the first bar, like Series.diff()
+    np.subtract(close[1:], close[:-1], out=delta[1:])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[:1] = loss[:1] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = _sma(gain, period) / _sma(loss, period)
+        return 100 - (100 / (1 + rs))
 
 
-def _atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
     """
     Average True Range: rolling mean of True Range over `period` bars.
     """
-    high = df["high"]
-    low  = df["low"]
-    prev_close = df["close"].shift(1)
+    # first bar has no previous close, so its true range is just high - low
+    true_range = high - low
+    prev_close = close[:-1]
+    true_range[1:] = np.maximum.reduce([
+        true_range[1:],
+        np.abs(high[1:] - prev_close),
+        np.abs(low[1:] - prev_close),
+    ])
+    return _sma(true_range, period)
 
-    tr1 = high - low
-    tr2 = (high - prev_close).abs()
-    tr3 = (low  - prev_close).abs()
 
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    return true_range.rolling(window=period).mean()
+def latest_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
+    """
+    ATR(`period`) of the last bar only, from the last period+1 bars: the same value
+    as calculate_indicators' ATR_14[-1] without computing the other columns.
+    """
+    k = period + 1
+    return float(_atr(high[-k:], low[-k:], close[-k:], period)[-1])
 
 
 def rsi_signal(df: pd.DataFrame, lower: float = 30, upper: float = 70) -> str | None:
@@ -20,7 +20,8 @@ Public API (used by GUI):
 """
 
 from __future__ import annotations
-import os, sys, json, base64, time, datetime as dt, hashlib, platform, uuid
+import os, sys, json, base64, time, datetime as dt, hashlib, platform, uuid, functools
+import atexit, threading
 from typing import Optional, Tuple, List, Dict
 
 # Optional MetaTrader5 (for server time / account # when already initialized)
@@ -37,6 +38,12 @@ except Exception:  # pragma: no cover
     VerifyKey = None  # type: ignore
     BadSignatureError = Exception  # type: ignore
 
+# Optional orjson (faster parsing of token payloads)
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 # ─── Configure your public verify keys (newest first) ────────────────────────
 VERIFY_KEYS_HEX: List[str] = [
     # TODO: replace with your current public verify key (hex); older ones after it for overlap
@@ -45,6 +52,21 @@ VERIFY_KEYS_HEX: List[str] = [
 
 APP_ID = "forexbot-v1"  # bump if you ship an incompatible major
 
+_SIG_LEN = 64  # Ed25519 signature size in bytes
+
+def _build_verify_keys() -> tuple:
+    keys = []
+    if VerifyKey:
+        for k in VERIFY_KEYS_HEX:
+            try:
+                keys.append(VerifyKey(bytes.fromhex(k)))
+            except Exception:
+                continue  # malformed entry: same as a key that never verifies
+    return tuple(keys)
+
+# decoded once at import; the key set is static
+_VERIFY_KEYS: tuple = _build_verify_keys()
+
 # ─── Paths ───────────────────────────────────────────────────────────────────
 def _app_dir() -> str:
     base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), ".forex_bot")
@@ -62,6 +84,13 @@ PERMANENT_LICENSE_KEYS = {
 
 _cache: Optional[Dict] = None
 
+# Cache writes are batched: _save_cache() marks it dirty and a debounced timer
+# (or interpreter exit) writes it; _flush_cache() forces the write now.
+_FLUSH_DELAY = 30.0  # seconds
+_dirty = False
+_flush_timer: Optional[threading.Timer] = None
+_flush_lock = threading.Lock()
+
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 def _load_json(path: str) -> Dict:
     try:
@@ -70,11 +99,16 @@ def _load_json(path: str) -> Dict:
     except Exception:
         return {}
 
+def _json_default(o):
+    if isinstance(o, set):  # in-memory nonce buckets
+        return sorted(o)
+    raise TypeError(f"not JSON serializable: {type(o).__name__}")
+
 def _save_json(path: str, data: Dict) -> None:
     tmp = path + ".tmp"
     try:
         with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
         os.replace(tmp, path)
     except Exception:
         pass
@@ -85,24 +119,66 @@ def _load_cache() -> Dict:
         _cache = _load_json(CACHE_FILE) or {}
         _cache.setdefault("last_token", "")
         _cache.setdefault("claims", {})
-        _cache.setdefault("nonces", {})  # {"YYYY-MM-DD": ["nonce1", ...]}
+        _cache.setdefault("nonces", {})  # {"YYYY-MM-DD": {"nonce1", ...}}; lists on disk
+        _cache["nonces"] = {day: set(v) for day, v in _cache["nonces"].items()}
         _cache.setdefault("last_sys_utc", None)
         _cache.setdefault("last_server_utc", None)
         _cache.setdefault("last_monotonic", None)
+        _prune_nonces(_cache)
     return _cache
 
+def _prune_nonces(cache: Dict) -> None:
+    """Replay window is one UTC day: drop nonce buckets older than yesterday."""
+    # system clock (not _now_utc, which needs the cache); yesterday absorbs server skew
+    oldest = (dt.datetime.utcnow() - dt.timedelta(days=1)).strftime("%Y-%m-%d")
+    nonces = cache.get("nonces") or {}
+    kept = {day: v for day, v in nonces.items() if day >= oldest}
+    if len(kept) != len(nonces):
+        cache["nonces"] = kept
+        _save_cache()
+
 def _save_cache() -> None:
-    if _cache is not None:
+    global _dirty, _flush_timer
+    if _cache is None:
+        return
+    with _flush_lock:
+        _dirty = True
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_FLUSH_DELAY, _flush_cache)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+def _flush_cache() -> None:
+    global _dirty, _flush_timer
+    with _flush_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        if not _dirty or _cache is None:
+            return
+        _dirty = False
         _save_json(CACHE_FILE, _cache)
 
+atexit.register(_flush_cache)
+
 def _urlsafe_b64decode(s: str) -> bytes:
     s = s.strip().replace("\n", "")
     pad = "=" * (-len(s) % 4)
     return base64.urlsafe_b64decode(s + pad)
 
 def _json_min_bytes(obj: Dict) -> bytes:
+    # stdlib only: the signed bytes must match json.dumps exactly (orjson differs on
+    # DEL, non-ASCII and some floats), and _verify_token already memoises the result
     return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode("utf-8")
 
+def _json_from_bytes(b: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(b)  # parses bytes directly, no decode step
+        except Exception:
+            pass  # e.g. NaN or >64-bit ints, which the stdlib accepts
+    return json.loads(b.decode("utf-8"))
+
 def _load_aliases() -> dict:
     return _load_json(ALIASES_FILE) or {"aliases": {}}
 
@@ -170,8 +246,26 @@ def _parse_iso_or_epoch(v) -> Optional[dt.datetime]:
         return None
     return None
 
+def _epoch(v) -> Optional[float]:
+    d = _parse_iso_or_epoch(v)
+    return None if d is None else d.replace(tzinfo=dt.timezone.utc).timestamp()
+
+def _claim_window(claims: Dict) -> List[Optional[float]]:
+    """[exp, valid_from, valid_to] as UTC epoch seconds (None when absent/invalid)."""
+    w = claims.get("_window")
+    if isinstance(w, list) and len(w) == 3:
+        return w  # precomputed by _store_token
+    return [_epoch(claims.get(k)) for k in ("exp", "valid_from", "valid_to")]
+
+@functools.lru_cache(maxsize=8)
+def _parse_naive_iso(s: str) -> dt.datetime:
+    # cached: the same last_sys_utc string is re-read on every poll
+    return dt.datetime.fromisoformat(s)
+
 # ─── Bindings ────────────────────────────────────────────────────────────────
-def _get_hwid() -> str:
+@functools.lru_cache(maxsize=1)
+def _hwid_source() -> bytes:
+    # constant for the process lifetime; read once
     try:
         if platform.system() == "Windows":
             import winreg  # type: ignore
@@ -182,9 +276,31 @@ def _get_hwid() -> str:
             src = f"unix|{platform.node()}|{uuid.getnode()}"
     except Exception:
         src = f"generic|{platform.node()}|{uuid.getnode()}"
-    return hashlib.sha256(src.encode("utf-8")).hexdigest()
+    return src.encode("utf-8")
+
+@functools.lru_cache(maxsize=1)
+def _get_hwid() -> str:
+    """Device id shown in diagnostics and bound into issued tokens (SHA-256)."""
+    return hashlib.sha256(_hwid_source()).hexdigest()
+
+@functools.lru_cache(maxsize=1)
+def _hwid_accepted() -> frozenset:
+    # migration window: SHA-256 ids (all tokens issued so far) and BLAKE2b-256 ids
+    return frozenset((_get_hwid(), hashlib.blake2b(_hwid_source(), digest_size=32).hexdigest()))
+
+_MT5_LOGIN_TTL = 5.0  # seconds; the account can change on reconnect
+_mt5_login_cache: Optional[Tuple[Optional[str], float]] = None  # (login, monotonic ts)
 
 def _get_mt5_login() -> Optional[str]:
+    global _mt5_login_cache
+    now = time.monotonic()
+    if _mt5_login_cache is not None and now - _mt5_login_cache[1] < _MT5_LOGIN_TTL:
+        return _mt5_login_cache[0]
+    login = _query_mt5_login()
+    _mt5_login_cache = (login, now)
+    return login
+
+def _query_mt5_login() -> Optional[str]:
     try:
         if mt5 is None:
             return None
@@ -202,12 +318,14 @@ def _verify_old_format(token: str) -> Optional[Dict]:
         return None
     try:
         p_b64, s_b64 = token.split(".", 1)
-        payload = json.loads(_urlsafe_b64decode(p_b64).decode("utf-8"))
+        payload = _json_from_bytes(_urlsafe_b64decode(p_b64))
         sig = _urlsafe_b64decode(s_b64)
+        if len(sig) != _SIG_LEN:
+            return None
         msg = _json_min_bytes(payload)
-        for k in VERIFY_KEYS_HEX:
+        for vk in _VERIFY_KEYS:
             try:
-                VerifyKey(bytes.fromhex(k)).verify(msg, sig)
+                vk.verify(msg, sig)
                 return payload
             except Exception:
                 continue
@@ -221,23 +339,35 @@ def _verify_new_format(token: str) -> Optional[Dict]:
         return None
     try:
         signed = _urlsafe_b64decode(token)
-        for k in VERIFY_KEYS_HEX:
+        if len(signed) < _SIG_LEN:
+            return None
+        for vk in _VERIFY_KEYS:
             try:
-                msg = VerifyKey(bytes.fromhex(k)).verify(signed)
-                return json.loads(msg.decode("utf-8"))
+                msg = vk.verify(signed)
+                return _json_from_bytes(msg)
             except Exception:
                 continue
     except Exception:
         return None
     return None
 
+@functools.lru_cache(maxsize=32)
+def _verify_token(token: str) -> Optional[Dict]:
+    """
+    Signature check for either format, memoised: the result depends only on the
+    token text and the static key set. Callers must copy before mutating.
+    """
+    # the formats are disjoint on '.', so only one verifier can succeed
+    if "." in token:
+        return _verify_old_format(token)
+    return _verify_new_format(token)
+
 def _check_claims(claims: Dict) -> Tuple[bool, str]:
-    now = _now_utc()
+    now_dt = _now_utc()
+    now = now_dt.replace(tzinfo=dt.timezone.utc).timestamp()
 
     # Time window: support 'exp' OR ('valid_from','valid_to')
-    exp = _parse_iso_or_epoch(claims.get("exp"))
-    vf = _parse_iso_or_epoch(claims.get("valid_from"))
-    vt = _parse_iso_or_epoch(claims.get("valid_to"))
+    exp, vf, vt = _claim_window(claims)
 
     if exp is not None:
         if now > exp:
@@ -255,7 +385,7 @@ def _check_claims(claims: Dict) -> Tuple[bool, str]:
 
     # device binding (optional)
     hwid = claims.get("hwid")
-    if hwid and hwid != _get_hwid():
+    if hwid and (not isinstance(hwid, str) or hwid not in _hwid_accepted()):
         return False, "Device mismatch"
 
     # MT5 account binding (optional, enforced when account is known)
@@ -268,22 +398,24 @@ def _check_claims(claims: Dict) -> Tuple[bool, str]:
     nonce = claims.get("nonce")
     if nonce:
         cache = _load_cache()
-        day = now.strftime("%Y-%m-%d")
-        used = set(cache.get("nonces", {}).get(day, []))
+        day = now_dt.strftime("%Y-%m-%d")
+        used = cache["nonces"].setdefault(day, set())
         if nonce in used:
             return False, "Nonce already used"
         used.add(nonce)
-        cache.setdefault("nonces", {})[day] = list(used)
         _save_cache()
+        _flush_cache()  # a consumed nonce must survive a crash
 
     return True, "OK"
 
 def _store_token(token: str, claims: Dict) -> None:
     c = _load_cache()
     c["last_token"] = token
+    claims["_window"] = _claim_window(claims)  # parse the ISO/epoch fields once
     c["claims"] = claims
     c["last_sys_utc"] = dt.datetime.utcnow().isoformat() + "Z"
     _save_cache()
+    _flush_cache()
 
 # ─── Public API ──────────────────────────────────────────────────────────────
 def is_license_valid(user_input: str) -> bool:
@@ -306,12 +438,10 @@ def is_license_valid(user_input: str) -> bool:
     resolved = _resolve_alias(u)
     token = resolved or u
 
-    # Try both formats
-    claims = _verify_old_format(token)
-    if claims is None:
-        claims = _verify_new_format(token)
+    claims = _verify_token(token)
     if claims is None:
         return False
+    claims = dict(claims)  # _store_token annotates it
 
     ok, _ = _check_claims(claims)
     if not ok:
@@ -320,6 +450,9 @@ def is_license_valid(user_input: str) -> bool:
     _store_token(token, claims)
     return True
 
+_FAST_PATH_TTL = 60.0  # seconds
+_valid_snapshot: Optional[Tuple[str, float, str, Optional[str]]] = None  # (token, until epoch, hwid, mt5 login)
+
 def is_token_valid_now() -> bool:
     """
     Fast path: re-check cached claims (time, device, mt5, app, nonce *not* re-used).
@@ -335,12 +468,34 @@ def is_token_valid_now() -> bool:
     last_sys = c.get("last_sys_utc")
     if last_sys:
         try:
-            if dt.datetime.utcnow() < dt.datetime.fromisoformat(last_sys.rstrip("Z")):
+            if dt.datetime.utcnow() < _parse_naive_iso(last_sys.rstrip("Z")):
                 return False
         except Exception:
             pass
 
-    return _check_claims(claims)[0]
+    # nothing relevant changed since the last full check -> skip the claim re-scan
+    snap = _valid_snapshot
+    if (snap is not None and snap[0] == token and time.time() < snap[1]
+            and snap[2] == _get_hwid() and snap[3] == _get_mt5_login()):
+        return True
+
+    ok = _check_claims(claims)[0]
+    _remember_valid(token, claims, ok)
+    return ok
+
+def _remember_valid(token: str, claims: Dict, ok: bool) -> None:
+    global _valid_snapshot
+    if not ok:
+        _valid_snapshot = None
+        return
+    exp, _, vt = _claim_window(claims)
+    until = exp if exp is not None else vt
+    if until is None:
+        _valid_snapshot = None
+        return
+    # full re-check at least every _FAST_PATH_TTL so server time and bindings are refreshed
+    until = min(until, time.time() + _FAST_PATH_TTL)
+    _valid_snapshot = (token, until, _get_hwid(), _get_mt5_login())
 
 def seconds_until_next_rollover_utc() -> int:
     now = _now_utc()
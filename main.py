@@ -1,6 +1,7 @@
 # day_trading_bot/main.py
 
-import sys, os, time
+import sys, os, time, threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import signal
 import traceback
@@ -64,14 +65,14 @@ import MetaTrader5 as mt5
 import pandas as pd
 
 # ─── Internal imports ────────────────────────────────────────────────────────
-from day_trading_bot.utils.logger import print_debug
+from day_trading_bot.utils.logger import print_debug, flush_logs
 from day_trading_bot.config import (
     TRADING_SYMBOLS, TIMEFRAMES, CANDLE_COUNT, CHECK_INTERVAL,
     USE_REVERSAL_FILTER, CONFIDENCE_THRESHOLD, AUTO_MODE,
     FURY_MODE, FURY_TRADE_HOUR_START, FURY_TRADE_HOUR_END,
     RISK_PERCENT, CANDLE_COUNTS
 )
-from day_trading_bot.execution import place_trade
+from day_trading_bot.execution import place_trade, warm_symbol_meta
 from day_trading_bot.utils.account import get_balance
 from day_trading_bot.risk import calculate_risk_lot_size
 from day_trading_bot.reversal_signal import detect_reversal_signal
@@ -79,12 +80,14 @@ from day_trading_bot.indicators import calculate_indicators, rsi_signal
 from day_trading_bot.momentum_strategy import momentum_signal
 from day_trading_bot.bollinger_strategy import bollinger_signal
 from day_trading_bot.support_resistance import find_recent_support_resistance
-from day_trading_bot.utils.fetch_candles import ensure_data
+from day_trading_bot.utils.fetch_candles import CandleCache, ensure_data
+from day_trading_bot.utils.mt5_lock import MT5_LOCK
 from day_trading_bot.trend_analysis import detect_trend
-from day_trading_bot.candle_patterns import BUY_PATTERNS, SELL_PATTERNS
+from day_trading_bot.candle_patterns import BUY_MASK, SELL_MASK, pattern_mask
 from day_trading_bot.pattern_detector import detect_pattern
 from day_trading_bot.telegram_alerts import send_telegram_message
 from day_trading_bot.trade_manager import manage_open_trades
+from day_trading_bot.trade_control import is_trade_active
 from day_trading_bot.supply_demand import find_zones_fallback
 # --- Auto update checker (notify channel + optional replace) ---
 import threading, random
@@ -119,6 +122,10 @@ def handle_exit(sig, frame):
             os.remove(STOP_FLAG)
     except Exception:
         pass
+    try:
+        flush_logs()  # os._exit skips atexit, which would drop buffered log lines
+    except Exception:
+        pass
     try:
         mt5.shutdown()
     finally:
@@ -127,6 +134,10 @@ def handle_exit(sig, frame):
 
 signal.signal(signal.SIGTERM, handle_exit)
 signal.signal(signal.SIGINT, handle_exit)
+if hasattr(signal, "SIGBREAK"):
+    # Windows: the launcher's CTRL_BREAK_EVENT to our process group lands here, so a
+    # GUI stop takes effect at once instead of waiting for the STOP_FLAG check
+    signal.signal(signal.SIGBREAK, handle_exit)
 
 # ─── CLI args (supports launcher --bot SYMBOLS TF RISK AUTO) ─────────────────
 if len(sys.argv) >= 5:
@@ -147,17 +158,18 @@ CANDLE_PATTERN_LOOKBACK = 3
 CHART_PATTERN_LOOKBACK = 40
 
 
+_DIRECTION_MASKS = {"BUY": BUY_MASK, "SELL": SELL_MASK}
+
+
 def detect_candlestick_pattern(df: pd.DataFrame, direction: str) -> bool:
-    if direction == "BUY":
-        return any(p(df) for p in BUY_PATTERNS)
-    if direction == "SELL":
-        return any(p(df) for p in SELL_PATTERNS)
-    return False
+    # one pass over the last bars for the whole pattern battery
+    mask = _DIRECTION_MASKS.get(direction)
+    return bool(mask and pattern_mask(df) & mask)
 
 
 def has_open_position(symbol: str) -> bool:
-    positions = mt5.positions_get(symbol=symbol)
-    return positions is not None and len(positions) > 0
+    # one positions_get() per tick is shared by all the parallel symbol scans
+    return is_trade_active(symbol)
 
 
 def is_within_fury_window() -> bool:
@@ -168,25 +180,71 @@ def is_within_fury_window() -> bool:
 def is_respecting_trendline(df: pd.DataFrame, direction: str) -> bool:
     if len(df) < 10:
         return False
-    lows = df['low'].rolling(window=5).min()
-    highs = df['high'].rolling(window=5).max()
+    # 5-bar rolling min/max as of the 5th-last bar == min/max over bars [-9, -5]
+    last_close = df['close'].to_numpy()[-1]
     if direction == "BUY":
-        return df['close'].iloc[-1] > lows.iloc[-5]
+        return bool(last_close > df['low'].to_numpy()[-9:-4].min())
     if direction == "SELL":
-        return df['close'].iloc[-1] < highs.iloc[-5]
+        return bool(last_close < df['high'].to_numpy()[-9:-4].max())
     return False
 
 
-def get_trade_decision(symbol: str):
+# Higher-TF frames survive across ticks until the broker opens their next bar;
+# M5-M30 feed entry prices, so they are always fetched fresh.
+_FRESH_TF_SECONDS = {"H1": 3600, "H2": 7200, "H4": 14400, "D1": 86400}
+_TF_CACHE: dict = {}  # (symbol, tf_name) -> (next bar open as server epoch, DataFrame)
+_INDICATOR_CACHE: dict = {}  # (symbol, tf_name) -> (source DataFrame, with indicators)
+_TF_CACHE_LOCK = threading.Lock()
+_TF_FETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tf-fetch")
+
+
+def cached_ensure_data(symbol: str, tf_name: str, count: int, fetch=ensure_data):
+    """fetch(symbol, TIMEFRAMES[tf_name], count=count), reusing H1+ frames while their last bar is still open."""
+    tf_seconds = _FRESH_TF_SECONDS.get(tf_name)
+    if tf_seconds is None:
+        return fetch(symbol, TIMEFRAMES[tf_name], count=count)
+
+    key = (symbol, tf_name)
+    with _TF_CACHE_LOCK:
+        hit = _TF_CACHE.get(key)
+    if hit is not None:
+        # bar times are broker-server epochs, so compare against the server clock
+        with MT5_LOCK:
+            tick = mt5.symbol_info_tick(symbol)
+        if tick is not None and getattr(tick, "time", 0) and tick.time < hit[0]:
+            return hit[1]
+
+    df = fetch(symbol, TIMEFRAMES[tf_name], count=count)
+    if df is not None and len(df):
+        next_bar = df["time"].iloc[-1].timestamp() + tf_seconds
+        with _TF_CACHE_LOCK:
+            _TF_CACHE[key] = (next_bar, df)
+    return df
+
+
+def _indicators(symbol: str, tf_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """calculate_indicators(df), skipped when `df` is the same frame as last time."""
+    key = (symbol, tf_name)
+    with _TF_CACHE_LOCK:
+        hit = _INDICATOR_CACHE.get(key)
+    if hit is not None and hit[0] is df:
+        return hit[1]
+    out = calculate_indicators(df)
+    with _TF_CACHE_LOCK:
+        _INDICATOR_CACHE[key] = (df, out)
+    return out
+
+
+def get_trade_decision(symbol: str, candles: CandleCache | None = None):
     print_debug(f"[PROCESSING] Checking {symbol}")
 
-    df_m5  = ensure_data(symbol, TIMEFRAMES["M5"],  count=CANDLE_COUNTS.get("M5", CANDLE_COUNT))
-    df_m15 = ensure_data(symbol, TIMEFRAMES["M15"], count=CANDLE_COUNTS.get("M15", CANDLE_COUNT))
-    df_m30 = ensure_data(symbol, TIMEFRAMES["M30"], count=CANDLE_COUNTS.get("M30", CANDLE_COUNT))
-    df_h1  = ensure_data(symbol, TIMEFRAMES["H1"],  count=CANDLE_COUNTS.get("H1", CANDLE_COUNT))
-    df_h2  = ensure_data(symbol, TIMEFRAMES["H2"],  count=CANDLE_COUNTS.get("H2", CANDLE_COUNT))
-    df_h4  = ensure_data(symbol, TIMEFRAMES["H4"],  count=CANDLE_COUNTS.get("H4", CANDLE_COUNT))
-    df_d1  = ensure_data(symbol, TIMEFRAMES["D1"],  count=CANDLE_COUNTS.get("D1", CANDLE_COUNT))
+    fetch = candles.get if candles is not None else ensure_data
+    # the seven downloads are independent round-trips; overlap them
+    tf_names = ("M5", "M15", "M30", "H1", "H2", "H4", "D1")
+    df_m5, df_m15, df_m30, df_h1, df_h2, df_h4, df_d1 = _TF_FETCH_POOL.map(
+        lambda tf: cached_ensure_data(symbol, tf, CANDLE_COUNTS.get(tf, CANDLE_COUNT), fetch),
+        tf_names,
+    )
 
     timeframes = {"M5": df_m5, "M15": df_m15, "M30": df_m30, "H1": df_h1, "H2": df_h2, "H4": df_h4, "D1": df_d1}
     missing = [tf for tf, df in timeframes.items() if df is None]
@@ -194,12 +252,11 @@ def get_trade_decision(symbol: str):
         print_debug(f"[DATA] Missing candles for {symbol} on: {', '.join(missing)}")
         return None
 
-    df_m5  = calculate_indicators(df_m5)
-    df_m15 = calculate_indicators(df_m15)
-    df_m30 = calculate_indicators(df_m30)
-    df_h1  = calculate_indicators(df_h1)
+    # only M15 indicators (RSI) feed the cheap gates; M30/H1/M5 are computed
+    # once a symbol survives them (zone check / returned frame)
+    df_m15 = _indicators(symbol, "M15", df_m15)
 
-    trend_dir     = detect_trend(df_m15)
+    trend_dir     = detect_trend(df_m15, key=(symbol, "M15"))
     momentum_dir  = momentum_signal(df_m15)
     bollinger_dir = bollinger_signal(df_m15)
 
@@ -211,27 +268,26 @@ def get_trade_decision(symbol: str):
 
     last_close = df_m5["close"].iloc[-1]
     support, resistance = find_recent_support_resistance(df_m5)
-    near_zone = (
-        abs(last_close - support) / last_close < 0.002 or
-        abs(last_close - resistance) / last_close < 0.002
-    )
+    zone_tol = 0.002 * last_close  # 0.2% of price
+    near_zone = abs(last_close - support) < zone_tol or abs(last_close - resistance) < zone_tol
 
     directions = [d for d in [momentum_dir, bollinger_dir, rsi_dir] if d]
     if not directions:
         print_debug(f"[REJECTED] {symbol}: No direction from indicators.")
         return None
 
-    direction = max(set(directions), key=directions.count)
+    # two-value vote; ties go to BUY (set() iteration order used to decide them)
+    buy = directions.count("BUY")
+    direction = "BUY" if buy >= len(directions) - buy else "SELL"
 
-    # conflict with chart pattern?
-    df_tf_chart = df_m15.tail(CHART_PATTERN_LOOKBACK)
-    pat = detect_pattern(df_tf_chart, expected_direction=direction)
+    # conflict with chart pattern? (the same result feeds the chart score below)
+    df_chart_m15 = df_m15.iloc[-CHART_PATTERN_LOOKBACK:]
+    pat = detect_pattern(df_chart_m15, expected_direction=direction)
     if isinstance(pat, dict) and pat.get("direction") in ("BUY", "SELL") and pat["direction"] != direction:
         print_debug(f"[REJECTED] {symbol}: M15 pattern {pat['pattern']} conflicts with {direction}.")
         return None
 
-    df_candles    = df_m15.tail(CANDLE_PATTERN_LOOKBACK)
-    df_chart_m15  = df_m15.tail(CHART_PATTERN_LOOKBACK)
+    df_candles    = df_m15.iloc[-CANDLE_PATTERN_LOOKBACK:]
 
     score = 0.0
     reasons = []
@@ -259,14 +315,16 @@ def get_trade_decision(symbol: str):
     if is_respecting_trendline(df_m15, direction):
         score += weights["trendline"]; reasons.append("Respecting trendline")
 
-    prev_candles = df_candles.iloc[:-1]
+    prev_candles = df_m15.iloc[-CANDLE_PATTERN_LOOKBACK:-1]
     if detect_candlestick_pattern(prev_candles, direction):
-        last = df_candles.iloc[-1]
-        if (direction == "BUY" and last['close'] > last['open']) or \
-           (direction == "SELL" and last['close'] < last['open']):
+        # last bar's open/close as floats; no per-row Series
+        last_open = df_m15['open'].to_numpy()[-1]
+        last_m15_close = df_m15['close'].to_numpy()[-1]
+        if (direction == "BUY" and last_m15_close > last_open) or \
+           (direction == "SELL" and last_m15_close < last_open):
             score += weights["candle"]; reasons.append("Candle pattern (confirmed)")
 
-    chart_pattern = detect_pattern(df_chart_m15, expected_direction=direction)
+    chart_pattern = pat
     if isinstance(chart_pattern, dict) and chart_pattern.get("direction") == direction:
         score += weights["chart"]; reasons.append(f"Chart={chart_pattern.get('pattern', 'pattern')}")
 
@@ -281,6 +339,8 @@ def get_trade_decision(symbol: str):
         return None
 
     # Supply/Demand Zone Check — include M15 for dynamic padding
+    df_m30 = _indicators(symbol, "M30", df_m30)
+    df_h1  = _indicators(symbol, "H1", df_h1)
     df_dict = {"M15": df_m15, "M30": df_m30, "H1": df_h1, "H2": df_h2, "H4": df_h4, "D1": df_d1}
     zones_d, zones_s, tf_used = find_zones_fallback(df_dict, direction, last_close, symbol)
 
@@ -289,18 +349,8 @@ def get_trade_decision(symbol: str):
     if direction == "SELL" and not zones_s:
         print_debug(f"[REJECTED] {symbol}: Not in supply zone on any TF."); return None
 
-    # closest zone info (optional)
-    all_zones = []
-    if direction == "BUY":
-        for tf_name, tf_df in df_dict.items():
-            if tf_df is not None:
-                dz, _, _ = find_zones_fallback({tf_name: tf_df}, direction, last_close, symbol)
-                all_zones.extend(dz)
-    else:
-        for tf_name, tf_df in df_dict.items():
-            if tf_df is not None:
-                _, sz, _ = find_zones_fallback({tf_name: tf_df}, direction, last_close, symbol)
-                all_zones.extend(sz)
+    # closest zone info (optional); reuse the zones found above rather than re-scanning per TF
+    all_zones = zones_d if direction == "BUY" else zones_s
     if all_zones:
         closest = min(all_zones, key=lambda z: abs((z[0] + z[1]) / 2 - last_close))
         print_debug(f"[INFO] Closest {direction.lower()} zone: {closest}, Distance: {abs((closest[0] + closest[1]) / 2 - last_close):.1f}")
@@ -308,13 +358,14 @@ def get_trade_decision(symbol: str):
         print_debug(f"[INFO] No {direction.lower()} zones found on any TF.")
 
     # zone reversal confirmation
-    if not detect_candlestick_pattern(df_m15.tail(CANDLE_PATTERN_LOOKBACK), direction):
+    if not detect_candlestick_pattern(df_candles, direction):
         print_debug(f"[REJECTED] {symbol}: In {direction} zone but no reversal pattern detected.")
         return None
 
     reasons.append(f"In {tf_used} {direction} zone")
     reasons.append("Reversal pattern confirmed in zone")
 
+    df_m5 = _indicators(symbol, "M5", df_m5)
     return {
         "symbol":        symbol,
         "direction":     direction,
@@ -325,18 +376,107 @@ def get_trade_decision(symbol: str):
     }
 
 
+# Optional watchdog: mirror STOP_FLAG into an Event so checks are not stat() calls
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except Exception:
+    Observer = None
+
+_STOP_EVT = threading.Event()
+_stop_observer = None
+
+
+def _sync_stop_flag():
+    if os.path.exists(STOP_FLAG):
+        _STOP_EVT.set()
+    else:
+        _STOP_EVT.clear()  # GUI/launcher may remove a stale flag
+
+
+def _start_stop_watcher() -> bool:
+    """Watch BASE_DIR for STOP_FLAG changes; False when watchdog is unavailable."""
+    global _stop_observer
+    if _stop_observer is not None:
+        return True
+    if Observer is None:
+        return False
+
+    flag_name = os.path.basename(STOP_FLAG)
+
+    class _StopFlagHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            # the log file lives in the same directory; ignore everything else
+            paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+            if any(os.path.basename(str(p)) == flag_name for p in paths if p):
+                _sync_stop_flag()
+
+    try:
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(_StopFlagHandler(), BASE_DIR, recursive=False)
+        observer.start()
+    except Exception as e:
+        print_debug(f"[WARN] STOP_FLAG watcher unavailable, polling instead: {e}")
+        return False
+    _stop_observer = observer
+    _sync_stop_flag()
+    return True
+
+
 def should_stop() -> bool:
+    if _stop_observer is not None:
+        return _STOP_EVT.is_set()
     return os.path.exists(STOP_FLAG)
 
+# base -> broker symbol, plus the broker's symbol names fetched once for suffix scans
+_RESOLVED_SYMBOLS: dict = {}
+_BROKER_SYMBOL_NAMES: tuple | None = None
+
+
+def _broker_symbol_names() -> tuple:
+    global _BROKER_SYMBOL_NAMES
+    if _BROKER_SYMBOL_NAMES is None:
+        symbols = mt5.symbols_get()
+        if not symbols:
+            return ()  # not cached: the terminal may not be ready yet
+        _BROKER_SYMBOL_NAMES = tuple(s.name for s in symbols)
+    return _BROKER_SYMBOL_NAMES
+
+
 def resolve_symbol(base_symbol: str) -> str:
     """Finds the correct broker-specific symbol (with or without suffix)."""
+    hit = _RESOLVED_SYMBOLS.get(base_symbol)
+    if hit:
+        return hit
     if mt5.symbol_select(base_symbol, True):
-        return base_symbol
-    for s in mt5.symbols_get():
-        if s.name.startswith(base_symbol):
-            mt5.symbol_select(s.name, True)
-            return s.name
-    raise Exception(f"Symbol {base_symbol} not found with any suffix")
+        name = base_symbol
+    else:
+        name = next((n for n in _broker_symbol_names() if n.startswith(base_symbol)), None)
+        if name is None:
+            raise Exception(f"Symbol {base_symbol} not found with any suffix")
+        mt5.symbol_select(name, True)
+    _RESOLVED_SYMBOLS[base_symbol] = name
+    return name
+
+
+# symbol scans run side by side; their MT5 calls are serialized by MT5_LOCK, so the
+# overlap is the indicator/pattern work between round-trips
+SCAN_WORKERS = 8
+
+
+def _scan(sym: str, candles: CandleCache):
+    """Decision for one already-resolved symbol: (sym, decision or None)."""
+    if should_stop():
+        return sym, None
+    if has_open_position(sym):
+        print_debug(f"[SKIP] {sym}: Already in trade.")
+        return sym, None
+    try:
+        return sym, get_trade_decision(sym, candles)
+    except Exception as e:
+        print_debug(f"[ERROR] {sym}: {e}")
+        return sym, None
 
 
 def run_bot():
@@ -356,7 +496,10 @@ def run_bot():
         return
 
     best_trade = None
+    candles = CandleCache()  # one download per (symbol, TF) for this tick
 
+    # symbol_select is not thread-safe: resolve serially, then scan in parallel
+    resolved = []
     for sym in ACTIVE_SYMBOLS:
         try:
             # normalize base name and resolve broker-specific symbol
@@ -364,24 +507,28 @@ def run_bot():
         except Exception as e:
             print_debug(f"[ERROR] Could not resolve symbol {sym}: {e}")
             continue
-
-        # Allow stop mid-loop
-        if should_stop():
-            print_debug("[EXIT] Stop requested during symbol loop.")
+        warm_symbol_meta(sym)
+        resolved.append(sym)
+
+    if resolved:
+        stopped = False
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(resolved)),
+                                thread_name_prefix="scan") as ex:
+            # results come back in ACTIVE_SYMBOLS order, so ties still go to the first symbol
+            for sym, decision in ex.map(lambda s: _scan(s, candles), resolved):
+                # Allow stop mid-loop
+                if should_stop():
+                    print_debug("[EXIT] Stop requested during symbol loop.")
+                    ex.shutdown(cancel_futures=True)
+                    stopped = True
+                    break
+                if decision and (not best_trade or decision["confidence"] > best_trade["confidence"]):
+                    best_trade = decision
+        if stopped:
+            # only after the with block: scans already running may still be mid-call into MT5
             mt5.shutdown()
             return
 
-        if has_open_position(sym):
-            print_debug(f"[SKIP] {sym}: Already in trade.")
-            continue
-
-        try:
-            decision = get_trade_decision(sym)
-            if decision and (not best_trade or decision["confidence"] > best_trade["confidence"]):
-                best_trade = decision
-        except Exception as e:
-            print_debug(f"[ERROR] {sym}: {e}")
-
     # Another quick stop check before actions
     if should_stop():
         print_debug("[EXIT] Stop requested before trade/management.")
@@ -408,7 +555,7 @@ def run_bot():
             mt5.shutdown()
             return
 
-        placed = place_trade(best_trade["symbol"], best_trade["direction"], balance)
+        placed = place_trade(best_trade["symbol"], best_trade["direction"], balance, candles=candles)
         if placed:
             send_telegram_message(
                 f"✅ {best_trade['symbol']} {best_trade['direction']} @ {best_trade['confidence']}%\n" +
@@ -427,8 +574,37 @@ def run_bot():
     mt5.shutdown()
 
 
+def manage_positions():
+    """Trailing-stop pass without a symbol scan, for the wakeups between M15 closes."""
+    if not mt5.initialize():
+        print_debug(f"MT5 initialization failed: {mt5.last_error()}")
+        return
+    # same gates as run_bot applies before it reaches manage_open_trades()
+    if should_stop() or not is_within_fury_window():
+        mt5.shutdown()
+        return
+    manage_open_trades()
+    mt5.shutdown()
+
+
+# decisions read closed M15 bars, so the symbol scan runs just after each bar closes;
+# open positions are still managed every CHECK_INTERVAL in between
+BAR_SECONDS = 15 * 60
+
+
+def _seconds_to_next_bar() -> float:
+    """Seconds until the next M15 close plus 1-3s jitter for the terminal to publish it (min 5s)."""
+    # server offsets are whole or half hours, so epoch-aligned M15 boundaries match the terminal's
+    remaining = BAR_SECONDS - (time.time() % BAR_SECONDS)
+    return max(5.0, remaining + random.uniform(1.0, 3.0))
+
+
 def _sleep_checking_stop(seconds: float):
     """Sleep in 1-second slices so GUI close/logout stops the bot promptly."""
+    if _stop_observer is not None:
+        # one interruptible wait; the watcher wakes it when the flag appears
+        _STOP_EVT.wait(timeout=max(1.0, float(seconds)))
+        return
     total = max(1, int(round(seconds)))
     for _ in range(total):
         if should_stop():
@@ -445,23 +621,31 @@ def main_entry():
         print_debug("[INFO] Skipping infinite loop in Streamlit context.")
         return
 
+    _start_stop_watcher()
+    next_scan = 0.0  # time.time() after which the next full scan is due (first pass scans)
     while True:
-        if os.path.exists(STOP_FLAG):
+        if should_stop():
             print_debug("[EXIT] Stop flag detected. Shutting down.")
             mt5.shutdown()
             try:
                 os.remove(STOP_FLAG)
             except Exception:
                 pass
+            flush_logs()  # os._exit skips atexit, which would drop buffered log lines
             os._exit(0)
 
         try:
-            run_bot()
+            if time.time() >= next_scan:
+                next_scan = time.time() + _seconds_to_next_bar()
+                run_bot()
+            else:
+                manage_positions()
         except Exception as loop_err:
             print_debug(f"[CRITICAL] {loop_err}")
 
-        # Sleep in short chunks so STOP_FLAG is honored immediately
-        _sleep_checking_stop(CHECK_INTERVAL)
+        # Wake for trade management every CHECK_INTERVAL, or sooner if the next bar
+        # closes first; STOP_FLAG still interrupts the wait
+        _sleep_checking_stop(min(CHECK_INTERVAL, max(1.0, next_scan - time.time())))
 
 
 if __name__ == "__main__":
@@ -1,13 +1,13 @@
 import MetaTrader5 as mt5
-import pandas as pd
+from day_trading_bot.utils.mt5_lock import MT5_LOCK
 
 def momentum_signal(df):
     """Generates momentum-based signal from a single timeframe."""
     if df is None or df.empty:
         return None
 
-    recent_close = df['close'].iloc[-1]
-    previous_close = df['close'].iloc[-2]
+    # plain floats off a NumPy view; two scalar .iloc lookups cost far more
+    previous_close, recent_close = df['close'].to_numpy()[-2:].tolist()
 
     if recent_close > previous_close:
         return 'BUY'
@@ -23,16 +23,19 @@ def momentum_signal_multi(symbol, timeframes):
     """
     directions = []
 
+    # one short download per TF; MT5 calls are serialized anyway, so no fetch pool
     for tf in timeframes:
-        rates = mt5.copy_rates_from_pos(symbol, tf, 0, 5)
+        with MT5_LOCK:
+            rates = mt5.copy_rates_from_pos(symbol, tf, 0, 5)
         if rates is None or len(rates) < 2:
             continue
 
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        signal = momentum_signal(df)
-        if signal:
-            directions.append(signal)
+        # rates is already a structured ndarray; no DataFrame needed for two closes
+        previous_close, recent_close = rates['close'][-2:].tolist()
+        if recent_close > previous_close:
+            directions.append('BUY')
+        elif recent_close < previous_close:
+            directions.append('SELL')
 
     if not directions:
         return None
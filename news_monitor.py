@@ -1,15 +1,40 @@
 import os
+import heapq
+import itertools
 import json
 import time
 import threading
 import requests
 import pytz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tkinter as tk
 
 from tkinter import messagebox
 from datetime import datetime, timedelta, timezone
 from bs4 import BeautifulSoup
 
+# Optional orjson for the news cache (C parser, reads/writes bytes)
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# Optional lxml: C parser + precompiled XPath (falls back to BS4/html.parser)
+try:
+    from lxml import etree, html as lxml_html
+
+    def _cls(name):  # XPath equivalent of the CSS class selector ".name"
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    _X_ROWS     = etree.XPath(f"//tr[{_cls('js-event-item')}]")
+    _X_TITLE    = etree.XPath(f".//*[{_cls('event')}]")
+    _X_FORECAST = etree.XPath(f".//*[{_cls('forecast')}]")
+    _X_ACTUAL   = etree.XPath(f".//*[{_cls('actual')}]")
+    _X_ICONS    = etree.XPath(f"count(.//*[{_cls('sentiment')}]/i)")
+except Exception:
+    lxml_html = None
+
 # ─── CONFIG ────────────────────────────────────────────────────────────────
 TIMEZONE              = pytz.timezone("Africa/Lagos")  # GMT+1
 TARGET_CURRENCIES     = ["USD", "GBP", "EUR"]
@@ -25,19 +50,60 @@ REQUESTS_HEADERS = {
         "Chrome/115.0.0.0 Safari/537.36"
     )
 }
+
+# one pooled keep-alive session for every calendar request
+_SESSION = requests.Session()
+_SESSION.headers.update(REQUESTS_HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
 # ─────────────────────────────────────────────────────────────────────────────
 
+# ─── SCHEDULER ─────────────────────────────────────────────────────────────
+# One worker thread drains a heap of (fire_ts, seq, callback) instead of a
+# threading.Timer thread per alert (same design as fetch_daily_news.py; this
+# module stays importable as a standalone script).
+_SCHEDULE = []
+_SCHEDULE_COND = threading.Condition()
+_SCHEDULE_SEQ = itertools.count()  # tie-breaker so callbacks are never compared
+_scheduler_thread = None
+
+def _run_scheduler():
+    while True:
+        with _SCHEDULE_COND:
+            while not _SCHEDULE or _SCHEDULE[0][0] > time.time():
+                timeout = (_SCHEDULE[0][0] - time.time()) if _SCHEDULE else None
+                _SCHEDULE_COND.wait(timeout)
+            _, _, callback = heapq.heappop(_SCHEDULE)
+        try:
+            callback()
+        except Exception as e:
+            print(f"[NEWS] scheduled alert failed: {e}")
+
+def schedule_in(delay_seconds, callback):
+    """Run `callback` after `delay_seconds` on the shared scheduler thread."""
+    global _scheduler_thread
+    with _SCHEDULE_COND:
+        heapq.heappush(_SCHEDULE, (time.time() + max(0.0, delay_seconds), next(_SCHEDULE_SEQ), callback))
+        if _scheduler_thread is None:
+            _scheduler_thread = threading.Thread(target=_run_scheduler, name="news-scheduler")
+            _scheduler_thread.start()
+        _SCHEDULE_COND.notify()
+
 def fetch_daily_news():
     """
     Scrape Investing.com economic calendar page via requests/BS4,
     filter for today’s USD/GBP/EUR events, return list of dicts.
     """
     url = "https://www.investing.com/economic-calendar/"
-    resp = requests.get(url, headers=REQUESTS_HEADERS, timeout=15)
+    resp = _SESSION.get(url, timeout=15)
     resp.raise_for_status()
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    rows = soup.select("tr.js-event-item")
+    if lxml_html is not None:
+        rows = _X_ROWS(lxml_html.fromstring(resp.content))
+        fields = _row_fields_lxml
+    else:
+        rows = BeautifulSoup(resp.text, "html.parser").select("tr.js-event-item")
+        fields = _row_fields_bs4
     today = datetime.now(TIMEZONE).date()
     out = []
 
@@ -65,28 +131,51 @@ def fetch_daily_news():
         if cur not in TARGET_CURRENCIES:
             continue
 
-        title_el    = row.select_one(".event")
-        forecast_el = row.select_one(".forecast")
-        actual_el   = row.select_one(".actual")
-        icons       = row.select(".sentiment > i")
+        title, forecast, actual, icons = fields(row)
 
         # impact by count of “i” icons
         impact = "Low"
         if icons:
-            cnt = min(len(icons), 3)
+            cnt = min(icons, 3)
             impact = ["Low", "Medium", "High"][cnt-1]
 
         out.append({
             "currency": cur,
             "time":      ev_local.strftime("%H:%M"),
-            "title":     (title_el.text.strip()    if title_el    else "?"),
+            "title":     (title if title is not None else "?"),
             "impact":    impact,
-            "forecast":  (forecast_el.text.strip() if forecast_el else None),
-            "actual":    (actual_el.text.strip()   if actual_el   else None),
+            "forecast":  forecast,
+            "actual":    actual,
+            # numeric copies parsed once, so infer_direction is a plain compare
+            "forecast_f": _safe_float(forecast),
+            "actual_f":   _safe_float(actual),
         })
 
     return out
 
+def _row_fields_bs4(row):
+    """(title, forecast, actual, icon count) for one calendar row; None when absent."""
+    title_el    = row.select_one(".event")
+    forecast_el = row.select_one(".forecast")
+    actual_el   = row.select_one(".actual")
+    return (
+        title_el.text.strip()    if title_el    else None,
+        forecast_el.text.strip() if forecast_el else None,
+        actual_el.text.strip()   if actual_el   else None,
+        len(row.select(".sentiment > i")),
+    )
+
+def _row_fields_lxml(row):
+    def first_text(xp):
+        hit = xp(row)
+        return hit[0].text_content().strip() if hit else None
+    return (
+        first_text(_X_TITLE),
+        first_text(_X_FORECAST),
+        first_text(_X_ACTUAL),
+        int(_X_ICONS(row)),
+    )
+
 def show_popup(title, msg):
     """Fire a tkinter messagebox in its own thread."""
     def _go():
@@ -96,24 +185,33 @@ def show_popup(title, msg):
         root.destroy()
     threading.Thread(target=_go).start()
 
+def _safe_float(v):
+    """'0.5%' -> 0.5; None for blanks and anything non-numeric."""
+    try:
+        return float(str(v).replace("%",""))
+    except (TypeError, ValueError):
+        return None
+
 def infer_direction(ev):
     """Compare actual vs forecast → BUY/SELL or None."""
-    try:
-        a = float(str(ev["actual"]).replace("%",""))
-        f = float(str(ev["forecast"]).replace("%",""))
-        c = ev["currency"]
-        if a > f: return f"{c} → BUY"
-        if a < f: return f"{c} → SELL"
-    except:
-        pass
+    # events cached by older versions have no pre-parsed fields
+    a = ev["actual_f"]   if "actual_f"   in ev else _safe_float(ev.get("actual"))
+    f = ev["forecast_f"] if "forecast_f" in ev else _safe_float(ev.get("forecast"))
+    if a is None or f is None:
+        return None
+    c = ev.get("currency")
+    if a > f: return f"{c} → BUY"
+    if a < f: return f"{c} → SELL"
     return None
 
+_PAIRS_MAP = {
+    "USD": ("EURUSD","GBPUSD","USDJPY","XAUUSD"),
+    "GBP": ("GBPUSD","EURGBP","GBPJPY"),
+    "EUR": ("EURUSD","EURGBP","EURJPY"),
+}
+
 def get_affected_pairs(c):
-    return {
-        "USD": ["EURUSD","GBPUSD","USDJPY","XAUUSD"],
-        "GBP": ["GBPUSD","EURGBP","GBPJPY"],
-        "EUR": ["EURUSD","EURGBP","EURJPY"],
-    }.get(c, [])
+    return _PAIRS_MAP.get(c, ())
 
 def schedule_alerts(news):
     now = datetime.now(TIMEZONE)
@@ -137,7 +235,7 @@ def schedule_alerts(news):
                     f"Affected: {pairs}\nExpected: {direction}"
                 )
             delay = (evt - timedelta(minutes=mins) - now).total_seconds()
-            threading.Timer(delay, _alert).start()
+            schedule_in(delay, _alert)
 
         make_alert(30)
         make_alert(2)
@@ -150,9 +248,9 @@ def schedule_alerts(news):
                 f"Direction: {direction}\nAffected: {pairs}"
             )
         post_delay = (evt - now).total_seconds() + 60
-        threading.Timer(post_delay, after).start()
+        schedule_in(post_delay, after)
 
-def periodic_summary(news):
+def _summary_text(news):
     lines = []
     for ev in news:
         d = infer_direction(ev) or "?"
@@ -161,16 +259,37 @@ def periodic_summary(news):
             f"{ev['time']} | {ev['currency']} | {ev['title']} | {ev['impact']}\n"
             f"Affected: {p}\nExpected: {d}\n"
         )
-    summary = "\n".join(lines) or "No news for today."
+    return "\n".join(lines) or "No news for today."
+
+def periodic_summary(news, summary=None):
+    # the day's news is fixed once loaded, so reminders reuse the first rendering
+    if summary is None:
+        summary = _summary_text(news)
     show_popup("3-Hour News Summary", summary)
-    threading.Timer(REMINDER_INTERVAL_HOURS*3600,
-                    lambda: periodic_summary(news)
-                   ).start()
+    schedule_in(REMINDER_INTERVAL_HOURS*3600, lambda: periodic_summary(news, summary))
+
+def _load_news_cache():
+    with open(CACHE_NEWS_FILE, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+
+def _save_news_cache(news):
+    # same indented JSON either way, so the cache stays human-readable
+    if orjson is not None:
+        with open(CACHE_NEWS_FILE, "wb") as f:
+            f.write(orjson.dumps(news, option=orjson.OPT_INDENT_2))
+    else:
+        with open(CACHE_NEWS_FILE, "w", encoding="utf-8") as f:
+            json.dump(news, f, indent=2)
 
 def start_news_monitor():
     # ─── clear cache on new day ────────────────────────────────────────
     today = datetime.now(TIMEZONE).date().isoformat()
-    if not os.path.exists(CACHE_DATE_FILE) or open(CACHE_DATE_FILE).read().strip() != today:
+    cached_day = None
+    if os.path.exists(CACHE_DATE_FILE):
+        with open(CACHE_DATE_FILE) as f:
+            cached_day = f.read().strip()
+    if cached_day != today:
         with open(CACHE_DATE_FILE, "w") as f:
             f.write(today)
         if os.path.exists(CACHE_NEWS_FILE):
@@ -178,10 +297,10 @@ def start_news_monitor():
 
     # ─── load or fetch ─────────────────────────────────────────────────
     if os.path.exists(CACHE_NEWS_FILE):
-        news = json.load(open(CACHE_NEWS_FILE))
+        news = _load_news_cache()
     else:
         news = fetch_daily_news()
-        json.dump(news, open(CACHE_NEWS_FILE, "w"), indent=2)
+        _save_news_cache(news)
 
     schedule_alerts(news)
     periodic_summary(news)
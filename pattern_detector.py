@@ -3,7 +3,7 @@ import pandas as pd
 import numpy as np
 from typing import Optional
 
-# --- SciPy optional (fallback to simple local-extrema) ---
+# --- SciPy optional (fallback to simple local-extrema: Numba when installed, else NumPy) ---
 try:
     from scipy.signal import argrelextrema
     def _extrema(prices: pd.Series, order: int = 5):
@@ -11,89 +11,137 @@ try:
         local_max = argrelextrema(prices.values, np.greater_equal, order=order)[0]
         return local_min, local_max
 except Exception:
+    from numpy.lib.stride_tricks import sliding_window_view
+
     def _extrema(prices: pd.Series, order: int = 5):
-        vals = prices.values
-        mins, maxs = [], []
-        n = len(vals)
-        for i in range(order, n - order):
-            left  = vals[i - order:i]
-            right = vals[i + 1:i + 1 + order]
-            if (vals[i] <= left).all() and (vals[i] <= right).all():
-                mins.append(i)
-            if (vals[i] >= left).all() and (vals[i] >= right).all():
-                maxs.append(i)
-        return np.array(mins, dtype=int), np.array(maxs, dtype=int)
+        vals = np.asarray(prices.values, dtype=float)
+        if len(vals) < 2 * order + 1:
+            return np.array([], dtype=int), np.array([], dtype=int)
+        # one row per candidate bar i in [order, n-order), centred on i
+        w = sliding_window_view(vals, 2 * order + 1)
+        center = w[:, order]
+        mins = np.flatnonzero(center <= w.min(axis=1)) + order
+        maxs = np.flatnonzero(center >= w.max(axis=1)) + order
+        return mins, maxs
+
+    # --- Numba optional: one compiled sweep that quits each window at the first
+    # neighbour ruling out both a min and a max (same results as above) ---
+    try:
+        from numba import njit
+
+        # eager signature: compiled (or loaded from cache) at import, not on first scan
+        @njit("UniTuple(int64[:], 2)(float64[:], int64)", cache=True)
+        def _extrema_kernel(vals, order):
+            n = vals.shape[0]
+            mins = np.empty(n, dtype=np.int64)
+            maxs = np.empty(n, dtype=np.int64)
+            n_min = 0
+            n_max = 0
+            for i in range(order, n - order):
+                v = vals[i]
+                is_min = True
+                is_max = True
+                for j in range(i - order, i + order + 1):
+                    if j == i:
+                        continue
+                    # written as "not <=" so NaN neighbours reject, like the NumPy path
+                    if not (v <= vals[j]):
+                        is_min = False
+                    if not (v >= vals[j]):
+                        is_max = False
+                    if not (is_min or is_max):
+                        break
+                if is_min:
+                    mins[n_min] = i
+                    n_min += 1
+                if is_max:
+                    maxs[n_max] = i
+                    n_max += 1
+            return mins[:n_min], maxs[:n_max]
+
+        def _extrema(prices: pd.Series, order: int = 5):
+            vals = np.ascontiguousarray(prices.values, dtype=np.float64)
+            return _extrema_kernel(vals, order)
+    except Exception:
+        pass
 
 def find_local_extrema(prices: pd.Series, order: int = 5):
     return _extrema(prices, order=order)
 
-def detect_double_bottom(df: pd.DataFrame) -> bool:
-    local_min, _ = find_local_extrema(df['low'], order=5)
+def _pattern_extrema(df: pd.DataFrame):
+    """
+    (low minima, low maxima, high minima, high maxima) at order=5.
+    detect_pattern computes this once and hands it to every full-frame detector.
+    """
+    low_min, low_max = find_local_extrema(df['low'], order=5)
+    high_min, high_max = find_local_extrema(df['high'], order=5)
+    return low_min, low_max, high_min, high_max
+
+def detect_double_bottom(df: pd.DataFrame, ext=None) -> bool:
+    local_min = (ext or _pattern_extrema(df))[0]
     if len(local_min) < 2: return False
-    b = df.iloc[local_min]
-    return abs(b['low'].iloc[-1] - b['low'].iloc[-2]) < 1e-3
+    b = df['low'].to_numpy()[local_min[-2:]]
+    return abs(b[-1] - b[-2]) < 1e-3
 
-def detect_double_top(df: pd.DataFrame) -> bool:
-    _, local_max = find_local_extrema(df['high'], order=5)
+def detect_double_top(df: pd.DataFrame, ext=None) -> bool:
+    local_max = (ext or _pattern_extrema(df))[3]
     if len(local_max) < 2: return False
-    t = df.iloc[local_max]
-    return abs(t['high'].iloc[-1] - t['high'].iloc[-2]) < 1e-3
+    t = df['high'].to_numpy()[local_max[-2:]]
+    return abs(t[-1] - t[-2]) < 1e-3
 
 def detect_rectangle(df: pd.DataFrame, tolerance: float = 0.002) -> bool:
-    spread = df['high'].max() - df['low'].min()
-    avg_close = df['close'].mean()
+    if len(df) == 0: return False
+    # nan-aware reductions on the raw columns skip gaps the way pandas did
+    spread = np.nanmax(df['high'].to_numpy(dtype=float)) - np.nanmin(df['low'].to_numpy(dtype=float))
+    avg_close = np.nanmean(df['close'].to_numpy(dtype=float))
     return spread <= tolerance * avg_close
 
-def detect_head_and_shoulders(df: pd.DataFrame) -> bool:
-    low_mins, high_maxs = find_local_extrema(df['low'], order=5)
+def detect_head_and_shoulders(df: pd.DataFrame, ext=None) -> bool:
+    low_mins, high_maxs = (ext or _pattern_extrema(df))[:2]  # both from the lows
     if len(high_maxs) < 3 or len(low_mins) < 2: return False
-    peaks = df['high'].iloc[high_maxs][-3:]
-    troughs = df['low'].iloc[low_mins][-2:]
-    left, head, right = peaks.values
-    valley1, valley2 = troughs.values
+    left, head, right = df['high'].to_numpy()[high_maxs[-3:]]
+    valley1, valley2 = df['low'].to_numpy()[low_mins[-2:]]
     cond_head = head > left and head > right
     cond_shoulders = abs(left - right) / max(left, right) < 0.03
     cond_valleys = valley1 < left and valley2 < right
     return cond_head and cond_shoulders and cond_valleys
 
-def detect_inverse_head_and_shoulders(df: pd.DataFrame) -> bool:
-    low_mins, high_maxs = find_local_extrema(df['low'], order=5)
+def detect_inverse_head_and_shoulders(df: pd.DataFrame, ext=None) -> bool:
+    low_mins, high_maxs = (ext or _pattern_extrema(df))[:2]  # both from the lows
     if len(low_mins) < 3 or len(high_maxs) < 2: return False
-    troughs = df['low'].iloc[low_mins][-3:]
-    peaks = df['high'].iloc[high_maxs][-2:]
-    left, head, right = troughs.values
-    peak1, peak2 = peaks.values
+    left, head, right = df['low'].to_numpy()[low_mins[-3:]]
+    peak1, peak2 = df['high'].to_numpy()[high_maxs[-2:]]
     cond_head = head < left and head < right
     cond_shoulders = abs(left - right) / max(left, right) < 0.03
     cond_peaks = peak1 > head and peak2 > head
     return cond_head and cond_shoulders and cond_peaks
 
-def detect_ascending_triangle(df: pd.DataFrame, tol: float = 0.005) -> bool:
-    low_idxs, _ = find_local_extrema(df['low'], order=5)
-    _, high_idxs = find_local_extrema(df['high'], order=5)
+def detect_ascending_triangle(df: pd.DataFrame, tol: float = 0.005, ext=None) -> bool:
+    ext = ext or _pattern_extrema(df)
+    low_idxs, high_idxs = ext[0], ext[3]
     if len(low_idxs) < 2 or len(high_idxs) < 2: return False
-    low_vals = df['low'].iloc[low_idxs[-2:]].values
-    high_vals = df['high'].iloc[high_idxs[-2:]].values
+    low_vals = df['low'].to_numpy()[low_idxs[-2:]]
+    high_vals = df['high'].to_numpy()[high_idxs[-2:]]
     cond_lows = low_vals[1] > low_vals[0]
     cond_highs = abs(high_vals[1] - high_vals[0]) / np.mean(high_vals) < tol
     return cond_lows and cond_highs
 
-def detect_descending_triangle(df: pd.DataFrame, tol: float = 0.005) -> bool:
-    low_idxs, _ = find_local_extrema(df['low'], order=5)
-    _, high_idxs = find_local_extrema(df['high'], order=5)
+def detect_descending_triangle(df: pd.DataFrame, tol: float = 0.005, ext=None) -> bool:
+    ext = ext or _pattern_extrema(df)
+    low_idxs, high_idxs = ext[0], ext[3]
     if len(low_idxs) < 2 or len(high_idxs) < 2: return False
-    low_vals = df['low'].iloc[low_idxs[-2:]].values
-    high_vals = df['high'].iloc[high_idxs[-2:]].values
+    low_vals = df['low'].to_numpy()[low_idxs[-2:]]
+    high_vals = df['high'].to_numpy()[high_idxs[-2:]]
     cond_lows = abs(low_vals[1] - low_vals[0]) / np.mean(low_vals) < tol
     cond_highs = high_vals[1] < high_vals[0]
     return cond_lows and cond_highs
 
-def detect_symmetric_triangle(df: pd.DataFrame, tol: float = 0.01) -> bool:
-    low_idxs, _ = find_local_extrema(df['low'], order=5)
-    _, high_idxs = find_local_extrema(df['high'], order=5)
+def detect_symmetric_triangle(df: pd.DataFrame, tol: float = 0.01, ext=None) -> bool:
+    ext = ext or _pattern_extrema(df)
+    low_idxs, high_idxs = ext[0], ext[3]
     if len(low_idxs) < 2 or len(high_idxs) < 2: return False
-    low_vals = df['low'].iloc[low_idxs[-2:]].values
-    high_vals = df['high'].iloc[high_idxs[-2:]].values
+    low_vals = df['low'].to_numpy()[low_idxs[-2:]]
+    high_vals = df['high'].to_numpy()[high_idxs[-2:]]
     cond_lows = low_vals[1] > low_vals[0]
     cond_highs = high_vals[1] < high_vals[0]
     gap1 = high_vals[0] - low_vals[0]
@@ -101,12 +149,11 @@ def detect_symmetric_triangle(df: pd.DataFrame, tol: float = 0.01) -> bool:
     cond_gap = gap2 < gap1 * (1 - tol)
     return cond_lows and cond_highs and cond_gap
 
-def detect_wedge(df: pd.DataFrame) -> bool:
-    low_idxs, _ = find_local_extrema(df['low'], order=5)
-    _, high_idxs = find_local_extrema(df['high'], order=5)
+def _detect_wedge_core(lows: np.ndarray, highs: np.ndarray, low_idxs, high_idxs) -> bool:
+    """Wedge test on raw low/high arrays and their swing-low / swing-high positions."""
     if len(low_idxs) < 2 or len(high_idxs) < 2: return False
-    low_vals = df['low'].iloc[low_idxs[-2:]].values
-    high_vals = df['high'].iloc[high_idxs[-2:]].values
+    low_vals = lows[low_idxs[-2:]]
+    high_vals = highs[high_idxs[-2:]]
     delta_low = low_vals[1] - low_vals[0]
     delta_high = high_vals[1] - high_vals[0]
     width1 = high_vals[0] - low_vals[0]
@@ -115,11 +162,15 @@ def detect_wedge(df: pd.DataFrame) -> bool:
     cond_same_dir = (delta_low * delta_high) > 0
     return cond_same_dir and cond_contract
 
+def detect_wedge(df: pd.DataFrame, ext=None) -> bool:
+    ext = ext or _pattern_extrema(df)
+    return _detect_wedge_core(df['low'].to_numpy(), df['high'].to_numpy(), ext[0], ext[3])
+
 def detect_flag(df: pd.DataFrame, tolerance: float = 0.003) -> bool:
     n = len(df)
     if n < 10: return False
-    half = df.iloc[: n//2]
-    pole_move = abs(half['close'].iloc[-1] - half['close'].iloc[0]) / half['close'].iloc[0]
+    half = df['close'].to_numpy()[: n//2]
+    pole_move = abs(half[-1] - half[0]) / half[0]
     grip = detect_rectangle(df.iloc[n//2 :], tolerance=tolerance)
     return pole_move > 0.02 and grip
 
@@ -127,42 +178,62 @@ def detect_pennant(df: pd.DataFrame) -> bool:
     n = len(df)
     if n < 10: return False
     tail = df.iloc[- n//3 :]
-    return detect_wedge(tail)
+    lows, highs = tail['low'], tail['high']
+    # the wedge only needs swing lows of the lows and swing highs of the highs
+    low_idxs = find_local_extrema(lows, order=5)[0]
+    high_idxs = find_local_extrema(highs, order=5)[1]
+    return _detect_wedge_core(lows.to_numpy(), highs.to_numpy(), low_idxs, high_idxs)
 
 def detect_cup_and_handle(df: pd.DataFrame) -> bool:
     n = len(df)
     if n < 12: return False
     third = n // 3
-    cup = df.iloc[: 2*third]
     handle = df.iloc[2*third :]
-    highs = cup['high']
-    if abs(highs.iloc[0] - highs.iloc[-1]) / highs.mean() > 0.01:
+    highs = df['high'].to_numpy(dtype=float)[: 2*third]
+    highs_mean = np.nanmean(highs)
+    if abs(highs[0] - highs[-1]) / highs_mean > 0.01:
         return False
-    trough = cup['low'].min()
-    if trough > highs.mean() * 0.98:
+    trough = np.nanmin(df['low'].to_numpy(dtype=float)[: 2*third])
+    if trough > highs_mean * 0.98:
         return False
     return detect_rectangle(handle, tolerance=0.005)
 
+# (detector, direction, name, takes shared extrema); flag/pennant/cup/rectangle
+# work on sub-windows or plain min/max, so they don't use the full-frame extrema
+_PATTERNS = (
+    (detect_double_bottom, "BUY", "Double Bottom", True),
+    (detect_double_top, "SELL", "Double Top", True),
+    (detect_head_and_shoulders, "SELL", "Head and Shoulders", True),
+    (detect_inverse_head_and_shoulders, "BUY", "Inverse Head and Shoulders", True),
+    (detect_ascending_triangle, "BUY", "Ascending Triangle", True),
+    (detect_descending_triangle, "SELL", "Descending Triangle", True),
+    (detect_symmetric_triangle, None, "Symmetric Triangle", True),
+    (detect_wedge, None, "Wedge", True),
+    (detect_flag, None, "Flag", False),
+    (detect_pennant, None, "Pennant", False),
+    (detect_cup_and_handle, "BUY", "Cup and Handle", False),
+    (detect_rectangle, None, "Rectangle", False),
+)
+
+def _scan_order(expected_direction: Optional[str]):
+    """
+    Patterns agreeing with `expected_direction` first, then the rest, each group
+    in _PATTERNS priority order. The first hit in this order is exactly what the
+    old full scan returned (first expected match, else first match overall).
+    """
+    if not expected_direction:
+        return _PATTERNS
+    return (tuple(p for p in _PATTERNS if p[1] == expected_direction)
+            + tuple(p for p in _PATTERNS if p[1] != expected_direction))
+
+_SCAN_ORDERS = {d: _scan_order(d) for d in (None, "BUY", "SELL")}
+
 def detect_pattern(df: pd.DataFrame, expected_direction: Optional[str] = None):
-    patterns = [
-        (detect_double_bottom, "BUY", "Double Bottom"),
-        (detect_double_top, "SELL", "Double Top"),
-        (detect_head_and_shoulders, "SELL", "Head and Shoulders"),
-        (detect_inverse_head_and_shoulders, "BUY", "Inverse Head and Shoulders"),
-        (detect_ascending_triangle, "BUY", "Ascending Triangle"),
-        (detect_descending_triangle, "SELL", "Descending Triangle"),
-        (detect_symmetric_triangle, None, "Symmetric Triangle"),
-        (detect_wedge, None, "Wedge"),
-        (detect_flag, None, "Flag"),
-        (detect_pennant, None, "Pennant"),
-        (detect_cup_and_handle, "BUY", "Cup and Handle"),
-        (detect_rectangle, None, "Rectangle"),
-    ]
-    fallback = None
-    for func, direction, name in patterns:
-        if func(df):
-            if expected_direction and direction == expected_direction:
-                return {"direction": direction, "pattern": name}
-            if fallback is None:
-                fallback = {"direction": direction, "pattern": name}
-    return fallback
+    order = _SCAN_ORDERS.get(expected_direction or None) or _scan_order(expected_direction)
+    ext = None
+    for func, direction, name, shared in order:
+        if shared and ext is None:
+            ext = _pattern_extrema(df)  # one extrema pass per series instead of one per detector
+        if (func(df, ext=ext) if shared else func(df)):
+            return {"direction": direction, "pattern": name}
+    return None
@@ -2,25 +2,43 @@
 
 import os
 import csv
+import atexit
+import threading
 from datetime import datetime
 from typing import List, Dict
 
 LOG_FILE = "trade_log.csv"
 
+# Parsed rows of LOG_FILE, re-read only when its mtime changes
+_READ_CACHE: Dict = {"mtime": None, "rows": [], "summary": None}
+
+
+HEADER = ["timestamp", "symbol", "direction", "lot_size", "entry_price", "tp", "sl", "confidence", "reasons"]
+
+# One append handle for the process instead of open/stat/close per trade
+_FH = None
+_WRITER = None
+_WRITE_LOCK = threading.Lock()
+
+
+def _writer() -> csv.DictWriter:
+    global _FH, _WRITER
+    if _WRITER is None:
+        new_file = not os.path.isfile(LOG_FILE) or os.path.getsize(LOG_FILE) == 0
+        _FH = open(LOG_FILE, mode="a", newline="", encoding="utf-8", buffering=1 << 16)
+        _WRITER = csv.DictWriter(_FH, fieldnames=HEADER)
+        if new_file:
+            _WRITER.writeheader()
+        atexit.register(_FH.close)
+    return _WRITER
+
 
 # ------------------------
 # Save trade to log
 # ------------------------
 def log_trade(trade_data: Dict):
-    header = ["timestamp", "symbol", "direction", "lot_size", "entry_price", "tp", "sl", "confidence", "reasons"]
-
-    file_exists = os.path.isfile(LOG_FILE)
-
-    with open(LOG_FILE, mode="a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=header)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow({
+    with _WRITE_LOCK:
+        _writer().writerow({
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "symbol": trade_data.get("symbol"),
             "direction": trade_data.get("direction"),
@@ -31,18 +49,24 @@ def log_trade(trade_data: Dict):
             "confidence": trade_data.get("confidence"),
             "reasons": "; ".join(trade_data.get("reasons", []))
         })
+        # trades are rare and read_log may run in the same process: one write() per row
+        _FH.flush()
 
 
 # ------------------------
 # Read trade log
 # ------------------------
 def read_log() -> List[Dict]:
-    if not os.path.exists(LOG_FILE):
+    try:
+        mtime = os.stat(LOG_FILE).st_mtime_ns
+    except OSError:
         return []
-
-    with open(LOG_FILE, mode="r", newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        return list(reader)
+    if _READ_CACHE["mtime"] != mtime:
+        with open(LOG_FILE, mode="r", newline="", encoding="utf-8") as file:
+            _READ_CACHE["rows"] = list(csv.DictReader(file))
+        _READ_CACHE["mtime"] = mtime
+        _READ_CACHE["summary"] = None
+    return list(_READ_CACHE["rows"])
 
 
 # ------------------------
@@ -54,12 +78,16 @@ def summarize_performance() -> Dict:
     if total == 0:
         return {"total": 0, "buy": 0, "sell": 0}
 
-    buy_count = sum(1 for t in trades if t["direction"] == "BUY")
-    sell_count = total - buy_count
-
-    return {
-        "total": total,
-        "buy": buy_count,
-        "sell": sell_count,
-        "symbols": list(set(t["symbol"] for t in trades))
-    }
+    # computed once per log version (read_log resets it when the file changes)
+    summary = _READ_CACHE["summary"]
+    if summary is None:
+        # pull each column out once; list.count / set() then run in C
+        directions = [t["direction"] for t in trades]
+        buy_count = directions.count("BUY")
+        summary = _READ_CACHE["summary"] = {
+            "total": total,
+            "buy": buy_count,
+            "sell": total - buy_count,
+            "symbols": list(set([t["symbol"] for t in trades]))
+        }
+    return {**summary, "symbols": list(summary["symbols"])}
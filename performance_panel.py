@@ -1,15 +1,38 @@
 # performance_panel.py
 
+import numpy as np
 import pandas as pd
 import os
 import streamlit as st
 from day_trading_bot.config import TRADE_LOG_FILE
 
+try:  # optional: multithreaded CSV parser (numpy dtypes are kept for calculate_performance)
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = "pyarrow"
+except Exception:
+    _CSV_ENGINE = "c"
+
+def _read_trade_csv(path):
+    if _CSV_ENGINE == "pyarrow":
+        try:
+            return pd.read_csv(path, engine="pyarrow", on_bad_lines='skip')
+        except (ImportError, ValueError):
+            pass  # older pandas/pyarrow without these options: use the C parser
+    return pd.read_csv(path, on_bad_lines='skip')
+
+# Parsed trade log, kept across Streamlit reruns until the file's mtime changes
+_CACHE = {"mtime": None, "df": None}
+
 def load_trade_log():
-    if os.path.exists(TRADE_LOG_FILE):
-        return pd.read_csv(TRADE_LOG_FILE, on_bad_lines='skip')
-    else:
+    """Trade log as a DataFrame (shared between reruns; treat it as read-only)."""
+    try:
+        mtime = os.stat(TRADE_LOG_FILE).st_mtime_ns
+    except OSError:
         return pd.DataFrame(columns=["symbol", "direction", "volume", "price_open", "price_close", "profit", "timestamp"])
+    if _CACHE["mtime"] != mtime:
+        _CACHE["df"] = _read_trade_csv(TRADE_LOG_FILE)
+        _CACHE["mtime"] = mtime
+    return _CACHE["df"]
 
 def calculate_performance(df):
     """
@@ -24,14 +47,17 @@ def calculate_performance(df):
             "Max Drawdown": 0.0
         }
 
-    wins = df[df['profit'] > 0]
-    losses = df[df['profit'] <= 0]
+    # one float array instead of two filtered frames; blanks (NaN) are neither
+    # wins nor losses and are skipped by the sum/mean, as pandas did
+    p = df['profit'].to_numpy(dtype=np.float64)
+    losses = p[p <= 0]
+    valid = p[~np.isnan(p)]
 
     total_trades = len(df)
-    net_profit = round(df['profit'].sum(), 2)
-    win_rate = round((len(wins) / total_trades) * 100, 2) if total_trades else 0.0
-    avg_profit = round(df['profit'].mean(), 2) if total_trades else 0.0
-    max_drawdown = round(losses['profit'].min(), 2) if not losses.empty else 0.0
+    net_profit = round(float(valid.sum()), 2)
+    win_rate = round((int((p > 0).sum()) / total_trades) * 100, 2) if total_trades else 0.0
+    avg_profit = round(float(valid.mean()), 2) if valid.size else float("nan")
+    max_drawdown = round(float(losses.min()), 2) if losses.size else 0.0
 
     return {
         "Total Trades": total_trades,
@@ -1,5 +1,7 @@
 # day_trading_bot/reversal_signal.py
 
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 
@@ -17,6 +19,7 @@ from day_trading_bot.candle_patterns import (
     is_tweezer_bottom,
     is_bullish_harami,
     is_bearish_harami,
+    pattern_mask,
 )
 from day_trading_bot.utils.logger import print_debug
 from day_trading_bot.utils.fetch_candles import fetch_candles
@@ -53,6 +56,7 @@ TF_CANDLE_COUNTS = {
 
 REQUIRED_TIMEFRAMES = ["M1", "M5", "M15", "M30", "H1", "H2", "H4", "D1"]
 
+@lru_cache(maxsize=64)
 def _pip_size(symbol: str) -> float:
     s = symbol.upper()
     if "XAU" in s:   return 0.1   # many brokers: 0.1 price units per pip
@@ -75,24 +79,30 @@ def detect_reversal_signal(symbol, direction, fetch_candles_fn=fetch_candles):
             print_debug(f"[{label}] {symbol}: insufficient data.")
             continue
 
-        current_price = float(df_full["close"].iloc[-1])
+        closes = df_full["close"].to_numpy()  # reused for price and the momentum slopes
+        current_price = float(closes[-1])
         print_debug(f"[{label}] {symbol}: {len(df_full)} candles, price: {current_price:.5f}")
 
-        df_recent = df_full.tail(TF_CANDLE_COUNTS[label])
-        if df_recent.empty or len(df_recent) < 5:
+        # the filters below cover the last `count` bars (== the whole fetch); plain
+        # array views replace the old df_full.tail(count) copy-alias
+        opens = df_full["open"].to_numpy(dtype=float)[-count:]
+        if len(opens) < 5:
             continue
 
-        # Basic chop/vol filters
-        directions = np.sign(df_recent["close"] - df_recent["open"])
-        body_sizes = (df_recent["close"] - df_recent["open"]).abs()
+        # Basic chop/vol filters (plain arrays; ddof=1 matches the old Series.std())
+        diff = np.asarray(closes[-count:], dtype=float) - opens
+        directions = np.sign(diff)
+        body_sizes = np.abs(diff)
         avg_body = float(body_sizes.mean())
-        if np.sum(directions) <= 2 and body_sizes.std() < avg_body * 0.5:
+        if directions.sum() <= 2 and body_sizes.std(ddof=1) < avg_body * 0.5:
             print_debug(f"[{label}] {symbol}: choppy market, skipping")
             continue
 
-        # Pattern + zone context
-        pattern_match = any(bool(p(df_recent)) for p in patterns)
+        # Pattern + zone context: `patterns` is the full ALL_PATTERNS battery, so one
+        # pattern_mask pass (last 3 bars extracted once) answers any(p(df))
+        pattern_match = pattern_mask(df_full) != 0
 
+        # needs the full frame: lookback counts from the oldest bar, with label indexing
         supports, resistances = find_nearest_levels(df_full, window=20, lookback=500, max_levels=3)
 
         # Use a symbol-aware proximity threshold (≈20 pips for FX, ≈2.0 for XAU, ≈20 pips JPY=0.20)
@@ -112,10 +122,10 @@ def detect_reversal_signal(symbol, direction, fetch_candles_fn=fetch_candles):
             continue
 
         # Momentum fade + candle bias
-        slope_recent = df_full["close"].iloc[-1] - df_full["close"].iloc[-5]
-        slope_previous = df_full["close"].iloc[-5] - df_full["close"].iloc[-10]
+        slope_recent = closes[-1] - closes[-5]
+        slope_previous = closes[-5] - closes[-10]
         momentum_fading = abs(slope_recent) < abs(slope_previous)
-        reversing_candles = np.sum(directions == (-1 if direction == "BUY" else 1))
+        reversing_candles = int((directions == (-1 if direction == "BUY" else 1)).sum())
 
         if pattern_match or (momentum_fading and reversing_candles >= 2):
             confirmed_timeframes.append(label)
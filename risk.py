@@ -1,19 +1,57 @@
 # risk.py
 from __future__ import annotations
 
+import time
+from functools import lru_cache
+
 try:
     import MetaTrader5 as mt5
 except Exception:
     mt5 = None
 
 
+# symbol_info rarely changes within a session; same TTL as execution._info
+_INFO_TTL_SECONDS = 60.0
+_INFO_CACHE: dict = {}  # symbol -> (monotonic ts, SymbolInfo)
+
+
 def _get_symbol_info(symbol):
+    """mt5.symbol_info(symbol), cached per symbol for _INFO_TTL_SECONDS (misses are not cached)."""
     if not mt5:
         return None
+    now = time.monotonic()
+    ent = _INFO_CACHE.get(symbol)
+    if ent and now - ent[0] < _INFO_TTL_SECONDS:
+        return ent[1]
     try:
-        return mt5.symbol_info(symbol)
+        info = mt5.symbol_info(symbol)
     except Exception:
         return None
+    if info:
+        _INFO_CACHE[symbol] = (now, info)
+    return info
+
+
+# $ per pip per lot when symbol_info is unavailable (looked up by upper-cased symbol)
+_PIP_VALUES = {
+    'XAUUSD': 1.0, 'XAUUSDm': 1.0,
+    'GBPJPY': 10.0, 'GBPJPYm': 10.0,
+    'EURJPY': 10.0, 'EURJPYm': 10.0,
+    'USDJPY': 10.0, 'USDJPYm': 10.0,
+    'GBPUSD': 10.0, 'GBPUSDm': 10.0,
+    'EURAUD': 10.0, 'EURAUDm': 10.0,
+    'EURUSD': 10.0, 'EURUSDm': 10.0
+}
+
+
+@lru_cache(maxsize=64)
+def _pip_size_from_symbol(symbol: str) -> float:
+    s = symbol.upper()
+    if "XAU" in s:
+        return 0.1
+    if "JPY" in s:
+        return 0.01
+    return 0.0001
 
 
 def _pip_size(info, symbol: str) -> float:
@@ -23,12 +61,7 @@ def _pip_size(info, symbol: str) -> float:
     """
     if info and getattr(info, "point", 0) > 0:
         return float(info.point) * 10.0
-    s = symbol.upper()
-    if "XAU" in s:
-        return 0.1
-    if "JPY" in s:
-        return 0.01
-    return 0.0001
+    return _pip_size_from_symbol(symbol)
 
 
 def calculate_risk_lot_size(balance, risk_percent, stop_loss_pips, symbol):
@@ -68,16 +101,7 @@ def calculate_risk_lot_size(balance, risk_percent, stop_loss_pips, symbol):
             return lot
 
         # Fallback when symbol_info is unavailable: simple pip-value map
-        pip_values = {
-            'XAUUSD': 1.0, 'XAUUSDm': 1.0,
-            'GBPJPY': 10.0, 'GBPJPYm': 10.0,
-            'EURJPY': 10.0, 'EURJPYm': 10.0,
-            'USDJPY': 10.0, 'USDJPYm': 10.0,
-            'GBPUSD': 10.0, 'GBPUSDm': 10.0,
-            'EURAUD': 10.0, 'EURAUDm': 10.0,
-            'EURUSD': 10.0, 'EURUSDm': 10.0
-        }
-        pip_value = float(pip_values.get(symbol.upper(), 10.0))
+        pip_value = _PIP_VALUES.get(symbol.upper(), 10.0)
         lot = risk_amount / (sl_pips * pip_value)
         return max(0.01, round(lot, 2))
 
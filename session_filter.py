@@ -1,9 +1,22 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+
+SESSION_START_HOUR = 6
+SESSION_END_HOUR = 21
 
 def is_active_trading_hours():
     now = datetime.now()
     hour = now.hour
-    return not (hour >= 21 or hour < 6)
+    return not (hour >= SESSION_END_HOUR or hour < SESSION_START_HOUR)
+
+def seconds_until_active(now=None):
+    """Seconds until the next session open (0 while the session is active)."""
+    now = now or datetime.now()
+    if SESSION_START_HOUR <= now.hour < SESSION_END_HOUR:
+        return 0.0
+    start = now.replace(hour=SESSION_START_HOUR, minute=0, second=0, microsecond=0)
+    if start <= now:
+        start += timedelta(days=1)
+    return (start - now).total_seconds()
 
 def is_active_session(symbol):
     # Extendable: Define specific sessions per symbol or use general logic
@@ -32,10 +32,17 @@ st.set_page_config(
 # ── Bot imports (single-pass run) ────────────────────────────────────────────
 from day_trading_bot.core_trading_bot import run_bot
 from day_trading_bot.config import CHECK_INTERVAL, USE_SESSION_FILTER
-from day_trading_bot.session_filter import is_active_trading_hours
+from day_trading_bot.session_filter import is_active_trading_hours, seconds_until_active
 from day_trading_bot.performance_panel import load_trade_log, performance_summary
 from day_trading_bot.utils.logger import print_debug
 
+# Optional watchdog: STOP_FLAG creation sets the stop event instead of a stat per cycle
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except Exception:
+    Observer = None
+
 # ── Session state init ───────────────────────────────────────────────────────
 if "stop_event" not in st.session_state:
     st.session_state["stop_event"] = threading.Event()
@@ -66,11 +73,42 @@ with st.expander("Performance Summary"):
         st.error(f"Failed to load trade log: {e}")
 
 # ── Loop (stoppable) ─────────────────────────────────────────────────────────
-def loop_bot(stop_event: threading.Event):
+OFF_SESSION_MAX_WAIT = 15 * 60  # seconds
+
+def _watch_stop_flag(stop_event: threading.Event):
+    """Observer that sets `stop_event` when STOP_FLAG appears; None when watchdog is unavailable."""
+    if Observer is None:
+        return None
+    flag_name = os.path.basename(STOP_FLAG)
+
+    class _StopFlagHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type not in ("created", "moved", "modified"):
+                return
+            paths = (getattr(event, "src_path", ""), getattr(event, "dest_path", ""))
+            if any(os.path.basename(str(p)) == flag_name for p in paths if p) and os.path.exists(STOP_FLAG):
+                print_debug("[LOOP] Stop flag detected from launcher.")
+                stop_event.set()
+
+    try:
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(_StopFlagHandler(), BASE_DIR, recursive=False)
+        observer.start()
+    except Exception as e:
+        print_debug(f"[WARN] STOP_FLAG watcher unavailable, polling instead: {e}")
+        return None
+    return observer
+
+def loop_bot(stop_event: threading.Event, observer=None):
     print_debug("[MAIN] Bot loop starting")
+    # cold-start check; afterwards the observer (if any) reports the flag
+    if os.path.exists(STOP_FLAG):
+        print_debug("[LOOP] Stop flag detected from launcher. Exiting loop.")
+        stop_event.set()
     while not stop_event.is_set():
-        # Respect launcher stop flag too
-        if os.path.exists(STOP_FLAG):
+        # Respect launcher stop flag too (polled only without a watcher)
+        if observer is None and os.path.exists(STOP_FLAG):
             print_debug("[LOOP] Stop flag detected from launcher. Exiting loop.")
             break
 
@@ -81,8 +119,10 @@ def loop_bot(stop_event: threading.Event):
             if st.session_state.get("session_filter_enabled", USE_SESSION_FILTER):
                 if not is_active_trading_hours():
                     print_debug("[SKIP] Outside session hours")
-                    # wait but remain responsive to stop
-                    if stop_event.wait(CHECK_INTERVAL):
+                    # sleep toward the session open instead of waking every CHECK_INTERVAL;
+                    # capped so turning the session filter off still takes effect soon
+                    idle = min(max(seconds_until_active(), CHECK_INTERVAL), OFF_SESSION_MAX_WAIT)
+                    if stop_event.wait(idle):
                         break
                     continue
 
@@ -94,6 +134,8 @@ def loop_bot(stop_event: threading.Event):
         if stop_event.wait(CHECK_INTERVAL):
             break
 
+    if observer is not None:
+        observer.stop()
     print_debug("[MAIN] Bot loop stopped")
 
 # ── Start / Stop buttons ─────────────────────────────────────────────────────
@@ -111,7 +153,8 @@ def start_clicked():
         pass
 
     st.session_state["stop_event"].clear()
-    t = threading.Thread(target=loop_bot, args=(st.session_state["stop_event"],), daemon=True)
+    observer = _watch_stop_flag(st.session_state["stop_event"])
+    t = threading.Thread(target=loop_bot, args=(st.session_state["stop_event"], observer), daemon=True)
     t.start()
     st.session_state["bot_thread"] = t
     print_debug("[MAIN] Bot thread started")
@@ -1,8 +1,14 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from .indicators import calculate_indicators
+from numpy.lib.stride_tricks import sliding_window_view
+from .indicators import latest_atr
 from .pattern_detector import detect_pattern
 from .reversal_signal import detect_reversal_signal
-from .utils.logger import print_debug
+from .utils.logger import print_debug, ENABLE_DEBUG_LOGGING
 
 # ─── Zone-detection switches and parameters ───
 ENABLE_ATR_FILTER = False  # if False, skip ATR-based consolidation filter
@@ -17,7 +23,17 @@ M15_PAD_FACTOR = 0.5  # fraction of M15 ATR to use as pip-gap padding
 JPY_ABS_PAD = 0.01  # absolute pad for JPY pairs if no M15 data
 PATTERN_LOOKBACK = 3  # number of M15 bars to confirm reversal pattern
 
+# find_zones results per input frame. main reuses H1+ frames (and their indicator
+# frames) while the bar is open, so identity is a valid "same data" key; the
+# frame itself is kept in the entry so a recycled id() can never match.
+ZONE_CACHE_SIZE = 256
+_ZONE_CACHE: OrderedDict = OrderedDict()  # (id(df), params...) -> (df, demand, supply)
+_ZONE_CACHE_LOCK = threading.Lock()
+
+_UNSET = object()  # "not computed yet" marker for per-call lazy results
+
 
+@lru_cache(maxsize=256)
 def get_zone_tolerance(symbol: str) -> float:
     s = symbol.upper()
     if "XAU" in s:
@@ -28,17 +44,90 @@ def get_zone_tolerance(symbol: str) -> float:
 
 
 def _merge_zones(zones, max_zones):
-    merged = []
-    for low, high in zones:
-        if low == high:
-            continue
-        for i, (ex_low, ex_high) in enumerate(merged):
-            if not (high < ex_low or low > ex_high):
-                merged[i] = (min(low, ex_low), max(high, ex_high))
-                break
-        else:
-            merged.append((low, high))
-    return merged[-max_zones:]
+    """
+    Merge overlapping (low, high) zones (touching counts as overlap) and return the
+    last `max_zones` merged zones, ordered by when each group's first zone appeared.
+    Sort-and-sweep over lows: a new group starts wherever a low clears the running
+    max of every high before it.
+    """
+    z = np.asarray(zones, dtype=float).reshape(-1, 2)
+    z = z[z[:, 0] != z[:, 1]]
+    if not len(z):
+        return []
+    order = np.argsort(z[:, 0], kind="stable")
+    lows, highs = z[order, 0], z[order, 1]
+    reach = np.maximum.accumulate(highs)
+    starts = np.flatnonzero(np.r_[True, lows[1:] > reach[:-1]])
+    g_low = lows[starts]
+    g_high = np.maximum.reduceat(highs, starts)
+    g_first = np.minimum.reduceat(order, starts)  # input position of each group's first zone
+    keep = np.argsort(g_first, kind="stable")[-max_zones:]
+    return list(zip(g_low[keep].tolist(), g_high[keep].tolist()))
+
+
+def _zones_kernel(high, low, close, window, spread_cap, move_min):
+    """
+    Candidate zones from float64 high/low/close arrays (NumPy reference version).
+    Windows start at 0..n-window-1; a window is kept when low != high,
+    spread < spread_cap and |last close - first close| > move_min.
+    Returns (demand (k,2), supply (j,2), tightest spread over every full window).
+    """
+    n = high.shape[0]
+    win_high = sliding_window_view(high, window).max(axis=1)
+    win_low = sliding_window_view(low, window).min(axis=1)
+    spread = win_high - win_low
+    tightest = spread.min()
+
+    m = n - window
+    win_high, win_low, spread = win_high[:m], win_low[:m], spread[:m]
+    fc = close[:m]
+    lc = close[window - 1:window - 1 + m]
+    keep = (win_low != win_high) & (spread < spread_cap) & (np.abs(lc - fc) > move_min)
+    up = lc > fc
+    demand = np.column_stack((win_low[keep & up], win_high[keep & up]))
+    supply = np.column_stack((win_low[keep & ~up], win_high[keep & ~up]))
+    return demand, supply, tightest
+
+
+# --- Numba optional: the same scan as one compiled loop, no temporaries ---
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _zones_kernel(high, low, close, window, spread_cap, move_min):
+        n = high.shape[0]
+        demand = np.empty((max(n - window, 0), 2))
+        supply = np.empty((max(n - window, 0), 2))
+        nd = 0
+        ns = 0
+        tightest = np.inf
+        for start in range(n - window + 1):
+            hi = high[start]
+            lo = low[start]
+            for j in range(start + 1, start + window):
+                if high[j] > hi:
+                    hi = high[j]
+                if low[j] < lo:
+                    lo = low[j]
+            spread = hi - lo
+            if spread < tightest:
+                tightest = spread
+            if start == n - window:
+                break  # last full window only counts toward `tightest`
+            fc = close[start]
+            lc = close[start + window - 1]
+            if lo != hi and spread < spread_cap and abs(lc - fc) > move_min:
+                if lc > fc:
+                    demand[nd, 0] = lo
+                    demand[nd, 1] = hi
+                    nd += 1
+                else:
+                    supply[ns, 0] = lo
+                    supply[ns, 1] = hi
+                    ns += 1
+        return demand[:nd], supply[:ns], tightest
+except Exception:
+    pass
 
 
 def find_zones(df: pd.DataFrame,
@@ -46,39 +135,50 @@ def find_zones(df: pd.DataFrame,
                range_factor: float = DEFAULT_RANGE_FACTOR,
                breakout_mult: float = DEFAULT_BREAKOUT,
                max_zones: int = DEFAULT_MAX_ZONES):
-    df = df.copy()
-    df.columns = df.columns.str.lower()
-
-    if "atr_14" not in df.columns:
-        df = calculate_indicators(df)
-        df.columns = df.columns.str.lower()
+    key = (id(df), window, range_factor, breakout_mult, max_zones)
+    with _ZONE_CACHE_LOCK:
+        hit = _ZONE_CACHE.get(key)
+        if hit is not None and hit[0] is df:
+            _ZONE_CACHE.move_to_end(key)
+            return list(hit[1]), list(hit[2])
+
+    demand, supply = _find_zones(df, window, range_factor, breakout_mult, max_zones)
+    with _ZONE_CACHE_LOCK:
+        _ZONE_CACHE[key] = (df, demand, supply)
+        _ZONE_CACHE.move_to_end(key)
+        while len(_ZONE_CACHE) > ZONE_CACHE_SIZE:
+            _ZONE_CACHE.popitem(last=False)
+    return list(demand), list(supply)
+
+
+def _find_zones(df, window, range_factor, breakout_mult, max_zones):
+    # read-only: resolve column names case-insensitively instead of copying the frame
+    cols = {c.lower(): c for c in df.columns}
+    n = len(df)
+    if window < 1 or n < window:
+        return [], []
+
+    high = df[cols["high"]].to_numpy(dtype=np.float64)
+    low = df[cols["low"]].to_numpy(dtype=np.float64)
+    close = df[cols["close"]].to_numpy(dtype=np.float64)
+    # only the last ATR is used: frames without indicators get it from the tail bars
+    # instead of a full calculate_indicators pass (SMA/RSI/ATR over every bar)
+    if "atr_14" in cols:
+        atr = df[cols["atr_14"]].iat[-1]
+    else:
+        atr = latest_atr(high, low, close, 14)
 
-    atr = df["atr_14"].iat[-1]
-    demand, supply = [], []
+    # disabled filters become bounds every finite window passes
+    spread_cap = range_factor * atr if ENABLE_ATR_FILTER else np.inf
+    move_min = breakout_mult * atr if ENABLE_BREAKOUT_FILTER else -np.inf
+    demand, supply, tightest = _zones_kernel(
+        high, low, close, int(window), float(spread_cap), float(move_min))
 
-    # debug: show tightest spread vs threshold
-    roll_spread = df["high"].rolling(window).max() - df["low"].rolling(window).min()
-    if not roll_spread.dropna().empty:
+    # debug: show tightest spread vs threshold (`tightest` falls out of the kernel; only
+    # the formatting is skipped when debug logging is off)
+    if ENABLE_DEBUG_LOGGING:
         print_debug(
-            f"[DEBUG] ATR={atr:.5f}, spread_thresh={range_factor * atr:.5f}, tightest_spread={roll_spread.dropna().min():.5f}")
-
-    for start in range(len(df) - window):
-        w = df.iloc[start:start + window]
-        spread = w["high"].max() - w["low"].min()
-        ok_spread = (not ENABLE_ATR_FILTER) or (spread < range_factor * atr)
-        fc = w["close"].iat[0]
-        lc = w["close"].iat[-1]
-        move = abs(lc - fc)
-        ok_break = (not ENABLE_BREAKOUT_FILTER) or (move > breakout_mult * atr)
-
-        if ok_spread and ok_break:
-            low, high = w["low"].min(), w["high"].max()
-            if low == high:
-                continue
-            if lc > fc:
-                demand.append((low, high))
-            else:
-                supply.append((low, high))
+            f"[DEBUG] ATR={atr:.5f}, spread_thresh={range_factor * atr:.5f}, tightest_spread={tightest:.5f}")
 
     return _merge_zones(demand, max_zones), _merge_zones(supply, max_zones)
 
@@ -122,60 +222,56 @@ def find_zones_fallback(df_dict: dict,
         "D1": find_d1_zones
     }
 
-    # 2) scan each TF, print zones, and check for in-zone + reversal
+    # only the side matching `direction` is logged and tested
+    is_buy = direction == "BUY"
+    side_name = "Demand" if is_buy else "Supply"
+
+    # neither confirmation depends on the TF or zone, so each runs at most once per call
+    pat = reversal = _UNSET
+
+    # 2) scan each TF, print zones, and check for in-zone + reversal; the nearest
+    # zone for the "no match" report is tracked in the same pass
+    nearest, nearest_tf, best_dist = None, None, float('inf')
     for tf, fn in tf_finders.items():
         df = df_dict.get(tf)
         if df is None or df.empty:
             continue
 
         dz, sz = fn(df)
-        print_debug(f"[ZONES] {symbol} | {tf} Demand Zones:")
-        if dz:
-            for low, high in dz:
-                print_debug(f"  -> Demand Zone: {low:.5f} -> {high:.5f}")
-        else:
-            print_debug("  (none)")
-
-        print_debug(f"[ZONES] {symbol} | {tf} Supply Zones:")
-        if sz:
-            for low, high in sz:
-                print_debug(f"  -> Supply Zone: {low:.5f} -> {high:.5f}")
-        else:
-            print_debug("  (none)")
-
-        print_debug(f"Current Price: {curr_price:.5f}")
-        zones = dz if direction == "BUY" else sz
+        zones = dz if is_buy else sz
+        if ENABLE_DEBUG_LOGGING:
+            print_debug(f"[ZONES] {symbol} | {tf} {side_name} Zones:")
+            if zones:
+                for low, high in zones:
+                    print_debug(f"  -> {side_name} Zone: {low:.5f} -> {high:.5f}")
+            else:
+                print_debug("  (none)")
+            print_debug(f"Current Price: {curr_price:.5f}")
 
         for low, high in zones:
+            d = abs((low + high) / 2 - curr_price)
+            if d < best_dist:
+                best_dist, nearest, nearest_tf = d, (low, high), tf
             if low - zone_tol <= curr_price <= high + zone_tol:
                 # check chart patterns first
-                if m15_df is not None and len(m15_df) >= PATTERN_LOOKBACK:
-                    look_df = m15_df.tail(PATTERN_LOOKBACK)
-                    pat = detect_pattern(look_df, expected_direction=direction)
-                    if pat and pat.get("direction") == direction:
-                        print_debug(
-                            f"[MATCH] Chart pattern '{pat['pattern']}' confirmed in zone: {low:.5f}->{high:.5f} on {tf}")
-                        return dz, sz, tf
+                if pat is _UNSET:
+                    pat = None
+                    if m15_df is not None and len(m15_df) >= PATTERN_LOOKBACK:
+                        pat = detect_pattern(m15_df.tail(PATTERN_LOOKBACK), expected_direction=direction)
+                if pat and pat.get("direction") == direction:
+                    print_debug(
+                        f"[MATCH] Chart pattern '{pat['pattern']}' confirmed in zone: {low:.5f}->{high:.5f} on {tf}")
+                    return dz, sz, tf
                 # fallback to multi-TF candle reversal check
-                if detect_reversal_signal(symbol, direction):
+                if reversal is _UNSET:
+                    reversal = detect_reversal_signal(symbol, direction)
+                if reversal:
                     print_debug(f"[MATCH] Candle reversal confirmed in zone: {low:.5f}->{high:.5f} on {tf}")
                     return dz, sz, tf
                 print_debug(f"[REJECT] Zone touched but no pattern reversal confirmed: {low:.5f}->{high:.5f} on {tf}")
                 # no break, continue scanning next zone
 
     # 3) no confirmed match: nearest-zone fallback info
-    nearest, nearest_tf, best_dist = None, None, float('inf')
-    for tf, fn in tf_finders.items():
-        df = df_dict.get(tf)
-        if df is None or df.empty:
-            continue
-        dz, sz = fn(df)
-        for low, high in (dz if direction == "BUY" else sz):
-            mid = (low + high) / 2
-            d = abs(mid - curr_price)
-            if d < best_dist:
-                best_dist, nearest, nearest_tf = d, (low, high), tf
-
     if nearest:
         print_debug(f"[INFO] Nearest {direction} Zone: {nearest[0]:.5f} -> {nearest[1]:.5f} on {nearest_tf}")
     else:
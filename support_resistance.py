@@ -1,6 +1,57 @@
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Tuple, Optional
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Swing detection kernel (NumPy; compiled loop when Numba is installed)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _swing_masks(highs: np.ndarray, lows: np.ndarray, window: int, max_index: int):
+    """
+    For bars i in [window, max_index): (is swing high, is swing low) masks, where a
+    swing beats every bar within `window` on both sides strictly.
+    Strided views: row k covers bars k..k+window-1, so left = row i-window, right = row i+1.
+    """
+    idx = np.arange(window, max_index)
+    hv = sliding_window_view(highs, window)
+    lv = sliding_window_view(lows, window)
+    h = highs[idx]
+    l = lows[idx]
+    is_res = (h > hv[idx - window].max(axis=1)) & (h > hv[idx + 1].max(axis=1))
+    is_sup = (l < lv[idx - window].min(axis=1)) & (l < lv[idx + 1].min(axis=1))
+    return is_res, is_sup
+
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _swing_masks(highs, lows, window, max_index):
+        m = max_index - window
+        is_res = np.zeros(m, dtype=np.bool_)
+        is_sup = np.zeros(m, dtype=np.bool_)
+        for k in range(m):
+            i = k + window
+            h = highs[i]
+            l = lows[i]
+            res = True
+            sup = True
+            for j in range(i - window, i + window + 1):
+                if j == i:
+                    continue
+                # "not >" so NaN neighbours disqualify, as in the NumPy version
+                if res and not (h > highs[j]):
+                    res = False
+                if sup and not (l < lows[j]):
+                    sup = False
+                if not (res or sup):
+                    break
+            is_res[k] = res
+            is_sup[k] = sup
+        return is_res, is_sup
+except Exception:
+    pass
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Existing APIs (unchanged)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -15,28 +66,21 @@ def find_nearest_levels(
     Detects the top N nearest support and resistance levels over a deep lookback window.
     Returns the closest `max_levels` levels above and below current price.
     """
-    supports: List[float] = []
-    resistances: List[float] = []
-
-    highs = df['high']
-    lows = df['low']
+    highs = np.ascontiguousarray(df['high'].to_numpy(dtype=np.float64))
+    lows = np.ascontiguousarray(df['low'].to_numpy(dtype=np.float64))
     recent_close = float(df['close'].iloc[-1])
 
     max_index = min(max(len(df) - window, 0), lookback)
+    if max_index <= window:
+        return [], []
 
-    for i in range(window, max_index):
-        high = highs[i]
-        low = lows[i]
-
-        # local swing high / swing low
-        if all(high > highs[i - window:i]) and all(high > highs[i + 1:i + 1 + window]):
-            resistances.append(float(high))
-        if all(low < lows[i - window:i]) and all(low < lows[i + 1:i + 1 + window]):
-            supports.append(float(low))
+    is_res, is_sup = _swing_masks(highs, lows, int(window), int(max_index))
+    resistances = highs[window:max_index][is_res]
+    supports = lows[window:max_index][is_sup]
 
     # Pick top nearest N above and below price
-    support_levels = sorted([s for s in supports if s < recent_close], reverse=True)[:max_levels]
-    resistance_levels = sorted([r for r in resistances if r > recent_close])[:max_levels]
+    support_levels = np.sort(supports[supports < recent_close])[::-1][:max_levels].tolist()
+    resistance_levels = np.sort(resistances[resistances > recent_close])[:max_levels].tolist()
     return support_levels, resistance_levels
 
 
@@ -44,9 +88,9 @@ def find_recent_support_resistance(df: pd.DataFrame, window: int = 20) -> Tuple[
     """
     Fast recent S/R scan using min/max from recent bars.
     """
-    recent_data = df.tail(window)
-    support = float(recent_data['low'].min())
-    resistance = float(recent_data['high'].max())
+    # NumPy views of the two columns; no intermediate DataFrame slice
+    support = float(df['low'].to_numpy()[-window:].min())
+    resistance = float(df['high'].to_numpy()[-window:].max())
     return support, resistance
 
 
@@ -69,8 +113,15 @@ def is_near_support_or_resistance(
     Checks if the price is near ANY of the given support or resistance levels
     by an absolute threshold (in price units).
     """
-    all_levels = support_levels + resistance_levels
-    return any(abs(price - lvl) <= threshold for lvl in all_levels)
+    d = _level_distances(price, support_levels, resistance_levels)
+    return bool(d.size) and bool((d <= threshold).any())
+
+
+def _level_distances(price: float, support_levels, resistance_levels) -> np.ndarray:
+    """|price - level| for every support and resistance level (lists or arrays)."""
+    levels = np.concatenate((np.asarray(support_levels, dtype=np.float64).ravel(),
+                             np.asarray(resistance_levels, dtype=np.float64).ravel()))
+    return np.abs(levels - float(price))
 
 # ─────────────────────────────────────────────────────────────────────────────
 # New ATR-aware helpers (optional; used by the regime router)
@@ -85,10 +136,10 @@ def nearest_sr_distance(
     Returns the absolute distance (in price) to the nearest S/R level,
     or None if there are no levels.
     """
-    levels = support_levels + resistance_levels
-    if not levels:
+    d = _level_distances(price, support_levels, resistance_levels)
+    if not d.size:
         return None
-    return min(abs(price - lvl) for lvl in levels)
+    return float(d.min())
 
 
 def is_near_sr_atr(
@@ -106,7 +157,7 @@ def is_near_sr_atr(
     if atr is None or atr <= 0:
         return is_near_support_or_resistance(price, support_levels, resistance_levels, threshold=fallback_abs)
     thr = k * float(atr)
-    return any(abs(price - lvl) <= thr for lvl in (support_levels + resistance_levels))
+    return bool((_level_distances(price, support_levels, resistance_levels) <= thr).any())
 
 
 def is_breakout_atr(
@@ -128,20 +179,12 @@ def is_breakout_atr(
     if direction not in ("BUY", "SELL"):
         return False
 
-    if atr is None or atr <= 0:
-        if direction == "BUY":
-            return bool(resistance_levels) and price > max(resistance_levels) + fallback_eps
-        else:
-            return bool(support_levels) and price < min(support_levels) - fallback_eps
-
+    margin = fallback_eps if atr is None or atr <= 0 else k * float(atr)
     if direction == "BUY":
-        if not resistance_levels:
-            return False
-        return price > max(resistance_levels) + k * float(atr)
-    else:
-        if not support_levels:
-            return False
-        return price < min(support_levels) - k * float(atr)
+        levels = np.asarray(resistance_levels, dtype=np.float64)
+        return bool(levels.size) and bool(price > levels.max() + margin)
+    levels = np.asarray(support_levels, dtype=np.float64)
+    return bool(levels.size) and bool(price < levels.min() - margin)
 
 
 def sr_summary(
@@ -155,9 +198,9 @@ def sr_summary(
     """
     near = nearest_sr_distance(price, support_levels, resistance_levels)
     parts = []
-    if support_levels:
+    if len(support_levels):
         parts.append(f"S={', '.join(f'{s:.5f}' for s in support_levels)}")
-    if resistance_levels:
+    if len(resistance_levels):
         parts.append(f"R={', '.join(f'{r:.5f}' for r in resistance_levels)}")
     if near is not None:
         parts.append(f"nearest={near:.5f}")
@@ -13,14 +13,22 @@ from __future__ import annotations
 import os
 import json
 import socket
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:  # optional: faster JSON lines for the offline queue
+    import orjson as _orjson
+except Exception:
+    _orjson = None
+
 # --- Load config safely (no crash if names are missing) ---
 try:
     from day_trading_bot import config as _cfg
@@ -49,22 +57,38 @@ TELEGRAM_CHAT_ID = _cfg_get("TELEGRAM_CHAT_ID", 0)
 TELEGRAM_PROXY = _cfg_get("TELEGRAM_PROXY", None) or None
 TELEGRAM_TIMEOUT = int(_cfg_get("TELEGRAM_TIMEOUT", 10) or 10)
 
+# settings are read once at import, so the endpoint is fixed for the process
+_TELEGRAM_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+
 QUEUE_FILE = os.path.join("logs", "telegram_queue.jsonl")
+FLUSH_WORKERS = 4  # parallel resends; far below Telegram's ~30 msg/s limit
 
 
 # --- Helpers ---
 def _ensure_logs_dir():
     os.makedirs(os.path.dirname(QUEUE_FILE), exist_ok=True)
 
+# getaddrinfo blocks; reuse a lookup's outcome (success or failure) for a short while
+DNS_CHECK_TTL = 30.0  # seconds
+_DNS_CACHE: Dict[str, tuple] = {}  # host -> (monotonic ts, ok)
+
 def _dns_ok(host: str = "api.telegram.org") -> bool:
+    now = time.monotonic()
+    hit = _DNS_CACHE.get(host)
+    if hit and now - hit[0] < DNS_CHECK_TTL:
+        return hit[1]
     try:
         socket.getaddrinfo(host, 443)
-        return True
+        ok = True
     except OSError as e:
         print(f"[TELEGRAM] DNS resolve failed for {host}: {e}")
-        return False
+        ok = False
+    _DNS_CACHE[host] = (now, ok)
+    return ok
 
+@lru_cache(maxsize=1)
 def _validate_config() -> Optional[str]:
+    """Config problem as a message, or None. Settings are import-time constants, so checked once."""
     if not TELEGRAM_ENABLED:
         return "Telegram disabled in config."
     if not TELEGRAM_BOT_TOKEN or "your_token" in TELEGRAM_BOT_TOKEN.lower():
@@ -73,7 +97,9 @@ def _validate_config() -> Optional[str]:
         return "Set TELEGRAM_CHAT_ID in config.py or env."
     return None
 
+@lru_cache(maxsize=1)
 def _session() -> requests.Session:
+    """One pooled Session for the process, so messages reuse the TLS connection."""
     s = requests.Session()
     retry = Retry(
         total=3,
@@ -87,12 +113,47 @@ def _session() -> requests.Session:
         s.proxies = {"http": TELEGRAM_PROXY, "https": TELEGRAM_PROXY}
     return s
 
+def _dumps_line(obj) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+def _loads_line(line: bytes):
+    return _orjson.loads(line) if _orjson is not None else json.loads(line)
+
 def _enqueue(payload: Dict[str, Any]):
     _ensure_logs_dir()
-    with open(QUEUE_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps({"ts": time.time(), "payload": payload}) + "\n")
+    with open(QUEUE_FILE, "ab") as f:
+        f.write(_dumps_line({"ts": time.time(), "payload": payload}))
     print("[TELEGRAM] Queued message locally (offline).")
 
+def _rewrite_queue(kept, read_upto: int):
+    """Atomically replace QUEUE_FILE with `kept` plus anything appended after `read_upto`."""
+    try:
+        with open(QUEUE_FILE, "rb") as f:
+            f.seek(read_upto)
+            appended = f.read()
+    except OSError:
+        appended = b""
+    if not kept and not appended:
+        try:
+            os.remove(QUEUE_FILE)
+        except OSError:
+            pass
+        return
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(QUEUE_FILE) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.writelines(kept)
+            f.write(appended)
+        os.replace(tmp, QUEUE_FILE)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
 def flush_queue():
     """Try to resend any queued messages. Safe to call at startup/shutdown."""
     if not os.path.exists(QUEUE_FILE):
@@ -100,30 +161,29 @@ def flush_queue():
     if _validate_config() or not _dns_ok():
         return
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    url = _TELEGRAM_URL
     s = _session()
 
-    with open(QUEUE_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    with open(QUEUE_FILE, "rb") as f:
+        data = f.read()
+    lines = data.splitlines(keepends=True)
 
-    kept = []
-    for line in lines:
+    def _resend(line: bytes) -> bool:
         try:
-            item = json.loads(line)
+            item = _loads_line(line)
             resp = s.post(url, data=item["payload"], timeout=TELEGRAM_TIMEOUT)
-            if resp.status_code != 200:
-                kept.append(line)
+            return resp.status_code == 200
         except Exception:
-            kept.append(line)
+            return False
 
-    if kept:
-        with open(QUEUE_FILE, "w", encoding="utf-8") as f:
-            f.writelines(kept)
-    else:
-        try:
-            os.remove(QUEUE_FILE)
-        except OSError:
-            pass
+    # posts are latency-bound; delivery order across workers is not guaranteed
+    with ThreadPoolExecutor(max_workers=FLUSH_WORKERS, thread_name_prefix="telegram-flush") as ex:
+        sent = list(ex.map(_resend, lines))
+
+    # failures keep their original order; lines queued meanwhile are preserved
+    kept = [line if line.endswith(b"\n") else line + b"\n"
+            for line, ok in zip(lines, sent) if not ok]
+    _rewrite_queue(kept, len(data))
 
 
 # --- Public API ---
@@ -143,10 +203,9 @@ def send_telegram_message(message: str) -> bool:
         _enqueue(payload)
         return False
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     try:
         s = _session()
-        resp = s.post(url, data=payload, timeout=TELEGRAM_TIMEOUT)
+        resp = s.post(_TELEGRAM_URL, data=payload, timeout=TELEGRAM_TIMEOUT)
         if resp.status_code == 200:
             print("[TELEGRAM] Sent.")
             return True
@@ -202,16 +261,26 @@ def send_trade_summary_via_telegram(df) -> None:
         result = profit_col
 
     try:
-        wins = sum(1 for r in result if r > 0)
+        # one pass for wins, net and best/worst (first occurrence wins ties)
+        wins = 0
+        net_profit = 0.0
+        best_idx = worst_idx = None
+        best_val = worst_val = None
+        for i, r in enumerate(result):
+            if r > 0:
+                wins += 1
+            net_profit += r
+            if best_idx is None or r > best_val:
+                best_idx, best_val = i, r
+            if worst_idx is None or r < worst_val:
+                worst_idx, worst_val = i, r
+        if best_idx is None:
+            raise ValueError("no trade results")
         total = rows
         losses = total - wins
-        net_profit = float(sum(result))
+        net_profit = float(net_profit)
         avg_profit = float(net_profit / total) if total else 0.0
 
-        # find best/worst by result
-        best_idx = max(range(len(result)), key=lambda i: result[i])
-        worst_idx = min(range(len(result)), key=lambda i: result[i])
-
         def at(idx, key, default=""):
             try:
                 return df[key][idx]
@@ -223,10 +292,10 @@ def send_trade_summary_via_telegram(df) -> None:
 
         best = {"symbol": at(best_idx, "symbol"),
                 "direction": at(best_idx, "direction"),
-                "result": float(result[best_idx])}
+                "result": float(best_val)}
         worst = {"symbol": at(worst_idx, "symbol"),
                  "direction": at(worst_idx, "direction"),
-                 "result": float(result[worst_idx])}
+                 "result": float(worst_val)}
 
         summary = (
             f"*Session Trade Summary ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})*\n\n"
@@ -1,4 +1,7 @@
+import queue
+import threading
 import tkinter as tk
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from threading import Event
 
 # Global variables
@@ -6,58 +9,123 @@ auto_mode_enabled = False
 user_response_event = Event()
 user_decision = None
 
+# One long-lived Tk interpreter on its own thread serves every trade prompt.
+# Callers hand it (builder, Future) pairs; each prompt is a Toplevel, so several
+# signals can wait for the user at once and Tk() is not re-created per prompt.
+_PROMPT_QUEUE: "queue.Queue" = queue.Queue()
+_PROMPT_POLL_MS = 50
+_tk_thread = None
+_tk_lock = threading.Lock()
+
+
+def _fail_pending(exc: BaseException):
+    while True:
+        try:
+            _, fut = _PROMPT_QUEUE.get_nowait()
+        except queue.Empty:
+            return
+        if not fut.done():
+            fut.set_exception(exc)
+
+
+def _tk_worker():
+    global _tk_thread
+    try:
+        root = tk.Tk()
+    except Exception as e:
+        # no display / Tcl error: fail the waiting prompts now rather than at their timeout;
+        # the next prompt starts a fresh worker, which tries again
+        with _tk_lock:
+            _tk_thread = None
+            _fail_pending(e)
+        return
+    root.withdraw()
+
+    def pump():
+        while True:
+            try:
+                build, fut = _PROMPT_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                build(root, fut)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+        root.after(_PROMPT_POLL_MS, pump)
+
+    pump()
+    root.mainloop()
+
+
+def _submit_prompt(build) -> Future:
+    global _tk_thread
+    fut: Future = Future()
+    with _tk_lock:
+        if _tk_thread is None or not _tk_thread.is_alive():
+            _tk_thread = threading.Thread(target=_tk_worker, name="tk-prompts", daemon=True)
+            _tk_thread.start()
+        # under the lock, so a worker failing to start can't miss it
+        _PROMPT_QUEUE.put((build, fut))
+    return fut
+
+
 def prompt_trade_decision(symbol, direction, confidence, reasons, timeout=180):
     """
     Prompts the user to approve or reject a trade using a Tkinter window.
     If no response in `timeout` seconds, the trade is skipped.
     """
 
-    def approve():
-        nonlocal root
-        global user_decision
-        user_decision = True
-        user_response_event.set()
-        root.destroy()
-
-    def reject():
-        nonlocal root
-        global user_decision
-        user_decision = False
-        user_response_event.set()
-        root.destroy()
-
-    def auto_reject():
-        if not user_response_event.is_set():
-            print(f"[TIMEOUT] No response for {symbol} after {timeout}s — skipping.")
-            reject()
+    def build(root, fut):
+        win = tk.Toplevel(root)
 
-    global user_decision
-    user_decision = None
-    user_response_event.clear()
+        def finish(decision):
+            if fut.done():
+                return
+            fut.set_result(decision)
+            win.destroy()
 
-    root = tk.Tk()
-    root.title("Trade Confirmation")
-    root.geometry("400x400")
+        def auto_reject():
+            if not fut.done():
+                print(f"[TIMEOUT] No response for {symbol} after {timeout}s — skipping.")
+                finish(False)
 
-    tk.Label(root, text=f"Pair: {symbol}", font=("Helvetica", 14)).pack(pady=5)
-    tk.Label(root, text=f"Direction: {direction}", font=("Helvetica", 12)).pack()
-    tk.Label(root, text=f"Confidence: {confidence}%", font=("Helvetica", 12)).pack()
-    tk.Label(root, text="Reasons:", font=("Helvetica", 12, "underline")).pack(pady=10)
+        win.title("Trade Confirmation")
+        win.geometry("400x400")
+        win.protocol("WM_DELETE_WINDOW", lambda: finish(None))  # closed without a choice
 
-    reasons_text = "\n".join(reasons)
-    text_widget = tk.Text(root, wrap=tk.WORD, height=10, width=45)
-    text_widget.insert(tk.END, reasons_text)
-    text_widget.config(state=tk.DISABLED)
-    text_widget.pack()
+        tk.Label(win, text=f"Pair: {symbol}", font=("Helvetica", 14)).pack(pady=5)
+        tk.Label(win, text=f"Direction: {direction}", font=("Helvetica", 12)).pack()
+        tk.Label(win, text=f"Confidence: {confidence}%", font=("Helvetica", 12)).pack()
+        tk.Label(win, text="Reasons:", font=("Helvetica", 12, "underline")).pack(pady=10)
 
-    tk.Button(root, text="Approve Trade", command=approve, bg="green", fg="white").pack(pady=10)
-    tk.Button(root, text="Reject Trade", command=reject, bg="red", fg="white").pack()
+        reasons_text = "\n".join(reasons)
+        text_widget = tk.Text(win, wrap=tk.WORD, height=10, width=45)
+        text_widget.insert(tk.END, reasons_text)
+        text_widget.config(state=tk.DISABLED)
+        text_widget.pack()
 
-    # Auto close after timeout
-    root.after(timeout * 1000, auto_reject)
-    root.mainloop()
+        tk.Button(win, text="Approve Trade", command=lambda: finish(True), bg="green", fg="white").pack(pady=10)
+        tk.Button(win, text="Reject Trade", command=lambda: finish(False), bg="red", fg="white").pack()
+
+        # Auto close after timeout
+        win.after(timeout * 1000, auto_reject)
+
+    global user_decision
+    user_decision = None
+    user_response_event.clear()
 
-    return user_decision
+    fut = _submit_prompt(build)
+    try:
+        # the window rejects itself at `timeout`; the slack only covers a dead Tk thread
+        decision = fut.result(timeout=timeout + 5)
+    except FutureTimeout:
+        print(f"[TIMEOUT] Prompt for {symbol} did not complete — skipping.")
+        decision = False
+
+    user_decision = decision
+    user_response_event.set()
+    return decision
 
 
 def toggle_auto_mode():
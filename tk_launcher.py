@@ -2,17 +2,12 @@
 # GUI with login persistence, dark mode, and SAFE shutdown:
 # - If the window is closed OR user logs out, the bot process is stopped automatically.
 
-import os, sys, json, subprocess, signal
+import os, sys, json, subprocess, signal, atexit, threading, queue
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
-# Local imports
-from day_trading_bot import auth
-from day_trading_bot.config import (
-    TRADING_SYMBOLS, TIMEFRAMES, RISK_PERCENT,
-    AUTO_MODE
-)
+# Local imports (auth and config are loaded on first use: config pulls in MetaTrader5)
 from day_trading_bot.utils.logger import print_debug
 
 APP_NAME = "Angela"
@@ -27,69 +22,117 @@ STOP_FLAG = PKG_DIR / "BOT_STOP.flag"
 SETTINGS_DIR = Path(os.getenv("APPDATA") or Path.home()) / "ForexBot"
 SETTINGS_DIR.mkdir(parents=True, exist_ok=True)
 SETTINGS_FILE = SETTINGS_DIR / "settings.json"
+SETTINGS_TMP = SETTINGS_FILE.with_suffix(".tmp")
+# plain-str paths for the load/save hot path (no per-call pathlib dispatch)
+_SETTINGS_PATH = str(SETTINGS_FILE)
+_SETTINGS_TMP_PATH = str(SETTINGS_TMP)
 
-DEFAULT_SETTINGS = {
+_CFG = None
+_CONFIG_NAMES = ("TRADING_SYMBOLS", "TIMEFRAMES", "RISK_PERCENT", "AUTO_MODE")
+
+def _cfg():
+    global _CFG
+    if _CFG is None:
+        from day_trading_bot import config as _CFG
+    return _CFG
+
+def _auth():
+    from day_trading_bot import auth
+    return auth
+
+_BASE_SETTINGS = {
     "dark_mode": False,
     "remember_user": True,
     "last_user": "",
     "keep_signed_in": False,
     "session_token": "",
-    "last_symbols": ",".join(TRADING_SYMBOLS),
     "last_timeframe": "M15",
-    "last_risk": str(RISK_PERCENT),
-    "auto_mode": AUTO_MODE,
 }
+_CONFIG_SETTING_KEYS = frozenset({"last_symbols", "last_risk", "auto_mode"})
+
+def _default_settings() -> dict:
+    cfg = _cfg()
+    return {
+        **_BASE_SETTINGS,
+        "last_symbols": ",".join(cfg.TRADING_SYMBOLS),
+        "last_risk": str(cfg.RISK_PERCENT),
+        "auto_mode": cfg.AUTO_MODE,
+    }
+
+def __getattr__(name):
+    # DEFAULT_SETTINGS and the config names stay importable from here without an eager config import
+    if name == "DEFAULT_SETTINGS":
+        return _default_settings()
+    if name in _CONFIG_NAMES:
+        return getattr(_cfg(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# last settings read from / written to SETTINGS_FILE, and that file's mtime when we did;
+# the cache is reused until the file changes underneath us (e.g. edited by hand)
+_CACHE: dict | None = None
+_CACHE_MTIME: int | None = None
+
+def _settings_mtime() -> int | None:
+    try:
+        return os.stat(_SETTINGS_PATH).st_mtime_ns
+    except OSError:
+        return None
 
 def load_settings():
-    if not SETTINGS_FILE.exists():
-        return DEFAULT_SETTINGS.copy()
-    try:
-        with SETTINGS_FILE.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        merged = DEFAULT_SETTINGS.copy()
-        merged.update(data or {})
-        return merged
-    except Exception:
-        return DEFAULT_SETTINGS.copy()
+    global _CACHE, _CACHE_MTIME
+    mtime = _settings_mtime()
+    if _CACHE is None or mtime != _CACHE_MTIME:
+        try:
+            with open(_SETTINGS_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
+        except Exception:  # missing or unreadable file: defaults
+            data = {}
+        # a file written by save_settings has every key, so config is only needed on first run
+        base = _BASE_SETTINGS if _CONFIG_SETTING_KEYS <= data.keys() else _default_settings()
+        _CACHE, _CACHE_MTIME = {**base, **data}, mtime
+    return dict(_CACHE)  # callers mutate their copy and hand it back to save_settings
 
 def save_settings(s: dict):
-    tmp = SETTINGS_FILE.with_suffix(".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
+    global _CACHE, _CACHE_MTIME
+    if _CACHE is not None and s == _CACHE and _settings_mtime() == _CACHE_MTIME:
+        return
+    with open(_SETTINGS_TMP_PATH, "w", encoding="utf-8") as f:
         json.dump(s, f, indent=2)
-    tmp.replace(SETTINGS_FILE)
+    os.replace(_SETTINGS_TMP_PATH, _SETTINGS_PATH)
+    _CACHE, _CACHE_MTIME = dict(s), _settings_mtime()
 
 # ---- Theming ----
+def _theme_settings(panel: str, fg: str, field: str) -> dict:
+    return {
+        ".":              {"configure": {"background": panel, "foreground": fg, "fieldbackground": panel}},
+        "TLabel":         {"configure": {"background": panel, "foreground": fg}},
+        "TFrame":         {"configure": {"background": panel}},
+        "TCheckbutton":   {"configure": {"background": panel, "foreground": fg}},
+        "TRadiobutton":   {"configure": {"background": panel, "foreground": fg}},
+        "TEntry":         {"configure": {"fieldbackground": field, "foreground": fg}},
+        "TCombobox":      {"configure": {"fieldbackground": field, "foreground": fg}},
+        "Accent.TButton": {"configure": {"padding": 8}},
+        "Danger.TButton": {"configure": {"padding": 8}},
+    }
+
+# theme name -> (window background, ttk settings); each is installed once per Tk root with
+# a single theme_create, so switching is one theme_use instead of a configure per style
+_THEMES = {
+    "angelaDark":  ("#111418", _theme_settings(panel="#1b1f24", fg="#E6E6E6", field="#0f1216")),
+    "angelaLight": ("#F3F5F7", _theme_settings(panel="#FFFFFF", fg="#1E2329", field="#ffffff")),
+}
+
 def apply_theme(root: tk.Tk, dark: bool):
     style = ttk.Style(root)
-    try:
-        style.theme_use("clam")
-    except Exception:
-        pass
-
-    if dark:
-        bg = "#111418"; panel = "#1b1f24"; fg = "#E6E6E6"; fg_muted = "#B8C0CC"
-        root.configure(bg=bg)
-        style.configure(".", background=panel, foreground=fg, fieldbackground=panel)
-        style.configure("TLabel", background=panel, foreground=fg)
-        style.configure("TFrame", background=panel)
-        style.configure("TCheckbutton", background=panel, foreground=fg)
-        style.configure("TRadiobutton", background=panel, foreground=fg)
-        style.configure("TEntry", fieldbackground="#0f1216", foreground=fg)
-        style.configure("TCombobox", fieldbackground="#0f1216", foreground=fg)
-        style.configure("Accent.TButton", padding=8)
-        style.configure("Danger.TButton", padding=8)
-    else:
-        bg = "#F3F5F7"; panel = "#FFFFFF"; fg = "#1E2329"
-        root.configure(bg=bg)
-        style.configure(".", background=panel, foreground=fg, fieldbackground=panel)
-        style.configure("TLabel", background=panel, foreground=fg)
-        style.configure("TFrame", background=panel)
-        style.configure("TCheckbutton", background=panel, foreground=fg)
-        style.configure("TRadiobutton", background=panel, foreground=fg)
-        style.configure("TEntry", fieldbackground="#ffffff", foreground=fg)
-        style.configure("TCombobox", fieldbackground="#ffffff", foreground=fg)
-        style.configure("Accent.TButton", padding=8)
-        style.configure("Danger.TButton", padding=8)
+    name = "angelaDark" if dark else "angelaLight"
+    bg, settings = _THEMES[name]
+    if name not in style.theme_names():
+        try:
+            style.theme_create(name, parent="clam", settings=settings)
+        except tk.TclError:
+            style.theme_create(name, settings=settings)
+    root.configure(bg=bg)
+    style.theme_use(name)
 
 # ---- Process helpers ----
 def _write_stop_flag():
@@ -98,11 +141,11 @@ def _write_stop_flag():
     except Exception:
         pass
 
-def start_bot_process(symbols: str, timeframe: str, risk: float, auto_mode: bool):
+def _spawn_bot(symbols: str, timeframe: str, risk: float, auto_mode: bool) -> subprocess.Popen:
     """
     Launch main bot in a separate process with PROJECT_ROOT as cwd:
         python -m day_trading_bot.main SYMBOLS TF RISK AUTO
-    Returns the subprocess.Popen handle (or None on failure).
+    Raises if neither launch form works. Touches no Tk state, so it may run off the UI thread.
     """
     auto_flag = "1" if auto_mode else "0"
     cmd = [sys.executable, "-m", "day_trading_bot.main", symbols, timeframe, str(risk), auto_flag]
@@ -110,35 +153,59 @@ def start_bot_process(symbols: str, timeframe: str, risk: float, auto_mode: bool
     if os.name == "nt":
         # Create a new process group so we can terminate the whole group on exit
         creationflags = subprocess.CREATE_NEW_PROCESS_GROUP
+    # stdout/stderr are inherited, never PIPEd: nothing here drains them, and a full pipe would
+    # stall the bot. stdin is closed so the child can never block on console input.
+    popen_kw = dict(cwd=str(PROJECT_ROOT), creationflags=creationflags, stdin=subprocess.DEVNULL)
     print_debug(f"[LAUNCH] cwd={PROJECT_ROOT} cmd={' '.join(cmd)}")
     try:
-        return subprocess.Popen(cmd, cwd=str(PROJECT_ROOT), creationflags=creationflags)
+        return subprocess.Popen(cmd, **popen_kw)
     except Exception as e:
         # Fallback: run direct script path (works even if packaging is odd)
         script = PKG_DIR / "main.py"
         fallback = [sys.executable, str(script), symbols, timeframe, str(risk), auto_flag]
         print_debug(f"[LAUNCH-FALLBACK] {e} → {' '.join(fallback)}")
-        try:
-            return subprocess.Popen(fallback, cwd=str(PROJECT_ROOT), creationflags=creationflags)
-        except Exception as e2:
-            messagebox.showerror("Launch error", f"Could not start bot:\n{e2}")
-            return None
+        return subprocess.Popen(fallback, **popen_kw)
+
+def start_bot_process(symbols: str, timeframe: str, risk: float, auto_mode: bool):
+    """
+    Launch the bot (see _spawn_bot).
+    Returns the subprocess.Popen handle (or None on failure).
+    """
+    try:
+        return _spawn_bot(symbols, timeframe, risk, auto_mode)
+    except Exception as e2:
+        messagebox.showerror("Launch error", f"Could not start bot:\n{e2}")
+        return None
+
+_UI_POLL_MS = 100  # how often the Tk thread runs callbacks handed back by worker threads
+
+BOT_STOP_TIMEOUT = 5  # seconds the bot gets to exit after the stop signal before it is killed
 
 def stop_bot_process(proc: subprocess.Popen | None):
     # Signal the bot via STOP_FLAG (main.py watches it every second)
     _write_stop_flag()
-    # Also try to terminate the child we launched (best-effort)
-    if proc and proc.poll() is None:
+    if not proc:
+        return
+    atexit.unregister(stop_bot_process)
+    # Also ask the child we launched to exit (SIGTERM / CTRL_BREAK reach main.handle_exit)
+    if proc.poll() is None:
         try:
-            if os.name == "nt":
-                # On Windows, terminate() is OK (hard kill). Try CTRL_BREAK first if in new process group.
-                try:
-                    os.kill(proc.pid, signal.CTRL_BREAK_EVENT)  # type: ignore[attr-defined]
-                except Exception:
-                    pass
-            proc.terminate()
+            proc.send_signal(signal.CTRL_BREAK_EVENT if os.name == "nt" else signal.SIGTERM)  # type: ignore[attr-defined]
         except Exception:
             pass
+        try:
+            proc.wait(timeout=BOT_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            try:
+                proc.kill()
+                proc.wait(timeout=BOT_STOP_TIMEOUT)
+            except Exception:
+                return  # still alive: keep the handle rather than block the GUI
+        except Exception:
+            pass
+    # reap the child and release its handle / pipes
+    with proc:
+        pass
 
 # ---- GUI ----
 class AngelaApp(tk.Tk):
@@ -164,10 +231,18 @@ class AngelaApp(tk.Tk):
         self.timeframe_var = tk.StringVar(value=self.settings.get("last_timeframe", "M15"))
         self.risk_var = tk.StringVar(value=self.settings.get("last_risk", "1.0"))
         self.auto_mode_var = tk.BooleanVar(value=self.settings.get("auto_mode", False))
-        self.selected_symbols = set(TRADING_SYMBOLS)
+        self.selected_symbols: set | None = None  # filled from config when the main view first renders
 
         # track launched process
         self.bot_proc: subprocess.Popen | None = None
+        self._save_job = None  # pending debounced save_settings (Tk after id)
+        self._launching = False  # a start is running in the bot-launch worker
+        self._cancel_launch = False
+        # (fn, args) queued by worker threads; only _drain_ui_calls on the Tk thread runs them
+        self._ui_calls: "queue.Queue" = queue.Queue()
+        self._closing = False  # window close started; its worker stops every bot we launched
+        self._launch_thread: threading.Thread | None = None
+        self._launched: subprocess.Popen | None = None  # last process the launch worker started
 
         # frames
         self.header = ttk.Frame(self, padding=14); self.header.pack(side="top", fill="x")
@@ -179,10 +254,11 @@ class AngelaApp(tk.Tk):
 
         # ensure we stop the bot if user closes the window
         self.protocol("WM_DELETE_WINDOW", self._on_app_close)
+        self.after(_UI_POLL_MS, self._drain_ui_calls)
 
         # auto-login if session valid
         token = self.settings.get("session_token", "")
-        user = auth.validate_session(token) if token else None
+        user = _auth().validate_session(token) if token else None
         if self.keep_signed_var.get() and user:
             self._render_main(user)
         else:
@@ -223,6 +299,9 @@ class AngelaApp(tk.Tk):
 
     def _render_main(self, username: str):
         self._clear_content()
+        cfg = _cfg()
+        if self.selected_symbols is None:
+            self.selected_symbols = set(cfg.TRADING_SYMBOLS)
         m = ttk.Frame(self.content); m.pack(fill="both", expand=True)
 
         top = ttk.Frame(m); top.pack(fill="x")
@@ -235,8 +314,11 @@ class AngelaApp(tk.Tk):
         sym_row = ttk.Frame(box); sym_row.pack(fill="x", pady=6)
         self.symbol_menu_btn = ttk.Menubutton(sym_row, text="Select Symbols  ▼")
         self.symbol_menu = tk.Menu(self.symbol_menu_btn, tearoff=0)
-        for s in TRADING_SYMBOLS:
-            self.symbol_menu.add_checkbutton(label=s, onvalue=True, offvalue=False,
+        self._sym_index = {s: i for i, s in enumerate(cfg.TRADING_SYMBOLS)}  # menu entry per symbol
+        for s in cfg.TRADING_SYMBOLS:
+            # labels start in sync with selected_symbols, so clicks only relabel what changed
+            self.symbol_menu.add_checkbutton(label=f"{s}{' ✓' if s in self.selected_symbols else ''}",
+                                             onvalue=True, offvalue=False,
                                              command=lambda sym=s: self._toggle_symbol(sym))
         self.symbol_menu_btn["menu"] = self.symbol_menu
         self.symbol_menu_btn.pack(anchor="w")
@@ -244,7 +326,7 @@ class AngelaApp(tk.Tk):
         # Timeframe & risk
         grid = ttk.LabelFrame(m, text="Parameters", padding=10); grid.pack(fill="x", pady=(6, 6))
         ttk.Label(grid, text="Timeframe:").grid(row=0, column=0, sticky="w")
-        cb = ttk.Combobox(grid, values=list(TIMEFRAMES.keys()), textvariable=self.timeframe_var, width=8, state="readonly")
+        cb = ttk.Combobox(grid, values=list(cfg.TIMEFRAMES.keys()), textvariable=self.timeframe_var, width=8, state="readonly")
         cb.grid(row=0, column=1, sticky="w", padx=(6, 0))
 
         ttk.Label(grid, text="Risk %:").grid(row=1, column=0, sticky="w", pady=(6, 0))
@@ -267,9 +349,21 @@ class AngelaApp(tk.Tk):
         ttk.Label(m, text="Tip: Close this window or logout to stop the bot automatically.", foreground="#7e8794").pack(anchor="w", pady=(6, 0))
 
     # ---------- Actions ----------
+    def _save_settings_later(self, delay_ms: int = 500):
+        # rapid toggles collapse into one write
+        if self._save_job is not None:
+            self.after_cancel(self._save_job)
+        self._save_job = self.after(delay_ms, self._flush_settings)
+
+    def _flush_settings(self):
+        if self._save_job is not None:
+            self.after_cancel(self._save_job)
+            self._save_job = None
+        save_settings(self.settings)
+
     def _toggle_dark(self):
         self.settings["dark_mode"] = bool(self.dark_var.get())
-        save_settings(self.settings)
+        self._save_settings_later()
         apply_theme(self, self.settings["dark_mode"])
 
     def _on_create_admin(self):
@@ -279,7 +373,7 @@ class AngelaApp(tk.Tk):
             messagebox.showwarning("Create admin", "Enter a username and password first.")
             return
         try:
-            auth.create_user(u, p)
+            _auth().create_user(u, p)
             messagebox.showinfo("Create admin", "Admin user created.")
         except Exception as e:
             messagebox.showerror("Create admin", str(e))
@@ -290,7 +384,7 @@ class AngelaApp(tk.Tk):
         if not u or not p:
             messagebox.showwarning("Sign in", "Please enter username and password.")
             return
-        if not auth.verify_credentials(u, p):
+        if not _auth().verify_credentials(u, p):
             messagebox.showerror("Sign in", "Invalid username or password.")
             return
 
@@ -299,7 +393,7 @@ class AngelaApp(tk.Tk):
         self.settings["keep_signed_in"] = bool(self.keep_signed_var.get())
 
         if self.keep_signed_var.get():
-            token = auth.issue_session(u)
+            token = _auth().issue_session(u)
             self.settings["session_token"] = token
         else:
             self.settings["session_token"] = ""
@@ -309,36 +403,39 @@ class AngelaApp(tk.Tk):
 
     def _logout(self):
         # stop bot on logout
-        stop_bot_process(self.bot_proc)
+        self._stop_async(self.bot_proc)
         token = self.settings.get("session_token", "")
         if token:
-            auth.revoke_session(token)
+            _auth().revoke_session(token)
         self.settings["session_token"] = ""
         save_settings(self.settings)
         self.password_var.set("")
         self._render_login()
 
+    def _relabel_symbol(self, sym: str):
+        state = sym in self.selected_symbols
+        self.symbol_menu.entryconfigure(self._sym_index[sym], label=f"{sym}{' ✓' if state else ''}")
+
     def _on_toggle_all(self):
+        before = self.selected_symbols
         if self.symbols_all_var.get():
-            self.selected_symbols = set(TRADING_SYMBOLS)
+            self.selected_symbols = set(_cfg().TRADING_SYMBOLS)
         else:
             self.selected_symbols = set()
-        for i, s in enumerate(TRADING_SYMBOLS):
-            state = (s in self.selected_symbols)
-            self.symbol_menu.entryconfigure(i, label=f"{s}{' ✓' if state else ''}")
+        # each entryconfigure is a Tcl round trip: only touch entries whose state flipped
+        for s in before ^ self.selected_symbols:
+            self._relabel_symbol(s)
 
     def _toggle_symbol(self, sym: str):
         if sym in self.selected_symbols:
             self.selected_symbols.remove(sym)
         else:
             self.selected_symbols.add(sym)
-        self.symbols_all_var.set(len(self.selected_symbols) == len(TRADING_SYMBOLS))
-        for i, s in enumerate(TRADING_SYMBOLS):
-            state = (s in self.selected_symbols)
-            self.symbol_menu.entryconfigure(i, label=f"{s}{' ✓' if state else ''}")
+        self.symbols_all_var.set(len(self.selected_symbols) == len(self._sym_index))
+        self._relabel_symbol(sym)
 
     def _start_bot(self):
-        symbols = ",".join(sorted(self.selected_symbols)) if not self.symbols_all_var.get() else ",".join(TRADING_SYMBOLS)
+        symbols = ",".join(sorted(self.selected_symbols)) if not self.symbols_all_var.get() else ",".join(_cfg().TRADING_SYMBOLS)
         tf = self.timeframe_var.get()
         try:
             risk = float(self.risk_var.get())
@@ -352,16 +449,61 @@ class AngelaApp(tk.Tk):
         self.settings["auto_mode"] = bool(self.auto_mode_var.get())
         save_settings(self.settings)
 
-        # If a bot is already running, stop it before starting a new one
-        if self.bot_proc and self.bot_proc.poll() is None:
-            stop_bot_process(self.bot_proc)
+        # Stopping the old bot (up to BOT_STOP_TIMEOUT) and CreateProcess both block, so they run
+        # in a worker; the result comes back to the Tk thread through _ui_calls.
+        if self._launching:
+            return
+        self._launching = True
+        self._cancel_launch = False
+        old = self.bot_proc
+        auto = bool(self.auto_mode_var.get())
+
+        def work():
+            if old and old.poll() is None:
+                stop_bot_process(old)
+            try:
+                proc, err = _spawn_bot(symbols, tf, risk, auto), None
+            except Exception as e:
+                proc, err = None, e
+            self._launched = proc
+            self._ui_calls.put((self._on_bot_started, (proc, err)))
+
+        self._launch_thread = threading.Thread(target=work, name="bot-launch", daemon=True)
+        self._launch_thread.start()
+
+    def _stop_async(self, proc: subprocess.Popen | None):
+        """stop_bot_process(proc) on a worker: it can wait up to 2×BOT_STOP_TIMEOUT."""
+        threading.Thread(target=stop_bot_process, args=(proc,), name="bot-stop", daemon=True).start()
+
+    def _drain_ui_calls(self):
+        """Run the callbacks worker threads queued; they never call into Tk themselves."""
+        try:
+            while True:
+                fn, args = self._ui_calls.get_nowait()
+                fn(*args)
+        except queue.Empty:
+            pass
+        finally:
+            self.after(_UI_POLL_MS, self._drain_ui_calls)
 
-        self.bot_proc = start_bot_process(symbols, tf, risk, self.auto_mode_var.get())
-        if self.bot_proc:
-            messagebox.showinfo("Bot", "Bot started.")
+    def _on_bot_started(self, proc: subprocess.Popen | None, err: Exception | None):
+        self._launching = False
+        if err is not None:
+            messagebox.showerror("Launch error", f"Could not start bot:\n{err}")
+            return
+        if self._closing:  # _on_app_close's worker stops it
+            return
+        if self._cancel_launch:  # Stop was pressed while the launch was in flight
+            self._stop_async(proc)
+            return
+        self.bot_proc = proc
+        # interpreter shutdown without a window close still stops the bot
+        atexit.register(stop_bot_process, self.bot_proc)
+        messagebox.showinfo("Bot", "Bot started.")
 
     def _stop_bot(self):
-        stop_bot_process(self.bot_proc)
+        self._cancel_launch = self._launching
+        self._stop_async(self.bot_proc)
         messagebox.showinfo("Bot", "Stop signal sent.")
 
     def _load_license(self):
@@ -382,9 +524,24 @@ class AngelaApp(tk.Tk):
             messagebox.showerror("License", f"Failed to load license: {e}")
 
     def _on_app_close(self):
-        # Stop the bot automatically on window close.
-        stop_bot_process(self.bot_proc)
-        self.destroy()
+        # Stop the bot automatically on window close. The stop can take up to
+        # 2×BOT_STOP_TIMEOUT, so the window hides now and is destroyed once it is done.
+        if self._closing:
+            return
+        self._closing = True
+        self._flush_settings()
+        self.withdraw()
+        launch, proc = self._launch_thread, self.bot_proc
+
+        def work():
+            if launch is not None:
+                launch.join()
+            stop_bot_process(proc)
+            if self._launched is not proc:  # finished launching but not adopted yet
+                stop_bot_process(self._launched)
+            self._ui_calls.put((self.destroy, ()))
+
+        threading.Thread(target=work, name="bot-stop", daemon=True).start()
 
 # ---- Entrypoint ----
 def main():
@@ -1,16 +1,46 @@
+import threading
+import time
+
 import MetaTrader5 as mt5
 from datetime import datetime
+from day_trading_bot.utils.mt5_lock import MT5_LOCK
 
 # Optional in-memory trade log (can be expanded for logging to file/db if needed)
 open_trades = {}
 
+# One positions_get() shared by every per-symbol check within a short window
+_POSITIONS_CACHE = None  # (monotonic stamp, positions tuple, symbol -> [positions])
+_POSITIONS_LOCK = threading.Lock()
+
+def _positions_snapshot(cache_ms: int = 250):
+    global _POSITIONS_CACHE
+    now = time.monotonic()
+    with _POSITIONS_LOCK:
+        snap = _POSITIONS_CACHE
+        if snap is not None and (now - snap[0]) * 1000 < cache_ms:
+            return snap
+        with MT5_LOCK:
+            positions = mt5.positions_get()
+        if positions is None:  # terminal error: report nothing open, ask again next call
+            return now, (), {}
+        by_symbol: dict = {}
+        for p in positions:
+            by_symbol.setdefault(p.symbol, []).append(p)
+        _POSITIONS_CACHE = snap = (now, tuple(positions), by_symbol)
+        return snap
+
+def get_open_positions(cache_ms: int = 250) -> tuple:
+    """
+    All open MT5 positions, fetched at most once per `cache_ms` milliseconds.
+    """
+    return _positions_snapshot(cache_ms)[1]
+
 def is_trade_active(symbol: str) -> bool:
     """
     Check if a trade is already active for the given symbol.
-    Uses MT5's position info.
+    Uses MT5's position info (shared snapshot from get_open_positions).
     """
-    positions = mt5.positions_get(symbol=symbol)
-    return positions is not None and len(positions) > 0
+    return symbol in _positions_snapshot()[2]
 
 def register_trade(symbol: str):
     """
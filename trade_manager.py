@@ -1,15 +1,29 @@
 # day_trading_bot/trade_manager.py
 import MetaTrader5 as mt5
+from day_trading_bot.trade_control import get_open_positions
+from day_trading_bot.utils.mt5_lock import MT5_LOCK
+
+# symbol -> price digits; fixed for a symbol, so one symbol_info call per run
+_DIGITS_CACHE: dict = {}
 
 def _price_digits(symbol: str) -> int:
-    info = mt5.symbol_info(symbol)
-    return getattr(info, "digits", 5) or 5
+    digits = _DIGITS_CACHE.get(symbol)
+    if digits is None:
+        with MT5_LOCK:
+            info = mt5.symbol_info(symbol)
+        digits = getattr(info, "digits", 5) or 5
+        if info is not None:  # don't pin the default when the terminal had no answer
+            _DIGITS_CACHE[symbol] = digits
+    return digits
 
-def manage_open_trades():
-    positions = mt5.positions_get()
+def manage_open_trades(positions=None):
+    if positions is None:
+        positions = get_open_positions()
     if not positions:
         return
 
+    requests = []
+    ticks = {}  # symbol -> tick: positions on the same symbol share one symbol_info_tick
     for position in positions:
         symbol      = position.symbol
         entry_price = float(position.price_open)
@@ -24,7 +38,10 @@ def manage_open_trades():
         if tp_dist <= 0:
             continue
 
-        tick = mt5.symbol_info_tick(symbol)
+        if symbol not in ticks:
+            with MT5_LOCK:
+                ticks[symbol] = mt5.symbol_info_tick(symbol)
+        tick = ticks[symbol]
         if not tick:
             continue
         current_price = float(tick.bid if direction == "BUY" else tick.ask)
@@ -49,16 +66,22 @@ def manage_open_trades():
 
             if better:
                 digits = _price_digits(symbol)
-                req = {
+                sl = round(proposed_sl, digits)
+                # rounding can land back on the current SL; the terminal would reject that as no change
+                if sl == current_sl:
+                    continue
+                requests.append({
                     "action":       mt5.TRADE_ACTION_SLTP,
                     "position":     position.ticket,
                     "symbol":       symbol,
-                    "sl":           round(proposed_sl, digits),
+                    "sl":           sl,
                     "tp":           round(tp, digits),
                     "type_time":    mt5.ORDER_TIME_GTC,
                     "type_filling": mt5.ORDER_FILLING_IOC,
-                }
-                res = mt5.order_send(req)
-                if res is None or getattr(res, "retcode", None) != mt5.TRADE_RETCODE_DONE:
-                    # non-fatal; we keep managing on next loop
-                    continue
+                })
+
+    # sent back to back after the scan (the terminal IPC takes one call at a time);
+    # failures are non-fatal; we keep managing on next loop
+    for req in requests:
+        with MT5_LOCK:
+            mt5.order_send(req)
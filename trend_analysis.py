@@ -1,9 +1,108 @@
 # trend_analysis.py
 
+import numpy as np
 import pandas as pd
 
 
-def detect_trend(df, short_window=14, long_window=50):
+def _last_emas(close: np.ndarray, short_window: int, long_window: int):
+    """Final values of the two adjust=False EMAs (pandas ewm fallback)."""
+    s = pd.Series(close)
+    return (
+        s.ewm(span=short_window, adjust=False).mean().iloc[-1],
+        s.ewm(span=long_window, adjust=False).mean().iloc[-1],
+    )
+
+
+# --- Numba optional: both EMA recurrences in one pass, no intermediate arrays ---
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _last_emas(close, short_window, long_window):
+        a_s = 2.0 / (short_window + 1)
+        a_l = 2.0 / (long_window + 1)
+        s = np.nan
+        l = np.nan
+        for x in close:
+            if x != x:  # NaN bars leave the averages unchanged
+                continue
+            if s != s:  # seeded with the first valid close, like ewm(adjust=False)
+                s = x
+                l = x
+            else:
+                s += a_s * (x - s)
+                l += a_l * (x - l)
+        return s, l
+except Exception:
+    pass
+
+
+def _verdict(ema_short, ema_long) -> str:
+    if ema_short > ema_long:
+        return "uptrend"
+    elif ema_short < ema_long:
+        return "downtrend"
+    else:
+        return "sideways"
+
+
+class TrendEMA:
+    """
+    EMA crossover with the averages carried across calls per key, e.g. (symbol, TF).
+
+    The state covers bars up to the last *closed* one (df row -2) and is stamped
+    with that bar's time; the forming bar is folded into a copy on every call.
+    When the next frame still contains the stamped bar only the bars after it are
+    folded in, otherwise the state is rebuilt from the whole frame. Over the
+    hundreds of bars in a fetch the EMA seed has long decayed, so both paths
+    agree with a from-scratch computation.
+    """
+
+    def __init__(self, short_window: int = 14, long_window: int = 50):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.a_s = 2.0 / (short_window + 1)
+        self.a_l = 2.0 / (long_window + 1)
+        self.state: dict = {}  # key -> (ema_short, ema_long, time of last closed bar)
+
+    def _fold(self, s: float, l: float, closes) -> tuple:
+        for x in closes:
+            if x != x:  # NaN bars leave the averages unchanged
+                continue
+            if s != s:
+                s = l = x
+            else:
+                s += self.a_s * (x - s)
+                l += self.a_l * (x - l)
+        return s, l
+
+    def __call__(self, df, key) -> str:
+        if df is None or df.empty or 'close' not in df.columns:
+            return "sideways"
+        closes = df['close'].to_numpy(dtype=np.float64)
+        n = len(closes)
+        if n < 2 or 'time' not in df.columns:
+            return _verdict(*_last_emas(closes, self.short_window, self.long_window))
+
+        times = df['time'].to_numpy()
+        hit = self.state.get(key)
+        start = -1
+        if hit is not None:
+            i = int(np.searchsorted(times, hit[2]))
+            if i < n - 1 and times[i] == hit[2]:
+                start = i + 1
+        if start < 0:
+            s, l = _last_emas(closes[:-1], self.short_window, self.long_window)
+        else:
+            s, l = self._fold(hit[0], hit[1], closes[start:n - 1])
+        self.state[key] = (s, l, times[n - 2])
+        return _verdict(*self._fold(s, l, closes[n - 1:]))
+
+
+_TREND_EMAS: dict = {}  # (short_window, long_window) -> TrendEMA
+
+
+def detect_trend(df, short_window=14, long_window=50, key=None):
     """
     Detects major trend direction based on EMA crossover.
 
@@ -11,19 +110,21 @@ def detect_trend(df, short_window=14, long_window=50):
         df (pd.DataFrame): DataFrame with 'close' prices.
         short_window (int): Short-term EMA window (default 14).
         long_window (int): Long-term EMA window (default 50).
+        key (hashable, optional): e.g. (symbol, timeframe); when given, EMA
+            state is kept between calls and only new bars are folded in.
 
     Returns:
         str: 'uptrend', 'downtrend', or 'sideways'
     """
+    if key is not None:
+        trend = _TREND_EMAS.get((short_window, long_window))
+        if trend is None:
+            trend = _TREND_EMAS[(short_window, long_window)] = TrendEMA(short_window, long_window)
+        return trend(df, key)
+
     if df is None or df.empty or 'close' not in df.columns:
         return "sideways"
 
-    ema_short = df['close'].ewm(span=short_window, adjust=False).mean()
-    ema_long = df['close'].ewm(span=long_window, adjust=False).mean()
-
-    if ema_short.iloc[-1] > ema_long.iloc[-1]:
-        return "uptrend"
-    elif ema_short.iloc[-1] < ema_long.iloc[-1]:
-        return "downtrend"
-    else:
-        return "sideways"
+    return _verdict(*_last_emas(
+        df['close'].to_numpy(dtype=np.float64), short_window, long_window
+    ))
@@ -1,5 +1,8 @@
 import requests
+import hashlib
+import json
 import os
+import re
 import subprocess
 import sys
 import time
@@ -8,27 +11,103 @@ import time
 CURRENT_VERSION = "1.0.0"
 VERSION_URL = "https://your-server.com/version.txt"       # 🔁 Replace with your real URL
 EXE_URL     = "https://your-server.com/forexbot.exe"       # 🔁 Replace with your real URL
+SHA256_URL  = "https://your-server.com/forexbot.exe.sha256"  # hex digest of EXE_URL
+ALLOW_UNVERIFIED_UPDATE = False  # True installs even when SHA256_URL can't be fetched
 EXE_NAME    = "forexbot.exe"
 TMP_EXE     = "forexbot_new.exe"
+CHUNK_SIZE  = 256 * 1024  # bytes per read/write while downloading
+# last version.txt ETag/Last-Modified + body, so unchanged checks come back as 304
+VERSION_CACHE = os.path.join(os.getenv("APPDATA") or os.path.expanduser("~"), "ForexBot", "version.etag")
 
 # --- VERSION CHECK ---
+def _load_version_cache():
+    try:
+        with open(VERSION_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f) or {}
+    except Exception:
+        return {}
+
+def _save_version_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(VERSION_CACHE), exist_ok=True)
+        with open(VERSION_CACHE, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except Exception as e:
+        print(f"[WARN] Could not store version cache: {e}")
+
 def get_latest_version():
+    cache = _load_version_cache()
+    headers = {}
+    if cache.get("version"):  # validators are only useful while we still have the body they vouch for
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
     try:
-        response = requests.get(VERSION_URL)
-        return response.text.strip()
+        response = requests.get(VERSION_URL, headers=headers, timeout=5)
+        if response.status_code == 304:
+            return cache["version"]
+        response.raise_for_status()
+        latest = response.text.strip()
+        _save_version_cache({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "version": latest,
+        })
+        return latest
     except Exception as e:
         print(f"[ERROR] Could not fetch version info: {e}")
         return None
 
+def _version_key(v):
+    # numeric compare so "1.0.10" > "1.0.2"; non-numeric parts sort as 0
+    parts = [int(p) if p.isdigit() else 0 for p in re.split(r"[.\-+]", v.strip().lstrip("vV"))]
+    while parts and parts[-1] == 0:  # "1.0" == "1.0.0"
+        parts.pop()
+    return tuple(parts)
+
+def is_newer(latest, current=CURRENT_VERSION):
+    try:
+        return _version_key(latest) > _version_key(current)
+    except Exception:
+        return latest > current
+
+# --- EXPECTED CHECKSUM ---
+def get_expected_sha256():
+    try:
+        response = requests.get(SHA256_URL, timeout=10)
+        response.raise_for_status()
+        # accept both a bare digest and "sha256sum" output ("<digest>  <file>")
+        digest = response.text.split()[0].lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise ValueError(f"not a SHA-256 digest: {digest[:80]!r}")
+        return digest
+    except Exception as e:
+        print(f"[WARN] No checksum available: {e}")
+        return None
+
 # --- DOWNLOAD EXE ---
 def download_new_version():
     try:
         print("[INFO] Downloading update...")
-        response = requests.get(EXE_URL, stream=True)
-        with open(TMP_EXE, "wb") as f:
-            for chunk in response.iter_content(chunk_size=1024):
-                if chunk:
-                    f.write(chunk)
+        expected = get_expected_sha256()
+        if not expected:
+            if not ALLOW_UNVERIFIED_UPDATE:
+                print("[ERROR] Refusing to install an update that can't be verified.")
+                return False
+            print("[WARN] Installing without checksum verification (ALLOW_UNVERIFIED_UPDATE).")
+        digest = hashlib.sha256()
+        with requests.get(EXE_URL, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            with open(TMP_EXE, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        digest.update(chunk)
+        if expected and digest.hexdigest() != expected:
+            print("[ERROR] Checksum mismatch, discarding download.")
+            os.remove(TMP_EXE)
+            return False
         print("[INFO] Download complete.")
         return True
     except Exception as e:
@@ -53,7 +132,7 @@ def main():
     print(f"[START] Forex Bot Updater v{CURRENT_VERSION}")
     latest = get_latest_version()
 
-    if latest and latest > CURRENT_VERSION:
+    if latest and is_newer(latest):
         print(f"[UPDATE] New version available: {latest}")
         if download_new_version():
             time.sleep(1)
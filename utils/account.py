@@ -1,8 +1,14 @@
 # day_trading_bot/utils/account.py
 
+import time
+
 import MetaTrader5 as mt5
 from .logger import print_debug
 
+# Last good balance; callers within one tick share it instead of re-asking the terminal
+BALANCE_CACHE_SECONDS = 1.0
+_BAL_CACHE = {"t": float("-inf"), "v": 0.0}
+
 
 def get_balance(default: float = 0.0, auto_init: bool = False) -> float:
     """
@@ -18,7 +24,13 @@ def get_balance(default: float = 0.0, auto_init: bool = False) -> float:
 
     Returns:
         float: balance or `default` on failure.
+
+    Successful reads are reused for BALANCE_CACHE_SECONDS; call
+    get_balance.invalidate() after an order to force a fresh read.
     """
+    now = time.monotonic()
+    if now - _BAL_CACHE["t"] < BALANCE_CACHE_SECONDS:
+        return _BAL_CACHE["v"]
     try:
         # Check terminal status first (cheap & reliable)
         if mt5.terminal_info() is None:
@@ -36,7 +48,16 @@ def get_balance(default: float = 0.0, auto_init: bool = False) -> float:
             print_debug("[ERROR] account_info() returned None.")
             return default
 
-        return float(info.balance)
+        balance = float(info.balance)
+        _BAL_CACHE["t"], _BAL_CACHE["v"] = now, balance
+        return balance
     except Exception as e:
         print_debug(f"[ERROR] get_balance() exception: {e}")
         return default
+
+
+def _invalidate_balance():
+    _BAL_CACHE["t"] = float("-inf")
+
+
+get_balance.invalidate = _invalidate_balance
@@ -10,12 +10,19 @@ def get_lot_size(balance: float,
     and 1.0 maximum lot cap (to match your risk.py behavior).
     """
     try:
-        if balance <= 0 or sl_distance_points is None or sl_distance_points <= 0 or pip_value <= 0:
+        if sl_distance_points is None:
             return 0.01
-        risk_amount = float(balance) * (float(risk_percent) / 100.0)
-        lot = risk_amount / (float(sl_distance_points) * float(pip_value))
-        # enforce your bounds
-        lot = max(0.01, min(lot, 1.0))
-        return round(lot, 2)
+        # coerce once; every later operation is on plain floats
+        balance = float(balance)
+        sl = float(sl_distance_points)
+        pip = float(pip_value)
+        if not (balance > 0.0 and sl > 0.0 and pip > 0.0):  # also rejects NaN
+            return 0.01
+        lot = balance * (float(risk_percent) / 100.0) / (sl * pip)
+        # enforce your bounds in whole hundredths of a lot (0.01 .. 1.00), rounding
+        # half-up with a tolerance so 1.005-style float noise can't flip the step
+        steps = lot * 100.0
+        steps = 100 if steps > 100.0 else (int(steps + 0.5 + 1e-9) if steps >= 1.0 else 1)
+        return steps / 100.0
     except Exception:
         return 0.01
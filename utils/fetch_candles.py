@@ -1,14 +1,29 @@
 # day_trading_bot/utils/fetch_candles.py
 
+import threading
+import time
+
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
 from day_trading_bot.utils.logger import print_debug
+from day_trading_bot.utils.mt5_lock import MT5_LOCK
 from day_trading_bot.config import CANDLE_COUNTS, TIMEFRAMES  # timeframe map and default counts
 
+# Short-lived bar cache: strategies in the same loop iteration ask for the same
+# (symbol, TF, count) repeatedly. Entries live for one time bucket.
+CANDLE_CACHE_SECONDS = 30
+_CANDLE_CACHE: dict = {}  # (symbol, timeframe, count) -> (bucket, DataFrame)
+_CANDLE_CACHE_LOCK = threading.Lock()
+
+# base symbol -> broker name already selected in Market Watch (fixed for the run)
+_RESOLVED: dict[str, str] = {}
+
 
 def _mt5_inited() -> bool:
     try:
-        return mt5.terminal_info() is not None
+        with MT5_LOCK:
+            return mt5.terminal_info() is not None
     except Exception:
         return False
 
@@ -17,8 +32,10 @@ def initialize_mt5() -> bool:
     """Initialize MT5 terminal if not already running."""
     if _mt5_inited():
         return True
-    if not mt5.initialize():
-        error_code, error_msg = mt5.last_error()
+    with MT5_LOCK:
+        ok = mt5.initialize()
+        error_code, error_msg = (0, "") if ok else mt5.last_error()
+    if not ok:
         print_debug(f"[ERROR] Could not initialize MT5. code={error_code} msg={error_msg}")
         return False
     return True
@@ -28,17 +45,27 @@ def _resolve_symbol(base_symbol: str) -> str | None:
     """
     Ensure a broker-specific symbol is selected in MT5.
     Returns the resolved symbol name or None if not found.
+    Successful resolutions are cached; failures are retried on the next call.
     """
+    resolved = _RESOLVED.get(base_symbol)
+    if resolved is not None:
+        return resolved
+
     # Try exact first
-    if mt5.symbol_select(base_symbol, True):
+    with MT5_LOCK:
+        selected = mt5.symbol_select(base_symbol, True)
+    if selected:
+        _RESOLVED[base_symbol] = base_symbol
         return base_symbol
 
     # Try broker variants (suffixes like m, .pro, .r)
     try:
-        for s in mt5.symbols_get():
-            if s.name.upper().startswith(base_symbol.upper()):
-                if mt5.symbol_select(s.name, True):
-                    return s.name
+        with MT5_LOCK:
+            for s in mt5.symbols_get():
+                if s.name.upper().startswith(base_symbol.upper()):
+                    if mt5.symbol_select(s.name, True):
+                        _RESOLVED[base_symbol] = s.name
+                        return s.name
     except Exception as e:
         print_debug(f"[ERROR] symbols_get failed: {e}")
 
@@ -51,51 +78,123 @@ def fetch_candles(symbol: str, timeframe: int, count: int | None = None) -> pd.D
     Safely fetch bars for `symbol` at `timeframe`.
     - Uses default bar counts from config when `count` is None.
     - Returns clean DataFrame with datetime index, or None on failure.
+    - Repeat calls within the same CANDLE_CACHE_SECONDS bucket share one MT5
+      download (failures are not cached); treat the returned frame as read-only.
     """
+    key = (symbol, timeframe, count)
+    bucket = int(time.time() // CANDLE_CACHE_SECONDS)
+    with _CANDLE_CACHE_LOCK:
+        hit = _CANDLE_CACHE.get(key)
+    if hit is not None and hit[0] == bucket:
+        return hit[1]
+
+    df = _download_candles(symbol, timeframe, count)
+    if df is not None:
+        with _CANDLE_CACHE_LOCK:
+            # drop entries from older buckets so the cache stays one tick wide
+            for k in [k for k, (b, _) in _CANDLE_CACHE.items() if b != bucket]:
+                del _CANDLE_CACHE[k]
+            _CANDLE_CACHE[key] = (bucket, df)
+    return df
+
+
+def _download_candles(symbol: str, timeframe: int, count: int | None) -> pd.DataFrame | None:
+    rates, label = _download_rates(symbol, timeframe, count)
+    return None if rates is None else _rates_to_frame(rates, symbol, label)
+
+
+def _download_rates(symbol: str, timeframe: int, count: int | None):
+    """Raw MT5 structured array for `symbol`@`timeframe` (or None) plus a TF label for logs."""
     if not initialize_mt5():
         print_debug(f"[ERROR] Failed to initialize MT5 for {symbol}")
-        return None
+        return None, timeframe
 
     resolved = _resolve_symbol(symbol)
     if not resolved:
         print_debug(f"[ERROR] Failed to resolve/select symbol {symbol} in Market Watch")
-        return None
+        return None, timeframe
     symbol = resolved
 
     tf_label = next((k for k, v in TIMEFRAMES.items() if v == timeframe), None)
     want = count or CANDLE_COUNTS.get(tf_label, 500)
+    label = tf_label or timeframe
 
     try:
-        print_debug(f"[DEBUG] Fetching {want} candles for {symbol} on TF={tf_label or timeframe}")
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, want)
+        print_debug(f"[DEBUG] Fetching {want} candles for {symbol} on TF={label}")
+        with MT5_LOCK:  # last_error() must belong to this call, not another thread's
+            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, want)
+            error = mt5.last_error() if rates is None else None
 
         if rates is None:
-            error_code, error_msg = mt5.last_error()
-            print_debug(f"[MT5 ERROR] No data for {symbol}@{tf_label or timeframe} code={error_code} msg={error_msg}")
-            return None
+            error_code, error_msg = error
+            print_debug(f"[MT5 ERROR] No data for {symbol}@{label} code={error_code} msg={error_msg}")
+            return None, label
 
         if len(rates) == 0:
-            print_debug(f"[MT5 ERROR] Empty data for {symbol}@{tf_label or timeframe}")
-            return None
+            print_debug(f"[MT5 ERROR] Empty data for {symbol}@{label}")
+            return None, label
+
+        return rates, label
+
+    except Exception as e:
+        print_debug(f"[FETCH EXCEPTION] {symbol}@{label}: {e}")
+        return None, label
+
+
+_OHLC_FIELDS = ("open", "high", "low", "close")
 
-        df = pd.DataFrame(rates)
-        # basic schema guard
-        need_cols = {"time", "open", "high", "low", "close"}
-        if not need_cols.issubset(df.columns):
-            print_debug(f"[WARN] Missing OHLC/time columns for {symbol}@{tf_label or timeframe}")
+
+def _rates_to_frame(rates, symbol: str, label) -> pd.DataFrame | None:
+    try:
+        # basic schema guard, on the structured dtype before anything is built
+        names = rates.dtype.names or ()
+        if not {"time", *_OHLC_FIELDS}.issubset(names):
+            print_debug(f"[WARN] Missing OHLC/time columns for {symbol}@{label}")
             return None
 
-        df["time"] = pd.to_datetime(df["time"], unit="s")
-        if df.isnull().any().any():
-            print_debug(f"[WARN] Null values in {symbol}@{tf_label or timeframe}")
+        # only the float price fields can hold NaN; the volume/spread fields are integers
+        if any(np.isnan(rates[f]).any() for f in _OHLC_FIELDS):
+            print_debug(f"[WARN] Null values in {symbol}@{label}")
             return None
 
+        df = pd.DataFrame.from_records(rates)
+        df["time"] = rates["time"].astype("datetime64[s]")
         return df
 
     except Exception as e:
-        print_debug(f"[FETCH EXCEPTION] {symbol}@{tf_label or timeframe}: {e}")
+        print_debug(f"[FETCH EXCEPTION] {symbol}@{label}: {e}")
         return None
 
 
+class CandleCache:
+    """
+    Per-tick store of MT5 bars keyed by (symbol, timeframe, count).
+    Create one per run_bot iteration and hand it to every consumer so each
+    (symbol, TF) is downloaded once; the raw arrays are kept and DataFrames are
+    only built on first get(). Misses are remembered too, so a dead feed is not
+    retried until the next tick's cache.
+    """
+
+    def __init__(self):
+        self._rates: dict = {}   # key -> (structured ndarray | None, TF label)
+        self._frames: dict = {}  # key -> DataFrame | None
+
+    def rates(self, symbol: str, timeframe: int, count: int | None = None):
+        """Raw structured array from copy_rates_from_pos, or None."""
+        key = (symbol, timeframe, count)
+        if key not in self._rates:
+            self._rates[key] = _download_rates(symbol, timeframe, count)
+        return self._rates[key][0]
+
+    def get(self, symbol: str, timeframe: int, count: int | None = None) -> pd.DataFrame | None:
+        """Same contract as fetch_candles(); treat the returned frame as read-only."""
+        key = (symbol, timeframe, count)
+        if key not in self._frames:
+            rates = self.rates(symbol, timeframe, count)
+            label = self._rates[key][1]
+            self._frames[key] = None if rates is None else _rates_to_frame(rates, symbol, label)
+        return self._frames[key]
+
+
 # Backward-compatible alias
 ensure_data = fetch_candles
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 def passes_all_filters(trade_signal: dict) -> bool:
     """
     Decide if a trade passes core strategy filters.
@@ -16,21 +18,79 @@ def passes_all_filters(trade_signal: dict) -> bool:
       - min_confidence: int/float (default 70)
       - min_confirmation_ratio: float in [0,1] (default 0.7)
     """
-    direction = trade_signal.get("direction", "unclear")
-    pattern_valid = bool(trade_signal.get("pattern_valid", False))
-    confirmations = max(0, int(trade_signal.get("confirmations", 0)))
-    total = max(0, int(trade_signal.get("total_strategies", 7)))
-    confidence = float(trade_signal.get("confidence", 0.0))
+    get = trade_signal.get
+    direction = get("direction", "unclear")
+    pattern_valid = get("pattern_valid", False)
+    if type(pattern_valid) is not bool:
+        pattern_valid = bool(pattern_valid)
+
+    # upstream already sends ints/floats; only coerce anything else (str, numpy scalars, ...)
+    confirmations = get("confirmations", 0)
+    if type(confirmations) is not int:
+        confirmations = int(confirmations)
+    total = get("total_strategies", 7)
+    if type(total) is not int:
+        total = int(total)
+    confirmations = confirmations if confirmations > 0 else 0
+    total = total if total > 0 else 0
+
+    # int and float compare exactly against each other, so both pass through as-is
+    confidence = get("confidence", 0.0)
+    if type(confidence) is not float and type(confidence) is not int:
+        confidence = float(confidence)
 
     # Defaults preserved; can be overridden per-call without changing callers.
-    min_conf = float(trade_signal.get("min_confidence", 70))
-    min_ratio = float(trade_signal.get("min_confirmation_ratio", 0.7))
+    min_conf = get("min_confidence", 70)
+    if type(min_conf) is not float and type(min_conf) is not int:
+        min_conf = float(min_conf)
+    min_ratio = get("min_confirmation_ratio", 0.7)
+    if type(min_ratio) is not float and type(min_ratio) is not int:
+        min_ratio = float(min_ratio)
 
-    ratio = (confirmations / total) if total > 0 else 0.0
+    return passes_all_filters_fast(direction in ("BUY", "SELL"), pattern_valid,
+                                   confirmations, total, confidence, min_conf, min_ratio)
+
+def passes_all_filters_fast(direction_ok: bool,
+                            pattern_valid: bool,
+                            confirmations: int,
+                            total: int,
+                            confidence: float,
+                            min_conf: float = 70.0,
+                            min_ratio: float = 0.7) -> bool:
+    """
+    passes_all_filters on already-extracted values: no dict lookups or coercion.
+    `confirmations`/`total` must be non-negative; direction_ok is
+    direction in ("BUY", "SELL").
+    """
+    # most selective check first; the ratio (a division) only for survivors
+    if not pattern_valid:
+        return False
+    if not direction_ok:
+        return False
+    if not confidence >= min_conf:  # also rejects NaN
+        return False
+    if total <= 0:
+        return min_ratio <= 0.0  # ratio is 0.0 with no strategies
+    # kept as a division: c >= r * t rounds differently (0.7 * 10 > 7.0)
+    return confirmations / total >= min_ratio
+
+def passes_all_filters_batch(df, min_conf: float = 70, min_ratio: float = 0.7) -> np.ndarray:
+    """
+    passes_all_filters for every row of a DataFrame at once -> bool ndarray.
+    Columns as the dict keys: direction, pattern_valid, confirmations,
+    total_strategies (default 7 when absent), confidence. Thresholds apply to
+    all rows; per-row min_* overrides are not read.
+    """
+    n = len(df)
+    dir_ok = df["direction"].isin(("BUY", "SELL")).to_numpy()
+    pattern_ok = df["pattern_valid"].fillna(False).to_numpy(dtype=bool)
+    conf = df["confidence"].to_numpy(dtype=np.float64)
+    confirmations = np.maximum(df["confirmations"].to_numpy(dtype=np.int64), 0)
+    if "total_strategies" in df:
+        total = np.maximum(df["total_strategies"].to_numpy(dtype=np.int64), 0)
+    else:
+        total = np.full(n, 7, dtype=np.int64)
 
-    return (
-        direction in ("BUY", "SELL")
-        and pattern_valid
-        and confidence >= min_conf
-        and ratio >= min_ratio
-    )
+    ratio = np.zeros(n)
+    np.divide(confirmations, total, out=ratio, where=total > 0)
+    return dir_ok & pattern_ok & (conf >= float(min_conf)) & (ratio >= float(min_ratio))
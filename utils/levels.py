@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import numpy as np
+
+# price -> points multiplier for the two precisions the heuristic picks
+_FACTOR = {2: 100, 4: 10000}
+
 def is_near_psychological_level(price: float,
                                 sensitivity: int = 100,
                                 digits: int | None = None) -> bool:
@@ -14,8 +19,24 @@ def is_near_psychological_level(price: float,
     if digits is None:
         digits = 2 if price >= 100 else 4  # heuristic: JPY/XAU vs majors
 
-    factor = 10 ** int(digits)
-    price_points = int(round(price * factor))
-    remainder = price_points % 1000
+    factor = _FACTOR.get(digits) or 10 ** int(digits)
+    remainder = int(round(price * factor)) % 1000
+
+    # distance to the nearest multiple of 1000 points, either side
+    return min(remainder, 1000 - remainder) <= sensitivity
 
-    return remainder <= sensitivity or remainder >= (1000 - sensitivity)
+def near_psych_mask(prices,
+                    sensitivity: int = 100,
+                    digits: int | None = None) -> np.ndarray:
+    """
+    is_near_psychological_level for a whole price array -> bool ndarray.
+    `digits=None` applies the same per-price heuristic (>=100 -> 2, else 4).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if digits is None:
+        factor = np.where(prices >= 100, _FACTOR[2], _FACTOR[4])
+    else:
+        factor = _FACTOR.get(digits) or 10 ** int(digits)
+    # np.rint rounds half to even, like round()
+    remainder = np.rint(prices * factor).astype(np.int64) % 1000
+    return np.minimum(remainder, 1000 - remainder) <= sensitivity
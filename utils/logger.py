@@ -1,12 +1,13 @@
 # utils/logger.py
 
 import os
-import csv
 import io
 import sys
 import time
+import queue
+import atexit
 import threading
-from datetime import datetime
+from collections import OrderedDict
 from typing import Optional
 
 # ---------- optional config toggles ----------
@@ -20,7 +21,11 @@ _DEDUP_WINDOW = float(os.getenv("LOG_DEDUP_WINDOW_SECONDS", "2.0"))  # seconds
 
 # ---------- paths & setup ----------
 
-_LOG_LOCK = threading.Lock()
+# One lock per log stream, so trade logging never waits on debug output (or vice versa):
+#   _DEBUG_LOCK - dedup state + the debug-log handle
+#   _TRADE_LOCK - starting/stopping the trade-log writer; rows themselves go through a Queue
+_DEBUG_LOCK = threading.Lock()
+_TRADE_LOCK = threading.Lock()
 
 def _base_dir() -> str:
     """Where the app is running from (EXE dir when frozen; module dir in dev)."""
@@ -56,10 +61,30 @@ _DEBUG_LOG = os.path.join(_LOG_DIR, "debug_log.log")
 
 _TRADE_HEADERS = ["timestamp", "symbol", "direction", "entry_price", "lot_size", "profit", "comment", "reason"]
 
+# ---------- trade log writer ----------
+# log_trade only formats and enqueues a line; one daemon thread owns the CSV handle and writes in batches
+_TRADE_BATCH = 1000  # max rows per write()
+_TRADE_Q: "queue.Queue[Optional[str]]" = queue.Queue()
+_TRADE_FLUSHER: Optional[threading.Thread] = None
+
+# ---------- timestamps ----------
+_TS_CACHE = (-1, "")  # (epoch second, formatted local time); bursts share one strftime
+
+def _now_ts() -> str:
+    global _TS_CACHE
+    sec = int(time.time())
+    cached = _TS_CACHE
+    if cached[0] != sec:
+        cached = _TS_CACHE = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
+    return cached[1]
+
 # ---------- internal state for de-dup ----------
-_LAST_LINE: Optional[str] = None
-_LAST_TS: float = 0.0
-_LAST_REPEAT: int = 0
+# hash(message) -> [time.monotonic() it was last emitted, repeats suppressed since];
+# LRU-bounded so interleaved repeats (A, B, A, B) are caught without unbounded memory.
+# Only hashes are kept, never the message text.
+_DEDUP_MAX = 32
+_DEDUP: "OrderedDict[int, list]" = OrderedDict()
+_LAST_HASH: int = 0  # hash() of the last emitted message
 
 def _emit_console(line: str) -> None:
     try:
@@ -67,11 +92,44 @@ def _emit_console(line: str) -> None:
     except Exception:
         pass
 
+# debug log: one buffered handle for the process, flushed by a 1 s timer thread
+# (and at exit) instead of an open/write/close per line; guarded by _DEBUG_LOCK
+DEBUG_FLUSH_SECONDS = 1.0
+_DBG_FH = None
+_DBG_DIRTY = False
+
+def _debug_fh():
+    global _DBG_FH
+    if _DBG_FH is None:
+        # _log_dir() created the directory at import; only recreate it if it was removed since
+        try:
+            _DBG_FH = io.open(_DEBUG_LOG, "a", encoding="utf-8", buffering=1 << 16)
+        except FileNotFoundError:
+            os.makedirs(_LOG_DIR, exist_ok=True)
+            _DBG_FH = io.open(_DEBUG_LOG, "a", encoding="utf-8", buffering=1 << 16)
+        threading.Thread(target=_debug_flusher, name="debug-log-flush", daemon=True).start()
+        atexit.register(_flush_debug_log)
+    return _DBG_FH
+
+def _debug_flusher() -> None:
+    while True:
+        time.sleep(DEBUG_FLUSH_SECONDS)
+        _flush_debug_log()
+
+def _flush_debug_log() -> None:
+    global _DBG_DIRTY
+    with _DEBUG_LOCK:
+        if _DBG_DIRTY and _DBG_FH is not None:
+            try:
+                _DBG_FH.flush()
+            except Exception:
+                pass
+            _DBG_DIRTY = False
+
 def _emit_file(line: str) -> None:
-    os.makedirs(_LOG_DIR, exist_ok=True)
-    with io.open(_DEBUG_LOG, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
-        f.flush()
+    global _DBG_DIRTY
+    _debug_fh().write(line + "\n")
+    _DBG_DIRTY = True
 
 # ---------- public API ----------
 
@@ -80,35 +138,90 @@ def log_trade(symbol: str,
               result: Optional[object],
               reason: str = "") -> str:
     """
-    Append one trade to CSV (thread-safe, no pandas).
+    Queue one trade for the CSV (thread-safe, no pandas); a background thread
+    appends it, and anything still queued is written at interpreter exit.
     Returns the path to the log file.
     """
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    row = {
-        "timestamp": ts,
-        "symbol": symbol,
-        "direction": direction,
-        "entry_price": getattr(result, "price_open", 0),
-        "lot_size": getattr(result, "volume", 0),
-        "profit": getattr(result, "profit", 0) if result is not None else 0,
-        "comment": getattr(result, "comment", ""),
-        "reason": reason or "",
-    }
-
-    with _LOG_LOCK:
-        header_needed = not os.path.exists(_TRADE_LOG)
-        # newline='' is important on Windows to avoid blank lines
-        with open(_TRADE_LOG, "a", encoding="utf-8", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=_TRADE_HEADERS, extrasaction="ignore")
-            if header_needed:
-                w.writeheader()
-            w.writerow(row)
+    ts = _now_ts()
+    # one preformatted CSV line in _TRADE_HEADERS order
+    line = ",".join(map(_csv_field, (
+        ts,
+        symbol,
+        direction,
+        getattr(result, "price_open", 0),
+        getattr(result, "volume", 0),
+        getattr(result, "profit", 0) if result is not None else 0,
+        getattr(result, "comment", ""),
+        reason or "",
+    ))) + "\r\n"
+
+    _ensure_trade_flusher()
+    _TRADE_Q.put(line)
     return _TRADE_LOG
 
+def _csv_field(v) -> str:
+    """Same text csv.writer would produce: None -> empty, quoted only when needed."""
+    if v is None:
+        return ""
+    s = str(v)
+    if any(c in s for c in ',"\r\n'):
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+def _trade_flusher() -> None:
+    # the header decision is made once, when the writer opens the file for the process
+    try:
+        header_needed = os.path.getsize(_TRADE_LOG) == 0
+    except OSError:  # no file yet
+        header_needed = True
+    # newline='' is important on Windows to avoid blank lines
+    with open(_TRADE_LOG, "a", encoding="utf-8", newline="", buffering=1 << 16) as f:
+        if header_needed:
+            f.write(",".join(_TRADE_HEADERS) + "\r\n")
+        while True:
+            batch = [_TRADE_Q.get()]
+            while batch[-1] is not None and len(batch) < _TRADE_BATCH:
+                try:
+                    batch.append(_TRADE_Q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None  # sentinel from _close_trade_log
+            f.write("".join(line for line in batch if line is not None))
+            f.flush()
+            if stop:
+                return
+
+def _ensure_trade_flusher() -> None:
+    global _TRADE_FLUSHER
+    t = _TRADE_FLUSHER
+    if t is not None and t.is_alive():
+        return
+    with _TRADE_LOCK:
+        t = _TRADE_FLUSHER
+        if t is None or not t.is_alive():
+            # (re)started after flush_logs()/_close_trade_log stopped the last one
+            t = threading.Thread(target=_trade_flusher, name="trade-log", daemon=True)
+            t.start()
+            atexit.unregister(_close_trade_log)  # once, however often the writer restarts
+            atexit.register(_close_trade_log)
+            _TRADE_FLUSHER = t
+
+def _close_trade_log(timeout: float = 5.0) -> None:
+    """Write out everything queued so far and stop the writer thread; the next log_trade starts a new one."""
+    global _TRADE_FLUSHER
+    with _TRADE_LOCK:
+        t = _TRADE_FLUSHER
+        if t is not None and t.is_alive():
+            _TRADE_Q.put(None)
+            t.join(timeout)
+        if t is not None and not t.is_alive():
+            _TRADE_FLUSHER = None
+
 def print_debug(message: str) -> str:
     """
     Print to console and append to debug log (thread-safe) with de-duplication:
-      - If the same message repeats within _DEDUP_WINDOW seconds, suppress it.
+      - If the same message repeats within _DEDUP_WINDOW seconds, suppress it
+        (the last _DEDUP_MAX distinct messages are tracked, not just the last one).
       - When the next different message arrives, write a summary line indicating
         how many repeats were suppressed.
     Returns the path to the debug log file.
@@ -116,36 +229,56 @@ def print_debug(message: str) -> str:
     if not ENABLE_DEBUG_LOGGING:
         return _DEBUG_LOG
 
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{ts}] {message}"
-    now = time.time()
+    now = time.monotonic()  # wall-clock jumps (NTP/DST) must not skew the dedup window
+    h = hash(message)
 
-    with _LOG_LOCK:
-        global _LAST_LINE, _LAST_TS, _LAST_REPEAT
+    with _DEBUG_LOCK:
+        global _LAST_HASH
 
-        # identical message within window? suppress
-        if _LAST_LINE == message and (now - _LAST_TS) < _DEDUP_WINDOW:
-            _LAST_REPEAT += 1
+        # same message emitted within the window (even with others in between)? suppress
+        ent = _DEDUP.get(h)
+        if ent is not None and (now - ent[0]) < _DEDUP_WINDOW:
+            ent[1] += 1
+            _DEDUP.move_to_end(h)
             # do not emit anything
             return _DEBUG_LOG
 
-        # before emitting a new (different) message, flush a repeat summary if any
-        if _LAST_REPEAT > 0:
-            sum_line = f"[{ts}] [LOG] (previous line repeated {_LAST_REPEAT}x)"
+        # only now is the line worth formatting; suppressed repeats never get here
+        ts = _now_ts()
+        line = f"[{ts}] {message}"
+
+        # before emitting a new message, flush the previous line's repeat summary if any
+        prev = _DEDUP.get(_LAST_HASH)
+        if prev is not None and prev[1] > 0:
+            sum_line = f"[{ts}] [LOG] (previous line repeated {prev[1]}x)"
             _emit_console(sum_line)
             _emit_file(sum_line)
-            _LAST_REPEAT = 0
+            prev[1] = 0
 
         # emit current message
         _emit_console(line)
         _emit_file(line)
 
-        # update last-seen state
-        _LAST_LINE = message
-        _LAST_TS = now
+        # update last-seen state; counts of evicted or re-shown older lines are dropped
+        if ent is None:
+            _DEDUP[h] = [now, 0]
+        else:
+            ent[0], ent[1] = now, 0
+            _DEDUP.move_to_end(h)
+        while len(_DEDUP) > _DEDUP_MAX:
+            _DEDUP.popitem(last=False)
+        _LAST_HASH = h
 
     return _DEBUG_LOG
 
+def flush_logs() -> None:
+    """
+    Write out buffered debug lines and queued trades now. For paths that end
+    the process without running atexit (os._exit); stops the trade writer.
+    """
+    _flush_debug_log()
+    _close_trade_log()
+
 def get_log_paths() -> dict:
     """Useful for diagnostics or UI."""
     return {"dir": _LOG_DIR, "trade": _TRADE_LOG, "debug": _DEBUG_LOG}
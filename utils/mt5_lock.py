@@ -0,0 +1,10 @@
+# day_trading_bot/utils/mt5_lock.py
+
+import threading
+
+# The MetaTrader5 package makes no thread-safety promise for its terminal IPC.
+# Every MT5 call that can run on a worker thread (symbol scans, per-TF fetches,
+# momentum fetches, batched SLTP sends) holds this lock, so the terminal only
+# ever sees one call at a time; the workers still overlap the pandas/indicator
+# work between calls. Reentrant, so nested helpers may take it again.
+MT5_LOCK = threading.RLock()
@@ -3,7 +3,9 @@
 from __future__ import annotations
 import MetaTrader5 as mt5
 from typing import Tuple
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 SYMBOL = "XAUUSDm"  # default symbol if none provided
 
@@ -16,18 +18,26 @@ def find_nearest_levels(df: pd.DataFrame,
       - returns closest support < close and resistance > close
     """
     try:
-        highs = df["high"]; lows = df["low"]; close = df["close"].iloc[-1]
-        supports, resistances = [], []
+        # plain contiguous float64 columns up front; nothing below touches the DataFrame
+        highs = np.ascontiguousarray(df["high"].to_numpy(dtype=np.float64))
+        lows = np.ascontiguousarray(df["low"].to_numpy(dtype=np.float64))
+        close = float(df["close"].iat[-1])
+        if len(highs) <= 2 * window:
+            return None, None
 
-        for i in range(window, len(df) - window):
-            h = highs.iat[i]; l = lows.iat[i]
-            if (h > highs.iloc[i - window:i]).all() and (h > highs.iloc[i + 1:i + 1 + window]).all():
-                resistances.append(h)
-            if (l < lows.iloc[i - window:i]).all() and (l < lows.iloc[i + 1:i + 1 + window]).all():
-                supports.append(l)
+        # window-wide views: row k covers bars k..k+window-1, so for bar i the
+        # left neighbours are row i-window and the right neighbours row i+1
+        idx = np.arange(window, len(highs) - window)
+        hv = sliding_window_view(highs, window)
+        lv = sliding_window_view(lows, window)
+        h = highs[idx]; l = lows[idx]
+        resistances = h[(h > hv[idx - window].max(axis=1)) & (h > hv[idx + 1].max(axis=1))]
+        supports = l[(l < lv[idx - window].min(axis=1)) & (l < lv[idx + 1].min(axis=1))]
 
-        support = max((s for s in supports if s < close), default=None)
-        resistance = min((r for r in resistances if r > close), default=None)
+        below = supports[supports < close]
+        above = resistances[resistances > close]
+        support = float(below.max()) if below.size else None
+        resistance = float(above.min()) if above.size else None
         return support, resistance
     except Exception:
         return None, None
@@ -46,6 +56,8 @@ def get_lot_size(balance: float,
             return 0.01
         risk_amount = max(0.0, float(balance)) * (float(risk_percent) / 100.0)
         lot = risk_amount / (float(sl_pips) * float(pip_value))
-        return round(max(lot, 0.01), 2)
+        # whole hundredths of a lot, half-up with a tolerance for representation noise
+        # (round(1.005, 2) == 1.0 in binary floating point); never below 0.01
+        return max(int(lot * 100.0 + 0.5 + 1e-9), 1) / 100.0
     except Exception:
         return 0.01